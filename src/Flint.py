@@ -6,6 +6,8 @@ from managers.Icon_Manager import program_icon_loader
 from frames.Main_Frame import MainFrame
 from managers.Theme_Manager import apply_theme_to
 from managers.Resource_Manager import ensure_settings_ini_exists
+from managers.Settings_Manager import app_settings
+from managers.Sound_Manager import preload_sound_effects
 from managers.Debug_Manager import debug
 from managers.Theme_Manager import configure_qt_environment
 
@@ -45,6 +47,7 @@ def main():
     # =====================================================================
     debug.debug("Ensuring Settings.ini exists...")
     ensure_settings_ini_exists()
+    app_settings.reload()
 
     # =====================================================================
     # Applying Theme
@@ -59,6 +62,9 @@ def main():
     window = MainFrame()
     window.show()
 
+    # Sound effects load in the background once the event loop runs, so the first click doesn't wait on them
+    preload_sound_effects()
+
     debug.info("Starting Qt event loop!")
     sys.exit(app.exec_())
 
@@ -1,17 +1,22 @@
 from PyQt5.QtWidgets import (QApplication, QMainWindow, QLabel, QDockWidget)
-from PyQt5.QtGui import QFont
-from PyQt5.QtCore import QSettings, Qt
+from PyQt5.QtGui import QFont, QTextCursor
+from PyQt5.QtCore import Qt, QTimer
 
 # Project Imports
 from managers.Toolbar_Manager import build_toolbar
-from managers.Resource_Manager import get_external_resource, load_font
-from managers.Sound_Manager import play_bgm_track
+from managers.Resource_Manager import load_font
+from managers.Settings_Manager import app_settings
+from managers.Sound_Manager import start_bgm_in_background, shutdown_bgm
 from managers.Search_Text_Manager import SearchableTextEdit, SearchableBubbleViewer
 from managers.Debug_Manager import debug
 
-from renderer.parsing.spm_parser import parse_spm_text
+from renderer.File_Handler import cancel_open
+from renderer.Live_Preview import LivePreview
+from renderer.parsing.incremental_parser import IncrementalSpmParser
 from renderer.ui.bubble_viewer import BubbleViewer
-from renderer.ui.bubble_widget import BubbleWidget
+from renderer.ui.spm_highlighter import SpmHighlighter
+from renderer.utils.asset_cache import asset_cache_stats
+from renderer.utils.text_renderer import render_cache_stats
 
 class MainFrame(QMainWindow):
     def __init__(self):
@@ -25,13 +30,16 @@ class MainFrame(QMainWindow):
 
         self._init_status_label()
         self._init_toolbar()
-        self._init_bgm()
+        self._bgm_started = False
 
         self.addDockWidget(Qt.LeftDockWidgetArea, self.text_dock)
         self.addDockWidget(Qt.RightDockWidgetArea, self.bubble_dock)
 
         self.current_file_path = None
         self.refresh_view()
+
+        # Live preview and highlighting follow their settings as soon as they're written
+        app_settings.changed.connect(self._on_setting_changed)
         debug.info("MainFrame initialized successfully!")
 
     # =====================================================================
@@ -75,20 +83,40 @@ class MainFrame(QMainWindow):
     # =====================================================================
     # Background Music
     # =====================================================================
+    # Started from the first showEvent, a tick later so the window paints before any audio backend work
+    def showEvent(self, event):
+        super().showEvent(event)
+        if not self._bgm_started:
+            self._bgm_started = True
+            QTimer.singleShot(0, self._init_bgm)
+
     def _init_bgm(self):
-        settings = QSettings(get_external_resource("Settings.ini"), QSettings.IniFormat)
-        last_track = settings.value("bgm_track", "", type=str)
-        if last_track:
-            play_bgm_track("Audio/BGM", last_track)
+        last_track = app_settings.value("bgm_track", "", type=str)
+        start_bgm_in_background("Audio/BGM", last_track)
 
     # =====================================================================
     # Text Editor Dock (with searchbar)
     # =====================================================================
     def _init_text_editor(self):
         custom_font = QFont(self.font_family, 12)
-        self.text_editor = SearchableTextEdit(font=custom_font)
+        large_document = app_settings.value("large_document_mode", False, type=bool)
+        self.text_editor = SearchableTextEdit(font=custom_font, large_document=large_document)
         self.text_editor.text_editor.setReadOnly(False)
 
+        # Parser keeps its tokens between refreshes and only reparses the messages that were edited
+        self.spm_parser = IncrementalSpmParser()
+        self.text_editor.text_editor.document().contentsChange.connect(self.spm_parser.note_change)
+        self.source_index = self.spm_parser.source_index()
+        self.text_editor.text_editor.cursorPositionChanged.connect(self._sync_bubble_to_cursor)
+        self.text_editor.current_match_changed.connect(self.select_bubble_at)
+        self.text_editor.text_replaced.connect(self._on_text_replaced)
+
+        # Tags, stage ids and markers colored as you type (only the edited lines get highlighted again). Attached while the
+        # document is still empty: rehighlighting a loaded QTextEdit document relayouts it once per line.
+        self.spm_highlighter = None
+        if app_settings.value("syntax_highlighting", True, type=bool):
+            self.spm_highlighter = SpmHighlighter(self.text_editor.text_editor.document())
+
         self.text_dock = QDockWidget("Raw Text View", self)
         self.text_dock.setWidget(self.text_editor)
         self.text_dock.setFloating(False)
@@ -101,6 +129,7 @@ class MainFrame(QMainWindow):
     # =====================================================================
     def _init_bubble_viewer(self):
         self.bubble_viewer = BubbleViewer([], self.font_family, self)
+        self.bubble_viewer.source_requested.connect(self.jump_to_source)
         custom_font = QFont(self.font_family, 12)
         self.searchable_bubble_viewer = SearchableBubbleViewer(self.bubble_viewer, font=custom_font)
 
@@ -111,26 +140,105 @@ class MainFrame(QMainWindow):
         self.bubble_dock.setFeatures(QDockWidget.NoDockWidgetFeatures)
         debug.info("Bubble viewer dock initialized.")
 
+        # Opt-in live preview (reparses on a worker thread while typing)
+        self.live_preview = LivePreview(self.text_editor.text_editor, self.spm_parser, self._apply_parse, self)
+        self.live_preview.set_enabled(app_settings.value("live_preview", False, type=bool))
+
+    def set_live_preview(self, enabled: bool):
+        self.live_preview.set_enabled(enabled)
+
+    # Turning highlighting on in a loaded QTextEdit puts the text back in with the highlighter already attached, since
+    # formatting blocks that are already laid out relayouts the document once per line (the undo history is lost)
+    def set_syntax_highlighting(self, enabled: bool):
+        if enabled == (self.spm_highlighter is not None):
+            return
+        editor = self.text_editor.text_editor
+        if not enabled:
+            self.spm_highlighter.setDocument(None)
+            self.spm_highlighter = None
+            debug.info("Syntax highlighting turned off")
+            return
+
+        text = "" if self.text_editor.large_document else self.text_editor.toPlainText()
+        position, scroll = editor.textCursor().position(), editor.verticalScrollBar().value()
+        if text:
+            editor.clear()
+        self.spm_highlighter = SpmHighlighter(editor.document())
+        if text:
+            self.text_editor.setPlainText(text)
+            cursor = editor.textCursor()
+            cursor.setPosition(min(position, len(text)))
+            editor.setTextCursor(cursor)
+            editor.verticalScrollBar().setValue(scroll)
+        debug.info("Syntax highlighting turned on")
+
+    def _on_setting_changed(self, key: str, _value):
+        if key == "live_preview":
+            self.set_live_preview(app_settings.value(key, False, type=bool))
+        elif key == "syntax_highlighting":
+            self.set_syntax_highlighting(app_settings.value(key, True, type=bool))
+
     # =====================================================================
     # Refresh bubble viewer
     # =====================================================================
     def refresh_view(self, changed_keys=None):
         debug.debug("Refreshing bubble viewer from text editor...")
+        if self.live_preview.is_enabled():
+            self.live_preview.refresh_now()
+            return
         text = self.text_editor.toPlainText()
-        blocks = parse_spm_text(text)
-        self.bubble_viewer.clear_bubbles()
+        self.spm_parser.reparse(text)
+        self._apply_parse(self.spm_parser.blocks, self.spm_parser.source_index())
+        debug.debug(
+            "View successfully refreshed! Asset cache: %s, render cache: %s", asset_cache_stats(), render_cache_stats()
+        )
+
+    def _apply_parse(self, blocks, source_index):
+        self.source_index = source_index
+        self.bubble_viewer.update_blocks(blocks)
+
+    # Replace All is one edit range for the parser, so this only reparses the messages it touched
+    def _on_text_replaced(self, count: int, skipped: int):
+        message = f"Replaced {count} matches" + (f", skipped {skipped} with only markup in them" if skipped else "")
+        self.lbl_status.setText(f'<span style="font-weight:bold; font-size:12pt;">{message}</span>')
+        if count:
+            self.refresh_view()
+
+    # =====================================================================
+    # Bubble <-> raw text sync (through the source index of the last parse)
+    # =====================================================================
+    def jump_to_source(self, index: int):
+        if not 0 <= index < len(self.source_index):
+            return
+        start, end = self.source_index.block_char_range(index)
+        byte_start, byte_end = self.source_index.block_byte_range(index)
+        editor = self.text_editor.text_editor
+        cursor = editor.textCursor()
+        cursor.setPosition(start)
+        cursor.setPosition(end, QTextCursor.KeepAnchor)
+        editor.setTextCursor(cursor)
+        editor.ensureCursorVisible()
+        self.lbl_status.setText(
+            f'<span style="font-weight:bold; font-size:12pt;">{self.bubble_viewer.blocks[index].stage_npc}: '
+            f'characters {start}-{end}, file bytes 0x{byte_start:X}-0x{byte_end:X}</span>'
+        )
+        debug.debug("Jumped to source of bubble %d (chars %d-%d, bytes %d-%d)", index, start, end, byte_start, byte_end)
 
-        # Create BubbleWidgets for each BubbleBlock
-        layout = self.bubble_viewer.widget().layout()
-        widgets = [BubbleWidget(b, self.font_family, self.bubble_viewer) for b in blocks]
-        for widget in widgets:
-            layout.addWidget(widget)
-            self.bubble_viewer.bubble_widgets.append(widget)
+    def _sync_bubble_to_cursor(self):
+        editor = self.text_editor.text_editor
+        if editor.hasFocus():
+            self.select_bubble_at(editor.textCursor().position())
 
-        layout.addStretch(1)
-        if self.bubble_viewer.bubble_widgets:
-            self.bubble_viewer.set_active_bubble(self.bubble_viewer.bubble_widgets[0], play_sound=False)
-        debug.debug("View successfully refreshed!")
+    # Makes the bubble containing a raw text offset active (skipped while the index is behind the editor)
+    def select_bubble_at(self, offset: int):
+        if self.spm_parser.has_pending_edits():
+            return
+        if self.live_preview.is_enabled() and not self.live_preview.is_settled():
+            return
+        index = self.source_index.block_at_char(offset)
+        if index >= 0 and index != self.bubble_viewer.active_index:
+            self.bubble_viewer.set_active_index(index, play_sound=False)
+            self.bubble_viewer.ensure_index_visible(index)
 
     # =====================================================================
     # Window title
@@ -145,5 +253,10 @@ class MainFrame(QMainWindow):
     # Close event
     # =====================================================================
     def closeEvent(self, event):
+        # Don't let a file load (or live preview parse) thread outlive the window
+        cancel_open(self, wait=True)
+        self.live_preview.shutdown()
+        self.text_editor.shutdown_search()
+        shutdown_bgm()
         QApplication.quit()
         super().closeEvent(event)
\ No newline at end of file
@@ -161,7 +161,8 @@ class SecondaryFrame:
                 if use_font:
                     checkbox.setFont(use_font)
 
-                checked = settings.value(key, False, type=bool)
+                # "default" is what the app assumes when the key isn't in Settings.ini yet (off unless given)
+                checked = settings.value(key, info.get("default", False), type=bool)
                 checkbox.setChecked(checked)
                 debug.debug("Initial checkbox state for %s: %s", key, checked)
 
@@ -1,6 +1,5 @@
 from PyQt5 import QtCore
 from PyQt5.QtGui import QFont
-from PyQt5.QtCore import QSettings
 from PyQt5.QtWidgets import (
     QDialog, QVBoxLayout, QHBoxLayout
 )
@@ -8,8 +7,9 @@ from PyQt5.QtWidgets import (
 # Project Imports
 from managers.Theme_Manager import handle_color_slider_change, import_custom_theme, export_custom_theme, handle_dark_theme_toggle, handle_custom_theme_toggle
 from frames.Secondary_Frame import SecondaryFrame
-from managers.Resource_Manager import get_external_resource, load_font
-from managers.Sound_Manager import play_sound_by_name, should_play_sounds, set_volume_for_all, set_bgm_volume, set_sfx_muted, set_bgm_muted, get_available_bgm_tracks, play_bgm_track, handle_loop_current_toggle, handle_loop_all_toggle
+from managers.Resource_Manager import load_font
+from managers.Settings_Manager import app_settings
+from managers.Sound_Manager import play_sound_by_name, should_play_sounds, get_available_bgm_tracks, play_bgm_track, handle_loop_current_toggle, handle_loop_all_toggle
 from managers.Debug_Manager import debug
 
 #===================================================================================================================================
@@ -26,8 +26,8 @@ class Settings(QDialog):
         # Track exactly which settings changed
         self._changed_keys = set()
 
-        # Initialize persistent settings saved by the user
-        self.settings = QSettings(get_external_resource("Settings.ini"), QSettings.IniFormat)
+        # Persistent settings saved by the user (shared in-memory copy, saved in batches)
+        self.settings = app_settings
 
         #===================================================================
         # Basic Window Params
@@ -56,17 +56,20 @@ class Settings(QDialog):
         )
         self.about_label = SecondaryFrame.add_text_label(layout, header_text, QtCore.Qt.AlignCenter)
 
-        # All controls defined here
+        # All controls defined here (sound, live preview and highlighting settings apply themselves through app_settings.changed)
         controls_info = [
-            {'type': 'checkbox', 'label': 'Mute SFX', 'setting_key': 'disable_sounds', 'font': QFont(font_family, 10), 'on_change': lambda checked: set_sfx_muted(checked)},
-            {'type': 'slider', 'label': 'Sound Effects Volume', 'setting_key': 'sfx_volume', 'min': 1, 'max': 100, 'font': QFont(font_family, 8), 'on_change': lambda value: (set_volume_for_all(value / 100.0),play_sound_by_name("menu_select") if should_play_sounds() else None)},
+            {'type': 'checkbox', 'label': 'Mute SFX', 'setting_key': 'disable_sounds', 'font': QFont(font_family, 10)},
+            {'type': 'slider', 'label': 'Sound Effects Volume', 'setting_key': 'sfx_volume', 'min': 1, 'max': 100, 'font': QFont(font_family, 8), 'on_change': lambda value: play_sound_by_name("menu_select") if should_play_sounds() else None},
             {'type': 'dropdown', 'label': 'Track Selection', 'setting_key': 'bgm_track', 'options': get_available_bgm_tracks("Audio/BGM"), 'font': QFont(font_family, 9), 'on_change': lambda track: play_bgm_track("Audio/BGM", track) if track else None},
-            {'type': 'checkbox', 'label': 'Mute BGM', 'setting_key': 'disable_bgm', 'font': QFont(font_family, 10), 'on_change': lambda checked: set_bgm_muted(checked)},
+            {'type': 'checkbox', 'label': 'Mute BGM', 'setting_key': 'disable_bgm', 'font': QFont(font_family, 10)},
             
             {'type': 'checkbox', 'label': 'Loop Selected Track', 'setting_key': 'loop_current', 'font': QFont(font_family, 10), 'on_change': lambda checked: handle_loop_current_toggle(self.settings, self.controls, checked)},
             {'type': 'checkbox', 'label': 'Loop All Tracks', 'setting_key': 'loop_all', 'font': QFont(font_family, 10), 'on_change': lambda checked: handle_loop_all_toggle(self.settings, self.controls, checked)},
             
-            {'type': 'slider', 'label': 'BGM Volume', 'setting_key': 'bgm_volume', 'min': 1, 'max': 100, 'font': QFont(font_family, 8), 'on_change': lambda value: set_bgm_volume(value / 100.0)},
+            {'type': 'slider', 'label': 'BGM Volume', 'setting_key': 'bgm_volume', 'min': 1, 'max': 100, 'font': QFont(font_family, 8)},
+            {'type': 'checkbox', 'label': 'Live Bubble Preview', 'setting_key': 'live_preview', 'font': QFont(font_family, 10)},
+            {'type': 'checkbox', 'label': 'Syntax Highlighting', 'setting_key': 'syntax_highlighting', 'default': True, 'font': QFont(font_family, 10)},
+            {'type': 'checkbox', 'label': 'Large Document Editor (after restart)', 'setting_key': 'large_document_mode', 'font': QFont(font_family, 10)},
             {'type': 'dropdown', 'label': 'Language', 'setting_key': 'language', 'options': ['English', 'French', 'Japanese'], 'font': QFont(font_family, 9), 'option_callbacks': { 'English': lambda:print("English Selected!"), 'French': lambda:print("French Selected!"), 'Japanese': lambda:print("Japanese Selected!")}},
 
             # Theme Control
@@ -6,7 +6,7 @@ import os
 
 # Project Imports
 from managers.Debug_Manager import debug
-from managers.Resource_Manager import get_resource, gstreamer_linux_bgm
+from managers.Resource_Manager import get_resource
 
 #===================================================================================================================================
 # Helper Function for Installing Icons to XDG Structure
@@ -126,14 +126,9 @@ def program_icon_loader(app):
     # Linux/Cross-platform Icon Loader
     # =====================================================================
     else:  # Linux basically
-        debug.debug("Platform detected: Linux/Other — ensuring desktop file and initializing gstreamer.")
+        # GStreamer gets set up with the BGM once the window is up (see start_bgm_in_background)
+        debug.debug("Platform detected: Linux/Other — ensuring desktop file.")
         try:
             ensure_desktop_file()
         except Exception as e:
-            debug.warning("Could not ensure desktop file: %s", e)
-
-        try:
-            gstreamer_linux_bgm()
-            debug.info("Initialized gstreamer for Linux.")
-        except Exception as e:
-            debug.warning("Failed to initialize gstreamer: %s", e)
\ No newline at end of file
+            debug.warning("Could not ensure desktop file: %s", e)
\ No newline at end of file
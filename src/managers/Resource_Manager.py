@@ -76,6 +76,9 @@ def ensure_settings_ini_exists():
 [General]
 dark_theme=false
 spm_text_on=true
+live_preview=false
+syntax_highlighting=true
+large_document_mode=false
 disable_sounds=false
 disable_bgm=false
 sfx_volume=20
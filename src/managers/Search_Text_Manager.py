@@ -1,17 +1,135 @@
-from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout,QLineEdit, QPushButton, QTextEdit, QLabel)
+import re
+from bisect import bisect_left
+from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout,QLineEdit, QPushButton, QTextEdit, QPlainTextEdit, QLabel, QCompleter)
 from PyQt5.QtGui import QTextCursor, QFont, QColor
-from PyQt5.QtCore import Qt
+from PyQt5.QtCore import Qt, QPoint, QObject, QThread, QStringListModel, pyqtSignal, pyqtSlot
 
 # Project Imports
 from managers.Sound_Manager import play_sound_by_name, should_play_sounds
 from renderer.ui.bubble_viewer import BubbleViewer
+from renderer.ui.bubble_widget import TYPE_DISPLAY_MAP
+from renderer.parsing.text_index import BubbleTextIndex
+from renderer.parsing.id_index import StageIdIndex
+from renderer.utils.text_projection import TextProjection
+from managers.Debug_Manager import debug
+
+#===================================================================================================================================
+# Raw text search worker (runs the pattern over a snapshot of the editor text off the GUI thread)
+#===================================================================================================================================
+_SEARCH_BATCH_SIZE = 2000   # matches sent back to the GUI per batch (also how often a newer search is noticed)
+
+# The text travels as a plain object so both threads share the one snapshot instead of copying it per search
+class TextSearchWorker(QObject):
+    batch = pyqtSignal(int, list)
+    finished = pyqtSignal(int, int)
+    replaced = pyqtSignal(object, object, int, int)
+    replace_failed = pyqtSignal(str)
+
+    def __init__(self):
+        super().__init__()
+        # Written by the GUI thread for every new search, a running search stops as soon as it no longer matches
+        self.latest_generation = 0
+
+        # Markup-stripped projection of the last snapshot searched in tag-aware mode
+        self._projection = None
+
+    @pyqtSlot(int, object, object, bool)
+    def search(self, generation: int, pattern, text: str, tag_aware: bool):
+        if generation != self.latest_generation:
+            return
+        projection = self._project(text) if tag_aware else None
+        if projection:
+            text = projection.text
+        found = []
+        total = 0
+        for match in pattern.finditer(text):
+            start, end = match.span()
+            if start == end:
+                continue
+            found.append(projection.span_to_raw(start, end) if projection else (start, end))
+            if len(found) >= _SEARCH_BATCH_SIZE:
+                if generation != self.latest_generation:
+                    debug.debug("Raw text search %d cancelled after %d matches", generation, total)
+                    return
+                total += len(found)
+                self.batch.emit(generation, found)
+                found = []
+        if generation != self.latest_generation:
+            return
+        total += len(found)
+        if found:
+            self.batch.emit(generation, found)
+        self.finished.emit(generation, total)
+
+    # Works out every replacement as (raw start, raw end, new text), the GUI thread only has to apply them.
+    # The source text is sent back so the GUI can tell whether the editor changed in the meantime.
+    # Tag-aware matches only rewrite their plain text: the new text goes where the first piece was, the other pieces are
+    # removed, and the tags/markers between them stay put. A match with no plain text in it (only markup) is skipped.
+    @pyqtSlot(object, str, object, bool)
+    def replace(self, pattern, template: str, text: str, tag_aware: bool):
+        projection = self._project(text) if tag_aware else None
+        searched = projection.text if projection else text
+        literal = template if "\\" not in template else None
+        edits = []
+        replaced = skipped = 0
+        try:
+            for match in pattern.finditer(searched):
+                start, end = match.span()
+                if start == end:
+                    continue
+                spans = projection.span_to_raw_text(start, end) if projection else [(start, end)]
+                if not spans:
+                    skipped += 1
+                    continue
+                edits.append((*spans[0], literal if literal is not None else match.expand(template)))
+                edits.extend((piece_start, piece_end, "") for piece_start, piece_end in spans[1:])
+                replaced += 1
+        except (re.error, IndexError) as e:
+            # Bad group reference in the replacement
+            self.replace_failed.emit(str(e))
+            return
+        self.replaced.emit(text, edits, replaced, skipped)
+
+    def _project(self, text: str) -> TextProjection:
+        if self._projection is None or self._projection.source is not text:
+            self._projection = TextProjection(text)
+        return self._projection
+
+# Compiles the search box text with the chosen options (raises re.error for a bad regex)
+# Tag-aware literal searches let any run of whitespace (line breaks, removed [LF] markup...) stand in for a space
+def compile_search_pattern(text: str, regex: bool, case_sensitive: bool, whole_word: bool, tag_aware: bool = False):
+    if regex:
+        pattern = text
+    elif tag_aware:
+        pattern = r"\s+".join(re.escape(word) for word in text.split())
+    else:
+        pattern = re.escape(text)
+    if whole_word:
+        pattern = rf"\b(?:{pattern})\b"
+    return re.compile(pattern, 0 if case_sensitive else re.IGNORECASE)
+
+# Replacement text as a match.expand template (a literal replacement keeps its backslashes as they are)
+def replacement_template(text: str, regex: bool) -> str:
+    return text if regex else text.replace("\\", "\\\\")
+
 
 class SearchableTextEdit(QWidget):
-    def __init__(self, font: QFont = None, parent=None):
+    _search_request = pyqtSignal(int, object, object, bool)
+    _replace_request = pyqtSignal(object, str, object, bool)
+    current_match_changed = pyqtSignal(int)     # raw text offset of the match the cursor was moved to
+    text_replaced = pyqtSignal(int, int)        # matches replaced by Replace All, matches skipped (markup only)
+
+    # large_document swaps the rich text QTextEdit for a QPlainTextEdit: same API, but it only lays out the blocks on screen
+    def __init__(self, font: QFont = None, parent=None, large_document: bool = False):
         super().__init__(parent)
 
+        self.large_document = large_document
         self.matches = []
         self.current_match_index = -1
+        self._search_generation = 0
+        self._searching = False
+        self._text_snapshot = None
+        self._replace_source = None
 
         self.layout = QVBoxLayout(self)
         self.layout.setContentsMargins(0, 0, 0, 0)
@@ -32,13 +150,37 @@ class SearchableTextEdit(QWidget):
         search_layout.addWidget(self.prev_btn)
         search_layout.addWidget(self.next_btn)
 
+        # Search options
+        self.case_btn = QPushButton("Aa")
+        self.word_btn = QPushButton("W")
+        self.regex_btn = QPushButton(".*")
+        self.tags_btn = QPushButton("<>")
+        self.case_btn.setToolTip("Match case")
+        self.word_btn.setToolTip("Whole words only")
+        self.regex_btn.setToolTip("Regular expression")
+        self.tags_btn.setToolTip("Ignore tags and [LF]/[NUL]/[CR] markup")
+        for btn in (self.case_btn, self.word_btn, self.regex_btn, self.tags_btn):
+            btn.setCheckable(True)
+            btn.setFixedWidth(32)
+            btn.toggled.connect(self.update_matches)
+            search_layout.addWidget(btn)
+
         # Match counter label
         self.match_label = QLabel("")
         search_layout.addWidget(self.match_label)
 
+        # Replace bar layout (uses the search options above)
+        replace_layout = QHBoxLayout()
+        self.replace_input = QLineEdit()
+        self.replace_input.setPlaceholderText("Replace with...")
+        replace_layout.addWidget(self.replace_input)
+        self.replace_all_btn = QPushButton("Replace All")
+        self.replace_all_btn.setToolTip("Replace every match as a single undo step (\\1 etc. refer to groups in regex mode)")
+        replace_layout.addWidget(self.replace_all_btn)
+
         if font:
             # Main editor font
-            self.text_editor = QTextEdit()
+            self.text_editor = self._create_editor()
             self.text_editor.setFont(font)
 
             # Smaller font for search UI
@@ -48,10 +190,15 @@ class SearchableTextEdit(QWidget):
             self.prev_btn.setFont(small_font)
             self.next_btn.setFont(small_font)
             self.match_label.setFont(small_font)
+            self.replace_input.setFont(small_font)
+            self.replace_all_btn.setFont(small_font)
+            for btn in (self.case_btn, self.word_btn, self.regex_btn, self.tags_btn):
+                btn.setFont(small_font)
         else:
-            self.text_editor = QTextEdit()
+            self.text_editor = self._create_editor()
 
         self.layout.addLayout(search_layout)
+        self.layout.addLayout(replace_layout)
         self.layout.addWidget(self.text_editor)
 
         # Signals
@@ -59,6 +206,38 @@ class SearchableTextEdit(QWidget):
         self.search_input.returnPressed.connect(self.goto_next)
         self.next_btn.clicked.connect(self.goto_next)
         self.prev_btn.clicked.connect(self.goto_previous)
+        self.replace_all_btn.clicked.connect(self.replace_all)
+
+        # Search thread (one worker, every new search makes the running one give up at its next batch)
+        self._search_thread = QThread(self)
+        self._search_worker = TextSearchWorker()
+        self._search_worker.moveToThread(self._search_thread)
+        self._search_request.connect(self._search_worker.search)
+        self._search_worker.batch.connect(self._on_search_batch)
+        self._search_worker.finished.connect(self._on_search_finished)
+        self._replace_request.connect(self._search_worker.replace)
+        self._search_worker.replaced.connect(self._on_replace_ready)
+        self._search_worker.replace_failed.connect(self._on_replace_failed)
+        self._search_thread.finished.connect(self._search_worker.deleteLater)
+        self._search_thread.start()
+
+        # Only matches on screen are highlighted, so scrolling has to refresh them
+        self.text_editor.verticalScrollBar().valueChanged.connect(self._highlight_visible_matches)
+        self.text_editor.horizontalScrollBar().valueChanged.connect(self._highlight_visible_matches)
+
+        # The text snapshot searched is reused until the document changes
+        self.text_editor.document().contentsChange.connect(self._drop_text_snapshot)
+
+    def _create_editor(self):
+        if self.large_document:
+            debug.info("Raw text view in large document mode (QPlainTextEdit)")
+            return QPlainTextEdit()
+        return QTextEdit()
+
+    def shutdown_search(self):
+        self._cancel_search()
+        self._search_thread.quit()
+        self._search_thread.wait()
 
     # =====================================================================
     # Capture F3 / Shift+F3 for navigation
@@ -77,7 +256,8 @@ class SearchableTextEdit(QWidget):
     # =====================================================================
     def update_matches(self):
         text = self.search_input.text()
-        self.matches.clear()
+        self._cancel_search()
+        self.matches = []
         self.current_match_index = -1
 
         if not text:
@@ -85,41 +265,94 @@ class SearchableTextEdit(QWidget):
             self.text_editor.setExtraSelections([])
             return
 
-        cursor = self.text_editor.textCursor()
-        cursor.movePosition(QTextCursor.Start)
-        doc_cursor = self.text_editor.document().find(text, cursor)
+        try:
+            pattern = compile_search_pattern(
+                text, self.regex_btn.isChecked(), self.case_btn.isChecked(), self.word_btn.isChecked(), self.tags_btn.isChecked()
+            )
+        except re.error as e:
+            debug.debug("Invalid search pattern '%s': %s", text, e)
+            self.match_label.setText("Invalid pattern")
+            self.text_editor.setExtraSelections([])
+            return
+
+        self._searching = True
+        self.text_editor.setExtraSelections([])
+        self.update_match_label()
+        self._search_request.emit(self._search_generation, pattern, self.toPlainText(), self.tags_btn.isChecked())
+
+    def _cancel_search(self):
+        self._search_generation += 1
+        self._search_worker.latest_generation = self._search_generation
+        self._searching = False
 
-        while not doc_cursor.isNull():
-            self.matches.append((doc_cursor.selectionStart(), doc_cursor.selectionEnd()))
-            doc_cursor = self.text_editor.document().find(text, doc_cursor)
+    def _drop_text_snapshot(self, *_):
+        self._text_snapshot = None
 
-        if self.matches:
+    def _on_search_batch(self, generation: int, found: list):
+        if generation != self._search_generation:
+            return
+        first_batch = not self.matches
+        self.matches.extend(found)
+        if first_batch:
             self.current_match_index = 0
             self.highlight_all_matches()
+        else:
+            self._highlight_visible_matches()
+            self.update_match_label()
 
+    def _on_search_finished(self, generation: int, total: int):
+        if generation != self._search_generation:
+            return
+        self._searching = False
+        debug.debug("Raw text search found %d matches", total)
         self.update_match_label()
 
     # =====================================================================
     # Show 'X of Y' matches
     # =====================================================================
     def update_match_label(self):
+        more = "+" if self._searching else ""
         if not self.matches:
-            self.match_label.setText("0 matches")
+            self.match_label.setText("Searching..." if self._searching else "0 matches")
         else:
             self.match_label.setText(
-                f"{self.current_match_index+1} of {len(self.matches)}"
+                f"{self.current_match_index+1} of {len(self.matches)}{more}"
             )
 
     # =====================================================================
-    # Highlight all matches in grey (no orange for current match)
+    # Highlight matches in grey, only the ones inside the viewport get an ExtraSelection
     # =====================================================================
     def highlight_all_matches(self):
-        extra_selections = []
-        search_text = self.search_input.text()
+        # Move cursor to the current match (this may scroll, which re-highlights the new viewport)
+        if self.current_match_index >= 0:
+            start, end = self.matches[self.current_match_index]
+            cursor = self.text_editor.textCursor()
+            cursor.setPosition(start)
+            cursor.setPosition(end, QTextCursor.KeepAnchor)
+            self.text_editor.setTextCursor(cursor)
+            self.current_match_changed.emit(start)
+
+        self._highlight_visible_matches()
+        self.update_match_label()
 
-        for (start, end) in self.matches:
+    # Matches are sorted by start, so the visible ones are a bisect away whatever their total count
+    def _highlight_visible_matches(self, *_):
+        if not self.matches:
+            return
+        viewport = self.text_editor.viewport()
+        first = self.text_editor.cursorForPosition(QPoint(0, 0)).position()
+        last = self.text_editor.cursorForPosition(QPoint(viewport.width(), viewport.height())).position()
+
+        # Step back one so a match that starts above the viewport but runs into it is still drawn
+        index = max(0, bisect_left(self.matches, (first,)) - 1)
+        extra_selections = []
+        while index < len(self.matches) and self.matches[index][0] <= last:
+            start, end = self.matches[index]
+            index += 1
+            if end < first:
+                continue
             selection = QTextEdit.ExtraSelection()
-            cursor = self.text_editor.textCursor()
+            cursor = QTextCursor(self.text_editor.document())
             cursor.setPosition(start)
             cursor.setPosition(end, QTextCursor.KeepAnchor)
             selection.cursor = cursor
@@ -131,15 +364,62 @@ class SearchableTextEdit(QWidget):
 
         self.text_editor.setExtraSelections(extra_selections)
 
-        # Move cursor to the current match
-        if self.current_match_index >= 0:
-            start, end = self.matches[self.current_match_index]
-            cursor = self.text_editor.textCursor()
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        self._highlight_visible_matches()
+
+    # =====================================================================
+    # Replace All (edits worked out on the search thread, applied here as one undo step)
+    # =====================================================================
+    def replace_all(self):
+        text = self.search_input.text()
+        if not text or self._replace_source is not None:
+            return
+        try:
+            pattern = compile_search_pattern(
+                text, self.regex_btn.isChecked(), self.case_btn.isChecked(), self.word_btn.isChecked(), self.tags_btn.isChecked()
+            )
+        except re.error as e:
+            debug.debug("Invalid search pattern '%s': %s", text, e)
+            self.match_label.setText("Invalid pattern")
+            return
+
+        self._replace_source = self.toPlainText()
+        self.replace_all_btn.setEnabled(False)
+        self.match_label.setText("Replacing...")
+        template = replacement_template(self.replace_input.text(), self.regex_btn.isChecked())
+        self._replace_request.emit(pattern, template, self._replace_source, self.tags_btn.isChecked())
+
+    def _on_replace_ready(self, source: str, edits: list, replaced: int, skipped: int):
+        self.replace_all_btn.setEnabled(True)
+        if source is not self._replace_source:
+            return
+        self._replace_source = None
+
+        # Any edit since the request makes the offsets useless (the snapshot is dropped on every change)
+        if source is not self._text_snapshot:
+            debug.warning("Text changed while replacing, nothing was replaced")
+            self.update_matches()
+            return
+
+        # Back to front so the offsets of the edits still to do don't move
+        cursor = QTextCursor(self.text_editor.document())
+        cursor.beginEditBlock()
+        for start, end, new_text in reversed(edits):
             cursor.setPosition(start)
             cursor.setPosition(end, QTextCursor.KeepAnchor)
-            self.text_editor.setTextCursor(cursor)
+            cursor.insertText(new_text)
+        cursor.endEditBlock()
 
-        self.update_match_label()
+        debug.info("Replaced %d matches (%d edits), skipped %d", replaced, len(edits), skipped)
+        self.update_matches()
+        self.text_replaced.emit(replaced, skipped)
+
+    def _on_replace_failed(self, error: str):
+        self.replace_all_btn.setEnabled(True)
+        self._replace_source = None
+        debug.debug("Replace failed: %s", error)
+        self.match_label.setText("Invalid replacement")
 
     # =====================================================================
     # Button Actions
@@ -160,13 +440,18 @@ class SearchableTextEdit(QWidget):
         if should_play_sounds():
                     play_sound_by_name("menu_message_skip")
 
+    # The text is only rebuilt after the document changed, so search, replace and refresh can all ask for it
     def toPlainText(self):
-        return self.text_editor.toPlainText()
+        if self._text_snapshot is None:
+            self._text_snapshot = self.text_editor.toPlainText()
+        return self._text_snapshot
 
     def setPlainText(self, text):
         self.text_editor.setPlainText(text)
 
 
+_ID_SUGGESTIONS = 20   # stage ids shown in the dropdown under the bubble search
+
 class SearchableBubbleViewer(QWidget):
     def __init__(self, bubble_viewer: BubbleViewer, font: QFont = None, parent=None):
         super().__init__(parent)
@@ -174,15 +459,32 @@ class SearchableBubbleViewer(QWidget):
         self.matches = []
         self.current_match_index = -1
 
+        # Inverted index over the bubbles, brought up to date with the viewer's blocks on the next search
+        self.text_index = BubbleTextIndex(TYPE_DISPLAY_MAP)
+        self._index_dirty = True
+        self._block_positions = None
+        self.bubble_viewer.blocks_changed.connect(self._on_blocks_changed)
+
+        # Stage id trie for the dropdown, brought up to date on the next keystroke
+        self.id_index = StageIdIndex()
+        self._ids_dirty = True
+
         self.layout = QVBoxLayout(self)
         self.layout.setContentsMargins(0, 0, 0, 0)
 
         # Search bar layout
         search_layout = QHBoxLayout()
         self.search_input = QLineEdit()
-        self.search_input.setPlaceholderText("Search by ID (stg1_1_000)...")
+        self.search_input.setPlaceholderText("Search bubbles (ID, text, type, sound)...")
         search_layout.addWidget(self.search_input)
 
+        # Ranked stage id suggestions (the model is refilled per keystroke, so the completer mustn't filter it again)
+        self.id_model = QStringListModel(self)
+        self.id_completer = QCompleter(self.id_model, self)
+        self.id_completer.setCompletionMode(QCompleter.UnfilteredPopupCompletion)
+        self.id_completer.setMaxVisibleItems(10)
+        self.search_input.setCompleter(self.id_completer)
+
         self.prev_btn = QPushButton("Previous")
         self.next_btn = QPushButton("Next")
         self.prev_btn.setToolTip("Previous match (Shift+F3)")
@@ -200,12 +502,15 @@ class SearchableBubbleViewer(QWidget):
             self.prev_btn.setFont(small_font)
             self.next_btn.setFont(small_font)
             self.match_label.setFont(small_font)
+            self.id_completer.popup().setFont(small_font)
 
         self.layout.addLayout(search_layout)
         self.layout.addWidget(self.bubble_viewer)
 
         # Signals
         self.search_input.textChanged.connect(self.update_matches)
+        self.search_input.textEdited.connect(self.update_id_suggestions)
+        self.id_completer.activated[str].connect(self.goto_stage_id)
         self.search_input.returnPressed.connect(self.goto_next)
         self.next_btn.clicked.connect(self.goto_next)
         self.prev_btn.clicked.connect(self.goto_previous)
@@ -219,6 +524,13 @@ class SearchableBubbleViewer(QWidget):
         else:
             super().keyPressEvent(event)
 
+    def _on_blocks_changed(self):
+        self._index_dirty = True
+        self._ids_dirty = True
+        self._block_positions = None
+        if self.search_input.text().strip():
+            self.update_matches()
+
     def update_matches(self):
         text = self.search_input.text().strip()
         self.matches.clear()
@@ -228,13 +540,50 @@ class SearchableBubbleViewer(QWidget):
             self.match_label.setText("")
             return
 
-        for bubble in self.bubble_viewer.get_all_bubbles():
-            if text.lower() in bubble.block.stage_npc.lower():
-                self.matches.append(bubble)
+        if self._index_dirty:
+            self.text_index.update(self.bubble_viewer.get_all_blocks())
+            self._index_dirty = False
+        found = self.text_index.search(text)
+        if found:
+            if self._block_positions is None:
+                self._block_positions = {block: index for index, block in enumerate(self.bubble_viewer.get_all_blocks())}
+            positions = self._block_positions
+            self.matches = sorted(positions[block] for block in found if block in positions)
 
         # Only update match count; do NOT jump to the first match automatically
         self._update_match_label()
 
+    # =====================================================================
+    # Stage id dropdown
+    # =====================================================================
+    def update_id_suggestions(self, text: str):
+        if self._ids_dirty:
+            self.id_index.update(self.bubble_viewer.get_all_blocks())
+            self._ids_dirty = False
+        self.id_model.setStringList(self.id_index.lookup(text, _ID_SUGGESTIONS))
+        if self.id_model.rowCount():
+            self.id_completer.complete()
+
+    # Picking an id jumps to its first bubble (the search text is now that id, so Next walks through the others)
+    def goto_stage_id(self, stage_id: str):
+        if self.search_input.text() != stage_id:
+            self.search_input.setText(stage_id)
+        blocks = self.id_index.blocks_for(stage_id)
+        if not blocks:
+            return
+        if self._block_positions is None:
+            self._block_positions = {block: index for index, block in enumerate(self.bubble_viewer.get_all_blocks())}
+        positions = self._block_positions
+        index = min((positions[block] for block in blocks if block in positions), default=-1)
+        if index < 0:
+            return
+        if index in self.matches:
+            self.current_match_index = self.matches.index(index)
+            self._highlight_current()
+        else:
+            self.bubble_viewer.set_active_index(index)
+            self.bubble_viewer.scroll_to_index(index)
+
     def _update_match_label(self):
         if not self.matches:
             self.match_label.setText("0 matches")
@@ -245,9 +594,9 @@ class SearchableBubbleViewer(QWidget):
     def _highlight_current(self):
         if self.current_match_index < 0 or not self.matches:
             return
-        bubble = self.matches[self.current_match_index]
-        self.bubble_viewer.set_active_bubble(bubble)
-        self.bubble_viewer.scroll_to_bubble(bubble)
+        index = self.matches[self.current_match_index]
+        self.bubble_viewer.set_active_index(index)
+        self.bubble_viewer.scroll_to_index(index)
         self._update_match_label()
         if should_play_sounds():
             play_sound_by_name("menu_cursor_move")
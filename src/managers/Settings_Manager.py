@@ -0,0 +1,109 @@
+from typing import Any, Dict, Optional, Set
+
+from PyQt5.QtCore import QObject, QSettings, QTimer, QCoreApplication, pyqtSignal
+
+# Project Imports
+from managers.Resource_Manager import get_external_resource
+from managers.Debug_Manager import debug
+
+#===================================================================================================================================
+# Settings Manager (Settings.ini read once, kept in memory, written back in batches)
+#===================================================================================================================================
+# Reads go through value() with the same signature as QSettings.value, so anything that took a QSettings still works.
+# setValue only updates memory and emits changed, the keys written since the last save go to disk together once writes stop
+# for a moment (slider drags write on every tick) and again when the app quits.
+_SAVE_DELAY_MS = 500
+
+class SettingsManager(QObject):
+    changed = pyqtSignal(str, object)   # key, new value
+
+    def __init__(self):
+        super().__init__()
+        self._path = get_external_resource("Settings.ini")
+        self._values: Dict[str, Any] = {}
+        self._dirty: Set[str] = set()
+        self._quit_hooked = False
+
+        self._save_timer = QTimer(self)
+        self._save_timer.setSingleShot(True)
+        self._save_timer.setInterval(_SAVE_DELAY_MS)
+        self._save_timer.timeout.connect(self.sync)
+
+        self.reload()
+
+    # Re-reads the file (anything not saved yet is written first so it isn't lost)
+    def reload(self):
+        self.sync()
+        store = QSettings(self._path, QSettings.IniFormat)
+        self._values = {key: store.value(key) for key in store.allKeys()}
+        debug.debug("Settings loaded from %s: %d keys", self._path, len(self._values))
+
+    # =====================================================================
+    # Reading
+    # =====================================================================
+    def value(self, key: str, default: Any = None, type: Optional[type] = None) -> Any:
+        raw = self._values.get(key)
+        if raw is None:
+            return default
+        if type is bool:
+            return raw.strip().lower() in ("true", "1") if isinstance(raw, str) else bool(raw)
+        if type is int:
+            try:
+                return int(raw)
+            except (TypeError, ValueError):
+                debug.warning("Setting '%s' isn't a number (%r), using %r", key, raw, default)
+                return default
+        if type is str:
+            return ", ".join(raw) if isinstance(raw, list) else str(raw)
+        return raw
+
+    def contains(self, key: str) -> bool:
+        return key in self._values
+
+    # =====================================================================
+    # Writing
+    # =====================================================================
+    def setValue(self, key: str, value: Any):
+        if key in self._values and self._values[key] == value:
+            return
+        self._values[key] = value
+        self._dirty.add(key)
+        self._schedule_save()
+        self.changed.emit(key, value)
+
+    def _schedule_save(self):
+        if not self._quit_hooked:
+            app = QCoreApplication.instance()
+            if app is not None:
+                app.aboutToQuit.connect(self.sync)
+                self._quit_hooked = True
+        self._save_timer.start()
+
+    # Writes the changed keys to Settings.ini now
+    def sync(self):
+        self._save_timer.stop()
+        if not self._dirty:
+            return
+        store = QSettings(self._path, QSettings.IniFormat)
+        for key in self._dirty:
+            store.setValue(key, self._values[key])
+        store.sync()
+        if store.status() != QSettings.NoError:
+            debug.error("Failed to save settings to %s (status %d)", self._path, store.status())
+            return
+        debug.debug("Saved %d setting(s) to Settings.ini: %s", len(self._dirty), sorted(self._dirty))
+        self._dirty.clear()
+
+# =====================================================================
+# Singleton pattern
+# =====================================================================
+_settings_instance = None
+
+def get_settings_manager():
+    global _settings_instance
+    if _settings_instance is None:
+        _settings_instance = SettingsManager()
+    return _settings_instance
+
+# Easy global access
+app_settings = get_settings_manager()
@@ -1,23 +1,27 @@
 import os
 import sys
 
-import glob
-from typing import Dict, Optional
+import json
+import time
+from typing import Dict, List, Optional, Set, Tuple
 
-from PyQt5.QtCore import QUrl, QSettings
+from PyQt5.QtCore import QUrl, QTimer, QObject, QThread, QFileSystemWatcher, pyqtSignal
 from PyQt5.QtMultimedia import QSoundEffect, QMediaPlayer, QMediaContent
 
 # Project Imports
-from managers.Resource_Manager import get_external_resource
+from managers.Resource_Manager import get_external_resource, gstreamer_linux_bgm
+from managers.Settings_Manager import SettingsManager, app_settings
 from managers.Debug_Manager import debug
 
 # ===================================================================
 # Globals
 # ===================================================================
-_EFFECTS: Dict[str, QSoundEffect] = {}
-_INITIALIZED = False
+_EFFECTS: Dict[str, "_VoicePool"] = {}
+_EFFECTS_FOLDER = "Audio/Effects"
+_MANIFEST_FILE = "Effects.json"
+_manifest: Optional[Dict[str, str]] = None
+_preload_queue: List[str] = []
 
-_bgm_player: Optional[QMediaPlayer] = None
 _sfx_muted: bool = False
 _bgm_muted: bool = False
 
@@ -25,14 +29,11 @@ _loop_current: bool = True      # default = loop the current track
 _loop_all: bool = False         # default = don’t loop all
 _current_track_index: int = 0   # keeps track of position in folder
 _current_folder: Optional[str] = None
+_current_track: Optional[str] = None
 
 # ===================================================================
 # Settings helpers
 # ===================================================================
-# Fetch the settings
-def _get_settings() -> QSettings:
-    return QSettings(get_external_resource("Settings.ini"), QSettings.IniFormat)
-
 # Check if sound should be played
 def should_play_sounds() -> bool:
     return not _sfx_muted
@@ -43,8 +44,7 @@ def is_bgm_muted() -> bool:
 
 # Return saved SFX volume 0 – 100
 def get_volume() -> float:
-    settings = _get_settings()
-    vol_int = settings.value("sfx_volume", 80, type=int)
+    vol_int = app_settings.value("sfx_volume", 80, type=int)
     return max(0, min(100, vol_int)) / 100.0
 
 
@@ -52,160 +52,489 @@ def get_volume() -> float:
 # SFX mute/volume
 # ===================================================================
 
-# Mute/unmute all sound effects and persist settings
+# Mute/unmute all sound effects and persist settings (applied by _on_setting_changed)
 def set_sfx_muted(muted: bool):
+    app_settings.setValue("disable_sounds", muted)
+
+# Set volume for all SFX and persist to settings (applied by _on_setting_changed)
+def set_volume_for_all(volume: float):
+    app_settings.setValue("sfx_volume", int(volume * 100))
+
+def _apply_sfx_muted(muted: bool):
     global _sfx_muted
     _sfx_muted = muted
     debug.debug("SFX mute state set to: %s", muted)
 
-    settings = _get_settings()
-    settings.setValue("disable_sounds", muted)
-    debug.debug("Persisted 'disable_sounds' = %s to settings", muted)
+    for pool in _EFFECTS.values():
+        for eff in pool.voices:
+            eff.setMuted(muted)
 
-    for eff in _EFFECTS.values():
-        eff.setMuted(muted)
+def _apply_sfx_volume(volume: float):
+    debug.debug("Setting global SFX volume to: %d%%", int(volume * 100))
+
+    for pool in _EFFECTS.values():
+        for eff in pool.voices:
+            eff.setVolume(volume)
 
-# Set volume for all SFX and persist to settings
-def set_volume_for_all(volume: float):
-    vol_int = int(volume * 100)
-    debug.debug("Setting global SFX volume to: %d%%", vol_int)
 
-    settings = _get_settings()
-    settings.setValue("sfx_volume", vol_int)
+# ===================================================================
+# BGM catalog
+# ===================================================================
+# Each BGM folder is listed once and kept in memory (name -> format, size, modified time, duration, loop points), a
+# QFileSystemWatcher rescans it when files are added or removed. The catalog is saved to Audio/BGM_Catalog.json (a cache,
+# not checked in) so durations, only known once a track has been loaded by the player, carry over between runs for files
+# that haven't changed. Loop points are authored data, so they live in the folder's checked-in Loops.json instead:
+# {"Track Name": {"loop_start": ms, "loop_end": ms}}, keyed without the extension so the .mp3 and .ogg share one entry.
+_CATALOG_FILE = "Audio/BGM_Catalog.json"
+_LOOPS_FILE = "Loops.json"
+_AUDIO_EXTENSIONS = (".mp3", ".wav", ".ogg")
+if sys.platform == "win32":
+    _BGM_EXTENSIONS = (".mp3", ".wav")  # Windows only supports mp3/wav reliably
+else:
+    _BGM_EXTENSIONS = (".ogg",)         # Linux/macOS can use ogg
+_RESCAN_DELAY_MS = 500                  # copying a batch of tracks fires a change per file
+
+class _BgmCatalog(QObject):
+    def __init__(self):
+        super().__init__()
+        self._folders: Dict[str, Dict[str, dict]] = {}
+        self._tracks: Dict[str, List[str]] = {}
+        self._loops: Dict[str, Dict[str, dict]] = {}
+        self._saved: Optional[Dict[str, Dict[str, dict]]] = None
+        self._pending_rescans: Set[str] = set()
+
+        self._watcher = QFileSystemWatcher(self)
+        self._watcher.directoryChanged.connect(self._on_directory_changed)
+        self._watcher.fileChanged.connect(self._on_file_changed)
+        self._rescan_timer = QTimer(self)
+        self._rescan_timer.setSingleShot(True)
+        self._rescan_timer.setInterval(_RESCAN_DELAY_MS)
+        self._rescan_timer.timeout.connect(self._rescan_pending)
+
+    # Playable tracks of a folder for this platform, sorted by name
+    def tracks(self, folder: str) -> List[str]:
+        if folder not in self._tracks:
+            self._scan(folder)
+            full_path = get_external_resource(folder)
+            if os.path.isdir(full_path):
+                self._watcher.addPath(full_path)
+        return self._tracks[folder]
+
+    # Cached file info plus the track's loop points (None when it doesn't have any)
+    def info(self, folder: str, track_name: str) -> Optional[dict]:
+        self.tracks(folder)
+        entry = self._folders[folder].get(track_name)
+        if entry is None:
+            return None
+        loop = self._load_loops(folder).get(os.path.splitext(track_name)[0], {})
+        return dict(entry, loop_start=loop.get("loop_start"), loop_end=loop.get("loop_end"))
+
+    def set_duration(self, folder: str, track_name: str, duration_ms: int):
+        self.tracks(folder)
+        info = self._folders[folder].get(track_name)
+        if info is not None and info.get("duration") != duration_ms:
+            info["duration"] = duration_ms
+            self._save()
+
+    def _scan(self, folder: str):
+        full_path = get_external_resource(folder)
+        saved = self._load_saved().get(folder, {})
+        entries: Dict[str, dict] = {}
+        try:
+            with os.scandir(full_path) as scan:
+                for entry in scan:
+                    extension = os.path.splitext(entry.name)[1].lower()
+                    if extension not in _AUDIO_EXTENSIONS or not entry.is_file():
+                        continue
+                    stat = entry.stat()
+                    info = {"format": extension[1:], "size": stat.st_size, "mtime": int(stat.st_mtime)}
+                    previous = saved.get(entry.name)
+                    unchanged = previous and previous.get("size") == info["size"] and previous.get("mtime") == info["mtime"]
+                    info["duration"] = previous.get("duration") if unchanged else None
+                    entries[entry.name] = info
+        except OSError as e:
+            debug.error("BGM folder not found: %s (%s)", full_path, e)
+
+        self._folders[folder] = entries
+        self._tracks[folder] = sorted(
+            (name for name in entries if os.path.splitext(name)[1].lower() in _BGM_EXTENSIONS), key=str.casefold
+        )
+        debug.debug("BGM catalog for %s: %d files, %d playable", folder, len(entries), len(self._tracks[folder]))
+        if entries != saved:
+            self._save()
+
+    def _on_directory_changed(self, path: str):
+        for folder in self._folders:
+            if os.path.normcase(get_external_resource(folder)) == os.path.normcase(path):
+                self._pending_rescans.add(folder)
+        self._rescan_timer.start()
+
+    def _rescan_pending(self):
+        folders, self._pending_rescans = self._pending_rescans, set()
+        for folder in folders:
+            debug.info("BGM folder changed, rescanning %s", folder)
+            self._loops.pop(folder, None)
+            self._scan(folder)
+
+    def _on_file_changed(self, path: str):
+        for folder in list(self._loops):
+            if os.path.normcase(self._loops_path(folder)) == os.path.normcase(path):
+                debug.info("BGM loop points changed, reloading %s", path)
+                del self._loops[folder]
+
+    # =====================================================================
+    # <folder>/Loops.json (checked in, only ever read)
+    # =====================================================================
+    @staticmethod
+    def _loops_path(folder: str) -> str:
+        return get_external_resource(os.path.join(folder, _LOOPS_FILE))
+
+    def _load_loops(self, folder: str) -> Dict[str, dict]:
+        loops = self._loops.get(folder)
+        if loops is None:
+            loops = self._loops[folder] = {}
+            loops_path = self._loops_path(folder)
+            if os.path.exists(loops_path):
+                try:
+                    with open(loops_path, "r") as f:
+                        loops.update(json.load(f))
+                except (OSError, ValueError) as e:
+                    debug.warning("Ignoring unreadable BGM loop points %s: %s", loops_path, e)
+                if loops_path not in self._watcher.files():
+                    self._watcher.addPath(loops_path)
+        return loops
+
+    # =====================================================================
+    # Audio/BGM_Catalog.json
+    # =====================================================================
+    def _load_saved(self) -> Dict[str, Dict[str, dict]]:
+        if self._saved is None:
+            self._saved = {}
+            catalog_path = get_external_resource(_CATALOG_FILE)
+            if os.path.exists(catalog_path):
+                try:
+                    with open(catalog_path, "r") as f:
+                        self._saved = json.load(f)
+                except (OSError, ValueError) as e:
+                    debug.warning("Ignoring unreadable BGM catalog %s: %s", catalog_path, e)
+            # Catalogs saved by older builds also kept loop points, those now come from Loops.json only
+            for entries in self._saved.values():
+                for info in entries.values():
+                    info.pop("loop_start", None)
+                    info.pop("loop_end", None)
+        return self._saved
+
+    def _save(self):
+        saved = self._load_saved()
+        for folder, entries in self._folders.items():
+            saved[folder] = {name: dict(info) for name, info in entries.items()}
+        catalog_path = get_external_resource(_CATALOG_FILE)
+        try:
+            with open(catalog_path, "w") as f:
+                json.dump(saved, f, indent=4)
+            debug.debug("BGM catalog saved to %s", catalog_path)
+        except OSError as e:
+            debug.error("Failed to save BGM catalog %s: %s", catalog_path, e)
 
-    for eff in _EFFECTS.values():
-        eff.setVolume(volume)
+_bgm_catalog: Optional[_BgmCatalog] = None
 
+def _get_bgm_catalog() -> _BgmCatalog:
+    global _bgm_catalog
+    if _bgm_catalog is None:
+        _bgm_catalog = _BgmCatalog()
+    return _bgm_catalog
 
 # ===================================================================
 # BGM management
 # ===================================================================
 
-# Get available songs in the BGM folder
+# Get available songs in the BGM folder (from the catalog, filenames only)
 def get_available_bgm_tracks(folder: str) -> list:
-    full_path = get_external_resource(folder)
-    if not os.path.exists(full_path):
-        debug.error("BGM folder not found: %s", full_path)
-        return []
-
-    # Determine which extensions to use based on platform
-    if sys.platform == "win32":
-        exts = ("*.mp3", "*.wav")  # Windows only supports mp3/wav reliably
-    else:
-        exts = ("*.ogg",)          # Linux/macOS can use ogg
+    return list(_get_bgm_catalog().tracks(folder))
 
-    tracks = []
-    for ext in exts:
-        tracks.extend(glob.glob(os.path.join(full_path, ext)))
+# Metadata the catalog has for a track (format, size, mtime, duration in ms or None until it's been played, loop points
+# from Loops.json or None)
+def get_bgm_track_info(folder: str, track_name: str) -> Optional[dict]:
+    return _get_bgm_catalog().info(folder, track_name)
 
-    # Return filenames only (not full paths)
-    return [os.path.basename(t) for t in tracks]
 
+# ===================================================================
+# Gapless BGM (two players, whatever comes next is buffered before the current track ends)
+# ===================================================================
+# One player is heard while the other waits paused on what comes next: the same track at its loop start (loop current) or
+# the next track of the folder (loop all). It gets buffered a few seconds before the end, and when the playing track ends
+# the waiting player starts and the two swap roles, so nothing loads in between.
+# Loop points are optional "loop_start"/"loop_end" values (ms) of a track in Audio/BGM/Loops.json: the intro before
+# loop_start plays once, then loop_start to loop_end repeats. Only an explicit loop end is switched on from the position
+# updates (a little ahead, they come every _POSITION_INTERVAL_MS), a track without one plays to its EndOfMedia so its tail
+# isn't cut.
+_PREBUFFER_MS = 5000
+_SWITCH_AHEAD_MS = 40
+_POSITION_INTERVAL_MS = 20
+
+class _GaplessBgm(QObject):
+    def __init__(self):
+        super().__init__()
+        self._players = [QMediaPlayer(self), QMediaPlayer(self)]
+        self._sources: List[Optional[Tuple[str, str]]] = [None, None]     # folder, track loaded in each player
+        self._active = 0
+        self._looping = False
+        self._queued: Optional[Tuple[str, str, int]] = None              # folder, track, start position of the waiting player
+
+        for index, player in enumerate(self._players):
+            player.setNotifyInterval(_POSITION_INTERVAL_MS)
+            player.setVolume(app_settings.value("bgm_volume", 80, type=int))
+            player.setMuted(_bgm_muted)
+            player.positionChanged.connect(lambda position, index=index: self._on_position_changed(index, position))
+            player.mediaStatusChanged.connect(lambda status, index=index: self._on_media_status_changed(index, status))
+            player.durationChanged.connect(lambda duration, index=index: self._on_duration_changed(index, duration))
+
+    # =====================================================================
+    # Controls
+    # =====================================================================
+    def play(self, folder: str, track_name: str, looping: bool):
+        self._looping = looping
+        self._queued = None
+        self._players[1 - self._active].stop()
+        self._load(self._active, folder, track_name)
+        self._players[self._active].play()
+
+    def stop(self):
+        self._queued = None
+        for player in self._players:
+            player.stop()
+
+    def set_volume(self, volume: int):
+        for player in self._players:
+            player.setVolume(volume)
+
+    def set_muted(self, muted: bool):
+        for player in self._players:
+            player.setMuted(muted)
+
+    def is_playing(self) -> bool:
+        return self._players[self._active].state() == QMediaPlayer.PlayingState
+
+    def _load(self, index: int, folder: str, track_name: str):
+        full_path = get_external_resource(os.path.join(folder, track_name))
+        self._players[index].setMedia(QMediaContent(QUrl.fromLocalFile(full_path)))
+        self._sources[index] = (folder, track_name)
+
+    # =====================================================================
+    # Handing over to the next source
+    # =====================================================================
+    # What plays once the current track is done (None when it just ends)
+    def _next_source(self) -> Optional[Tuple[str, str, int]]:
+        source = self._sources[self._active]
+        if not self._looping or source is None:
+            return None
+        folder, track_name = source
+        if _loop_current:
+            info = _get_bgm_catalog().info(folder, track_name) or {}
+            return folder, track_name, info.get("loop_start") or 0
+        if _loop_all:
+            tracks = _get_bgm_catalog().tracks(folder)
+            if tracks:
+                index = (tracks.index(track_name) + 1) % len(tracks) if track_name in tracks else 0
+                return folder, tracks[index], 0
+        return None
+
+    # Explicit loop end of the current track when it repeats itself (None means it plays to the end of the file)
+    def _loop_end(self, next_source: Tuple[str, str, int]) -> Optional[int]:
+        if next_source[:2] != self._sources[self._active]:
+            return None
+        info = _get_bgm_catalog().info(*next_source[:2]) or {}
+        loop_end = info.get("loop_end")
+        duration = self._players[self._active].duration()
+        if loop_end and (duration <= 0 or loop_end < duration):
+            return loop_end
+        return None
+
+    def _on_position_changed(self, index: int, position: int):
+        if index != self._active:
+            return
+        next_source = self._next_source()
+        if next_source is None:
+            return
+        loop_end = self._loop_end(next_source)
+        handover = loop_end or self._players[self._active].duration()
+        if handover <= 0:
+            return
+        if self._queued != next_source and position >= handover - _PREBUFFER_MS:
+            self._prepare(next_source)
+        if loop_end and self._queued == next_source and position >= loop_end - _SWITCH_AHEAD_MS:
+            self._switch()
+
+    def _on_media_status_changed(self, index: int, status: int):
+        if index == self._active:
+            if status == QMediaPlayer.EndOfMedia:
+                next_source = self._next_source()
+                if next_source is not None:
+                    if self._queued != next_source:
+                        self._prepare(next_source)
+                    self._switch()
+        elif self._queued and status in (QMediaPlayer.LoadedMedia, QMediaPlayer.BufferedMedia):
+            # Some backends drop a seek made before the media finished loading
+            if self._players[index].position() != self._queued[2]:
+                self._players[index].setPosition(self._queued[2])
+
+    def _on_duration_changed(self, index: int, duration: int):
+        # The player only knows a track's length once it has loaded it, the catalog keeps it for next time
+        if duration > 0 and self._sources[index]:
+            _get_bgm_catalog().set_duration(*self._sources[index], duration)
+
+    # Loads (if needed) and parks the waiting player on the next source
+    def _prepare(self, next_source: Tuple[str, str, int]):
+        folder, track_name, start = next_source
+        standby = 1 - self._active
+        if self._sources[standby] != (folder, track_name):
+            self._load(standby, folder, track_name)
+        self._players[standby].setPosition(start)
+        self._players[standby].pause()
+        self._queued = next_source
+        debug.debug("Buffered next BGM: %s from %d ms", track_name, start)
+
+    def _switch(self):
+        previous = self._players[self._active]
+        self._active = 1 - self._active
+        self._queued = None
+        self._players[self._active].play()
+        previous.stop()
+        folder, track_name = self._sources[self._active]
+        debug.debug("BGM handed over to: %s", track_name)
+        _set_current_track(folder, track_name)
+
+_bgm: Optional[_GaplessBgm] = None
 
 # Play a specific track by name (from folder)
 def play_bgm_track(folder: str, track_name: str, loop: Optional[bool] = None):
-    global _bgm_player, _current_folder, _current_track_index
-    if _bgm_player is None:
-        debug.debug("Initializing BGM player...")
-        _bgm_player = QMediaPlayer()
-        _bgm_player.setVolume(_get_settings().value("bgm_volume", 80, type=int))
-        _bgm_player.setMuted(_bgm_muted)
-
-    tracks = get_available_bgm_tracks(folder)
-    if track_name not in tracks:
+    global _bgm
+    if _bgm is None:
+        debug.debug("Initializing BGM players...")
+        _bgm = _GaplessBgm()
+
+    if track_name not in _get_bgm_catalog().tracks(folder):
         debug.error("Requested BGM track '%s' not found in %s", track_name, folder)
         return
 
+    debug.info("Playing BGM track: %s", get_external_resource(os.path.join(folder, track_name)))
+
+    # Decide whether to loop based on explicit argument or stored settings
+    effective_loop = _loop_current or _loop_all if loop is None else loop
+    _bgm.play(folder, track_name, effective_loop)
+    _set_current_track(folder, track_name)
+
+def _set_current_track(folder: str, track_name: str):
+    global _current_folder, _current_track, _current_track_index
+    tracks = _get_bgm_catalog().tracks(folder)
     _current_folder = folder
-    _current_track_index = tracks.index(track_name)
+    _current_track = track_name
+    _current_track_index = tracks.index(track_name) if track_name in tracks else 0
 
-    full_path = get_external_resource(os.path.join(folder, track_name))
-    if os.path.exists(full_path):
-        debug.info("Playing BGM track: %s", full_path)
-        _bgm_player.setMedia(QMediaContent(QUrl.fromLocalFile(full_path)))
-        _bgm_player.play()
+    # Save chosen track to settings
+    app_settings.setValue("bgm_track", track_name)
+
+
+# ===================================================================
+# BGM startup (after the window is up, backend setup off the GUI thread)
+# ===================================================================
+# Finding the GStreamer plugins (a pkg-config call in Linux builds) has to happen before the first QMediaPlayer exists, so
+# it runs on a worker thread and the players are only created, and the last track played, once it's done.
+_bgm_startup: Optional[Tuple[QThread, "_BgmStartupWorker"]] = None     # kept referenced until the thread finishes
 
-        # Save chosen track to settings
-        settings = _get_settings()
-        settings.setValue("bgm_track", track_name)
+class _BgmStartupWorker(QObject):
+    done = pyqtSignal()
 
-        # Decide whether to loop based on explicit argument or stored settings
-        effective_loop = _loop_current or _loop_all if loop is None else loop
-        if effective_loop:
+    def run(self):
+        if sys.platform not in ("win32", "darwin"):
             try:
-                _bgm_player.mediaStatusChanged.disconnect(_restart_if_finished)
-            except Exception:
-                pass
-            _bgm_player.mediaStatusChanged.connect(_restart_if_finished)
-    else:
-        debug.error("BGM track not found: %s", full_path)
+                gstreamer_linux_bgm()
+                debug.info("Initialized gstreamer for Linux.")
+            except Exception as e:
+                debug.warning("Failed to initialize gstreamer: %s", e)
+        self.done.emit()
+
+def start_bgm_in_background(folder: str, track_name: str):
+    global _bgm_startup
+    if _bgm_startup is not None:
+        return
+    debug.debug("Starting BGM in the background...")
+    worker = _BgmStartupWorker()
+    thread = QThread()
+    worker.moveToThread(thread)
+
+    def on_done():
+        if track_name:
+            play_bgm_track(folder, track_name)
+
+    def on_finished():
+        global _bgm_startup
+        _bgm_startup = None
+
+    worker.done.connect(on_done)
+    worker.done.connect(thread.quit)
+    thread.started.connect(worker.run)
+    thread.finished.connect(on_finished)
+    thread.finished.connect(worker.deleteLater)
+    thread.finished.connect(thread.deleteLater)
+    _bgm_startup = (thread, worker)
+    thread.start()
+
+# Waits for a startup still running (on close) and stops the music
+def shutdown_bgm():
+    if _bgm_startup is not None:
+        thread = _bgm_startup[0]
+        thread.quit()
+        thread.wait()
+    stop_bgm()
 
 
 # Method which stops the bgm
 def stop_bgm():
-    if _bgm_player:
+    if _bgm:
         debug.debug("Stopping BGM")
-        _bgm_player.stop()
-
-# Method which loops the bgm (can be set to loops at speical times)
-def _restart_if_finished(status):
-    global _current_track_index
-    if status == QMediaPlayer.EndOfMedia:
-        if _loop_current:
-            debug.debug("Restarting current BGM track (loop current)")
-            _bgm_player.setPosition(0)
-            _bgm_player.play()
-        elif _loop_all and _current_folder:
-            tracks = get_available_bgm_tracks(_current_folder)
-            if tracks:
-                _current_track_index = (_current_track_index + 1) % len(tracks)
-                next_track = tracks[_current_track_index]
-                debug.debug("Looping to next BGM track: %s", next_track)
-                play_bgm_track(_current_folder, next_track, loop=True)
-
+        _bgm.stop()
 
 
-# Method for setting the volume
+# Method for setting the volume (applied by _on_setting_changed)
 def set_bgm_volume(value: float):
-    vol_int = int(value * 100)
-    debug.debug("Setting BGM volume to: %d%%", vol_int)
+    app_settings.setValue("bgm_volume", int(value * 100))
 
-    if _bgm_player:
-        _bgm_player.setVolume(vol_int)
+def _apply_bgm_volume(vol_int: int):
+    debug.debug("Setting BGM volume to: %d%%", vol_int)
 
-    settings = _get_settings()
-    settings.setValue("bgm_volume", vol_int)
+    if _bgm:
+        _bgm.set_volume(vol_int)
 
-# Mute/unmute background music and persist setting.
+# Mute/unmute background music and persist setting (applied by _on_setting_changed)
 def set_bgm_muted(muted: bool):
+    app_settings.setValue("disable_bgm", muted)
+
+def _apply_bgm_muted(muted: bool):
     global _bgm_muted
     _bgm_muted = muted
     debug.debug("BGM mute state set to: %s", muted)
 
-    if _bgm_player:
-        _bgm_player.setMuted(muted)
-        if not muted and _bgm_player.state() != QMediaPlayer.PlayingState:
+    if _bgm:
+        _bgm.set_muted(muted)
+        if not muted and not _bgm.is_playing():
             # Resume last played track
-            settings = _get_settings()
-            last_track = settings.value("bgm_track", "", type=str)
+            last_track = app_settings.value("bgm_track", "", type=str)
             if last_track:
                 debug.debug("Resuming BGM with last track: %s", last_track)
-                play_bgm_track("Music", last_track, loop=True)
+                play_bgm_track("Audio/BGM", last_track, loop=True)
             else:
                 debug.warning("No last BGM track found to resume after unmute")
         elif muted:
             debug.debug("BGM muted (staying stopped or paused)")
 
-    settings = _get_settings()
-    settings.setValue("disable_bgm", muted)
-
 
 # ===================================================================
 # Loop settings
 # ===================================================================
 
 # Loop Current Toggle Handler
-def handle_loop_current_toggle(settings: QSettings, controls: dict, current_enabled: bool):
+def handle_loop_current_toggle(settings: SettingsManager, controls: dict, current_enabled: bool):
     settings.setValue("loop_current", current_enabled)
     debug.debug("Saved 'loop_current' = %s to settings", current_enabled)
 
@@ -221,7 +550,7 @@ def handle_loop_current_toggle(settings: QSettings, controls: dict, current_enab
     set_loop_current(current_enabled)
 
 # Loop All Toggle Handler
-def handle_loop_all_toggle(settings: QSettings, controls: dict, all_enabled: bool):
+def handle_loop_all_toggle(settings: SettingsManager, controls: dict, all_enabled: bool):
     settings.setValue("loop_all", all_enabled)
     debug.debug("Saved 'loop_all' = %s to settings", all_enabled)
 
@@ -243,9 +572,8 @@ def set_loop_current(enabled: bool):
         _loop_all = False  # ensure exclusivity
     debug.debug("Loop current track set to: %s (loop_all=%s)", _loop_current, _loop_all)
 
-    settings = _get_settings()
-    settings.setValue("loop_current", _loop_current)
-    settings.setValue("loop_all", _loop_all)
+    app_settings.setValue("loop_current", _loop_current)
+    app_settings.setValue("loop_all", _loop_all)
 
 
 def set_loop_all(enabled: bool):
@@ -255,12 +583,11 @@ def set_loop_all(enabled: bool):
         _loop_current = False  # ensure exclusivity
     debug.debug("Loop all tracks set to: %s (loop_current=%s)", _loop_all, _loop_current)
 
-    settings = _get_settings()
-    settings.setValue("loop_all", _loop_all)
-    settings.setValue("loop_current", _loop_current)
+    app_settings.setValue("loop_all", _loop_all)
+    app_settings.setValue("loop_current", _loop_current)
 
 # ===================================================================
-# SFX initialization and play
+# SFX loading (manifest driven, preloaded after startup or on first use) and play
 # ===================================================================
 def _load_sound(effect: QSoundEffect, relative_path: str, label: str):
     full_path = get_external_resource(relative_path)
@@ -270,52 +597,144 @@ def _load_sound(effect: QSoundEffect, relative_path: str, label: str):
     else:
         debug.error("Sound effect '%s' not found: %s", label, full_path)
 
+# Sound names -> files in Audio/Effects, read from the manifest once
+def _get_manifest() -> Dict[str, str]:
+    global _manifest
+    if _manifest is None:
+        manifest_path = get_external_resource(os.path.join(_EFFECTS_FOLDER, _MANIFEST_FILE))
+        try:
+            with open(manifest_path, "r") as f:
+                _manifest = {str(name): str(file_name) for name, file_name in json.load(f).items()}
+            debug.debug("Sound manifest loaded: %d effects", len(_manifest))
+        except (OSError, ValueError, AttributeError) as e:
+            debug.error("Failed to load sound manifest %s: %s", manifest_path, e)
+            _manifest = {}
+    return _manifest
 
-def _ensure_initialized():
-    global _INITIALIZED
-    if _INITIALIZED:
-        return
-    debug.debug("Initializing sound effects...")
-
-    def make(label: str, rel: str) -> QSoundEffect:
-        eff = QSoundEffect()
-        eff.setVolume(get_volume())
-        eff.setMuted(_sfx_muted)
-        _load_sound(eff, rel, label)
+# ===================================================================
+# SFX voices
+# ===================================================================
+# Every effect gets a few copies (voices) so a sound fired again while it's still playing, like paging through a message
+# quickly, starts on a free voice instead of cutting itself off. With every voice busy the oldest one is restarted, and
+# past _MAX_ACTIVE_VOICES sounding at once the oldest sound anywhere is stopped first. Qt shares the decoded sample
+# between voices of the same file.
+_VOICES_PER_EFFECT = 3
+_MAX_ACTIVE_VOICES = 8
+_START_GRACE_S = 1.0        # a voice that hasn't reported it started by then isn't counted any more
+_active_voices: List[QSoundEffect] = []             # oldest first
+_play_requested: Dict[QSoundEffect, float] = {}     # voice -> perf_counter() of the play call (for the latency log)
+
+class _VoicePool:
+    def __init__(self, name: str, relative_path: str):
+        self.name = name
+        self.voices: List[QSoundEffect] = []
+        self._started: Dict[QSoundEffect, float] = {}
+        self._next = 0
+        for _ in range(_VOICES_PER_EFFECT):
+            eff = QSoundEffect()
+            eff.setVolume(get_volume())
+            eff.setMuted(_sfx_muted)
+            _load_sound(eff, relative_path, name)
+            eff.playingChanged.connect(lambda eff=eff: _on_playing_changed(eff, name))
+            self.voices.append(eff)
+
+    # Next free voice in round robin order, else the one that started longest ago (None while nothing is loaded)
+    def take_voice(self) -> Optional[QSoundEffect]:
+        ready = [eff for eff in self.voices if eff.isLoaded()]
+        if not ready:
+            return None
+        for offset in range(len(ready)):
+            eff = ready[(self._next + offset) % len(ready)]
+            if not eff.isPlaying():
+                self._next = (self._next + offset + 1) % len(ready)
+                break
+        else:
+            eff = min(ready, key=lambda voice: self._started.get(voice, 0.0))
+            eff.stop()
+            debug.debug("All voices of '%s' busy, restarting the oldest", self.name)
+        self._started[eff] = time.perf_counter()
         return eff
 
-    _EFFECTS["menu_open"]         = make("Menu open",         "Audio/Effects/Menu_Open_Sound.wav")
-    _EFFECTS["menu_cancel"]       = make("Menu cancel",       "Audio/Effects/Menu_Cancel_Sound.wav")
-    _EFFECTS["menu_select"]       = make("Menu select",       "Audio/Effects/Menu_Select_Sound.wav")
-    _EFFECTS["menu_failed"]       = make("Menu failed",       "Audio/Effects/Menu_Failed_Sound.wav")
-    _EFFECTS["menu_save_popup"]        = make("Menu save_popup",        "Audio/Effects/Menu_Save_Popup.wav")
-    _EFFECTS["menu_save_complete"]        = make("Menu save_complete",        "Audio/Effects/Menu_Save_Complete.wav")
-    _EFFECTS["menu_message_skip"] = make("Menu message_skip", "Audio/Effects/Menu_Message_Skip.wav")
-    _EFFECTS["menu_cursor_move"]  = make("Menu cursor_move",  "Audio/Effects/Menu_Cursor_Move.wav")
-    _EFFECTS["menu_about_open"]   = make("Menu about_open",   "Audio/Effects/Menu_About_Open.wav")
-    _EFFECTS["menu_about_close"]  = make("Menu about_close",  "Audio/Effects/Menu_About_Close.wav")
-    _EFFECTS["menu_theme_switch"]  = make("Menu theme_switch",  "Audio/Effects/Menu_Theme_Switch.wav")
-    _EFFECTS["menu_theme_save"]  = make("Menu theme_save",  "Audio/Effects/Menu_Theme_Save.wav")
-    
-    debug.info("Sound effects initialized: %s", list(_EFFECTS.keys()))
-    _INITIALIZED = True
+# Keeps the number of sounds playing at once under the cap by stopping the oldest ones.
+# A voice counts from its play() call until playingChanged says it stopped: isPlaying() stays False for a moment after
+# play() while the backend catches up, so polling it would let quick retriggers slip past the cap.
+def _claim_voice_slot(voice: QSoundEffect):
+    now = time.perf_counter()
+    for eff in list(_active_voices):
+        if eff is voice or now - _play_requested.get(eff, now) > _START_GRACE_S:
+            _release_voice(eff)
+    while len(_active_voices) >= _MAX_ACTIVE_VOICES:
+        oldest = _active_voices[0]
+        _release_voice(oldest)
+        oldest.stop()
+        debug.debug("Voice cap of %d reached, stopped the oldest sound", _MAX_ACTIVE_VOICES)
+    _active_voices.append(voice)
+
+def _release_voice(voice: QSoundEffect):
+    if voice in _active_voices:
+        _active_voices.remove(voice)
+    _play_requested.pop(voice, None)
+
+# A stop reported while a new play is still pending is the end of the voice's previous sound, it stays counted
+def _on_playing_changed(voice: QSoundEffect, name: str):
+    if voice.isPlaying():
+        requested = _play_requested.pop(voice, None)
+        if requested is not None:
+            debug.debug("Sound effect '%s' started %.1f ms after the request", name, (time.perf_counter() - requested) * 1000)
+    elif voice not in _play_requested and voice in _active_voices:
+        _active_voices.remove(voice)
+
+# Creates an effect's voices the first time it's needed (Qt decodes the file in the background)
+def _create_effect(name: str) -> Optional[_VoicePool]:
+    pool = _EFFECTS.get(name)
+    if pool is not None:
+        return pool
+    file_name = _get_manifest().get(name)
+    if file_name is None:
+        return None
+    pool = _EFFECTS[name] = _VoicePool(name, os.path.join(_EFFECTS_FOLDER, file_name))
+    return pool
+
+# Loads every effect in the manifest, one per event loop turn so the window never waits on all of them at once
+def preload_sound_effects():
+    _preload_queue[:] = [name for name in _get_manifest() if name not in _EFFECTS]
+    debug.debug("Preloading %d sound effects...", len(_preload_queue))
+    QTimer.singleShot(0, _preload_next_effect)
+
+def _preload_next_effect():
+    while _preload_queue:
+        name = _preload_queue.pop(0)
+        if name not in _EFFECTS:
+            _create_effect(name)
+            break
+    if _preload_queue:
+        QTimer.singleShot(0, _preload_next_effect)
+    else:
+        debug.info("Sound effects initialized: %s", list(_EFFECTS.keys()))
 
 
 def get_effect(name: str) -> Optional[QSoundEffect]:
-    _ensure_initialized()
-    return _EFFECTS.get(name)
+    pool = _create_effect(name)
+    return pool.voices[0] if pool else None
 
 
 def play_sound_by_name(name: str):
-    eff = get_effect(name)
-    if eff:
-        try:
-            eff.play()
-            debug.info("Playing sound effect: %s", name)
-        except Exception as e:
-            debug.error("Failed to play sound '%s': %s", name, e)
-    else:
-        debug.warning("Requested sound '%s' not loaded", name)
+    pool = _create_effect(name)
+    if pool is None:
+        debug.warning("Requested sound '%s' not in the sound manifest", name)
+        return
+    eff = pool.take_voice()
+    if eff is None:
+        # Still decoding (or missing), skipping beats a late sound
+        debug.debug("Sound effect '%s' not ready, skipped", name)
+        return
+    try:
+        _claim_voice_slot(eff)
+        _play_requested[eff] = time.perf_counter()
+        eff.play()
+        debug.info("Playing sound effect: %s", name)
+    except Exception as e:
+        debug.error("Failed to play sound '%s': %s", name, e)
 
 
 # ===================================================================
@@ -323,14 +742,27 @@ def play_sound_by_name(name: str):
 # ===================================================================
 def _load_initial_settings():
     global _bgm_muted, _sfx_muted, _loop_current, _loop_all
-    settings = _get_settings()
-
-    _sfx_muted = settings.value("disable_sounds", False, type=bool)
-    _bgm_muted = settings.value("disable_bgm", False, type=bool)
-    _loop_current = settings.value("loop_current", True, type=bool)
-    _loop_all = settings.value("loop_all", False, type=bool)
+    _sfx_muted = app_settings.value("disable_sounds", False, type=bool)
+    _bgm_muted = app_settings.value("disable_bgm", False, type=bool)
+    _loop_current = app_settings.value("loop_current", True, type=bool)
+    _loop_all = app_settings.value("loop_all", False, type=bool)
     
     debug.debug(
     "Initial settings loaded: disable_sounds=%s, disable_bgm=%s, loop_current=%s, loop_all=%s", _sfx_muted, _bgm_muted, _loop_current, _loop_all)
 
-_load_initial_settings()
\ No newline at end of file
+_load_initial_settings()
+
+# ===================================================================
+# Sound settings apply as soon as they're written, whoever writes them (settings window controls, the setters above)
+# ===================================================================
+def _on_setting_changed(key: str, _value):
+    if key == "disable_sounds":
+        _apply_sfx_muted(app_settings.value(key, False, type=bool))
+    elif key == "sfx_volume":
+        _apply_sfx_volume(get_volume())
+    elif key == "disable_bgm":
+        _apply_bgm_muted(app_settings.value(key, False, type=bool))
+    elif key == "bgm_volume":
+        _apply_bgm_volume(app_settings.value(key, 80, type=int))
+
+app_settings.changed.connect(_on_setting_changed)
\ No newline at end of file
@@ -1,6 +1,5 @@
 import os
 import sys
-from PyQt5.QtCore import QSettings
 from PyQt5.QtCore import Qt
 from PyQt5.QtWidgets import QApplication, QMessageBox, QFileDialog
 from PyQt5.QtGui import QPalette, QColor
@@ -8,7 +7,7 @@ import json
 
 # Project Imports
 from managers.Debug_Manager import debug
-from managers.Resource_Manager import get_external_resource
+from managers.Settings_Manager import SettingsManager, app_settings
 from managers.Sound_Manager import play_sound_by_name
 
 # =====================================================================
@@ -25,7 +24,7 @@ def configure_qt_environment():
 # =====================================================================
 # Dark Theme Toggle Handler
 # =====================================================================
-def handle_dark_theme_toggle(settings: QSettings, controls: dict, dark_enabled: bool):
+def handle_dark_theme_toggle(settings: SettingsManager, controls: dict, dark_enabled: bool):
 
     settings.setValue("dark_theme", dark_enabled)
     debug.debug("Saved 'use_custom_theme' = %s to settings", dark_enabled)
@@ -44,7 +43,7 @@ def handle_dark_theme_toggle(settings: QSettings, controls: dict, dark_enabled:
 # =====================================================================
 # Custom Theme Toggle Handler
 # =====================================================================
-def handle_custom_theme_toggle(settings: QSettings, controls: dict, custom_enabled: bool):
+def handle_custom_theme_toggle(settings: SettingsManager, controls: dict, custom_enabled: bool):
 
     settings.setValue("use_custom_theme", custom_enabled)
     debug.debug("Saved 'use_custom_theme' = %s to settings", custom_enabled)
@@ -65,14 +64,12 @@ def handle_custom_theme_toggle(settings: QSettings, controls: dict, custom_enabl
 # Applying theme Method
 # =====================================================================
 def apply_theme_to(app):
-    settings = QSettings(get_external_resource("Settings.ini"), QSettings.IniFormat)
-    
     # Check if custom theme is enabled
-    if settings.value("use_custom_theme", False, type=bool):
+    if app_settings.value("use_custom_theme", False, type=bool):
         debug.debug("Applying custom theme from Settings.ini...")
-        app.setPalette(_custom_palette(settings))
+        app.setPalette(_custom_palette(app_settings))
         debug.info("Applied custom theme from Settings.ini!")
-    elif settings.value("dark_theme", False, type=bool):
+    elif app_settings.value("dark_theme", False, type=bool):
         debug.debug("Applying built-in dark Fusion theme...")
         app.setPalette(_fusion_dark_palette())
         debug.info("Applied built-in dark Fusion theme!")
@@ -118,7 +115,7 @@ def _fusion_dark_palette():
 # =====================================================================
 # Custom Theme Method (slider-based colours)
 # =====================================================================
-def _custom_palette(settings: QSettings) -> QPalette:
+def _custom_palette(settings: SettingsManager) -> QPalette:
     palette = QPalette()
 
     def get_color(key, default):
@@ -158,7 +155,7 @@ def _custom_palette(settings: QSettings) -> QPalette:
 # =====================================================================
 # Slider handler for Colour changes
 # =====================================================================
-def handle_color_slider_change(settings: QSettings, key: str, value: int):
+def handle_color_slider_change(settings: SettingsManager, key: str, value: int):
     settings.setValue(key, value)
 
     # Only apply theme if custom theme is enabled
@@ -170,7 +167,7 @@ def handle_color_slider_change(settings: QSettings, key: str, value: int):
 # =====================================================================
 # Export Custom Theme
 # =====================================================================
-def export_custom_theme(settings: QSettings, parent=None):
+def export_custom_theme(settings: SettingsManager, parent=None):
     debug.debug("Theme Export Process Starting")
     theme_data = {}
     for key_base in ["window","window_text","base","alternate_base","tooltip_base","tooltip_text",
@@ -202,7 +199,7 @@ def export_custom_theme(settings: QSettings, parent=None):
 # =====================================================================
 # Import Custom Theme
 # =====================================================================
-def import_custom_theme(settings: QSettings, controls: dict, parent=None):
+def import_custom_theme(settings: SettingsManager, controls: dict, parent=None):
     debug.debug("Theme Import Process Starting")
     if not settings.value("use_custom_theme", False, type=bool):
         debug.debug("Theme Import Failed: 'Use Custom Theme' is not enabled")
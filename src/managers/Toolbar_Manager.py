@@ -8,7 +8,7 @@ from frames.build.TagTypes_Frame import TagTypes
 from frames.build.IconTypes_Frame import IconTypes
 from frames.build.About_Frame import About
 from frames.build.Settings_Frame import Settings
-from renderer.File_Handler import open_file_or_folder, save_file
+from renderer.File_Handler import open_file_or_folder, save_file, cancel_open
 from managers.Debug_Manager import debug
 from managers.Resource_Manager import load_font
 
@@ -85,7 +85,8 @@ def build_toolbar(parent, text_editor, status_label):
     QShortcut(QKeySequence("Ctrl+S"), parent, activated=btn_save_file.click)
     QShortcut(QKeySequence("Ctrl+P"), parent, activated=btn_settings.click)
     QShortcut(QKeySequence("Ctrl+I"), parent, activated=btn_about.click)
-    debug.debug("Keyboard shortcuts registered: Ctrl+O, Ctrl+S, Ctrl+P, Ctrl+I")
+    QShortcut(QKeySequence("Esc"), parent, activated=lambda: cancel_open(parent))
+    debug.debug("Keyboard shortcuts registered: Ctrl+O, Ctrl+S, Ctrl+P, Ctrl+I, Esc")
 
     # =====================================================================
     # Connect Adaptive widgets
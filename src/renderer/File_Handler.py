@@ -1,8 +1,13 @@
+import os
+from typing import List, Tuple
 from PyQt5.QtWidgets import QFileDialog, QMessageBox
+from PyQt5.QtGui import QTextCursor
+from PyQt5.QtCore import QObject, QThread, QTimer, pyqtSignal
 
 # Project Imports
 from managers.Debug_Manager import debug
 from managers.Sound_Manager import play_sound_by_name
+from renderer.utils import spm_codec
 
 
 #===================================================================================================================================
@@ -11,28 +16,14 @@ from managers.Sound_Manager import play_sound_by_name
 # Convert visually marked-up text to raw bytes with control characters.
 def encode_visible_to_bytes(visible_text: str) -> bytes:
     debug.debug("Encoding visible text to bytes (length=%d)", len(visible_text))
-    clean_text = visible_text.replace('[LF]\r\n', '[LF]').replace('[LF]\n', '[LF]')
-    clean_text = clean_text.replace('[CR]\r\n', '[CR]').replace('[CR]\n', '[CR]')
-    
-    encoded = (
-        clean_text
-        .replace('[NUL]', '\x00')
-        .replace('[LF]', '\x0A')
-        .replace('[CR]', '\x0D')
-    ).encode('latin1')
+    encoded = spm_codec.encode(visible_text)
     debug.debug("Finished encoding. Result length=%d", len(encoded))
     return encoded
 
 # Convert raw bytes into visually marked-up text for the editor.
 def decode_bytes_to_visible(raw_bytes: bytes) -> str:
     debug.debug("Decoding raw bytes to visible text (length=%d)", len(raw_bytes))
-    content = raw_bytes.decode('latin1')
-    decoded = (
-        content
-        .replace('\x00', '[NUL]')
-        .replace('\x0A', '[LF]\n')
-        .replace('\x0D', '[CR]\n')
-    )
+    decoded = spm_codec.decode(raw_bytes)
     debug.debug("Finished decoding. Result length=%d", len(decoded))
     return decoded
 
@@ -42,6 +33,13 @@ def decode_bytes_to_visible(raw_bytes: bytes) -> str:
 def save_file(parent, text_editor, status_label):
     debug.debug("Save operation triggered...")
 
+    # A file still going into the editor would only be saved half way
+    if getattr(parent, "_file_load", None):
+        debug.warning("Save refused, a file is still being opened")
+        play_sound_by_name("menu_failed")
+        status_label.setText('<span style="color:yellow; font-weight:bold; font-size:12pt;">Wait for the file to finish opening (or Esc to cancel) before saving.</span>')
+        return
+
     play_sound_by_name("menu_save_popup")
 
     # Ask user if they want to overwrite or save as a new file
@@ -110,6 +108,87 @@ def save_file(parent, text_editor, status_label):
 
             status_label.setText('<span style="color:yellow; font-weight:bold; font-size:12pt;">Save cancelled.</span>')
 
+#===================================================================================================================================
+# Background File Loader (reads + decodes off the GUI thread)
+#===================================================================================================================================
+_READ_CHUNK_SIZE = 1024 * 1024      # bytes read between progress reports / cancel checks
+_POPULATE_CHUNK_SIZE = 256 * 1024   # characters pushed into the editor per event loop tick
+
+# Every load thread (and its worker) stays referenced here until the thread finishes, cancelled ones included,
+# so nothing is collected mid-read and closing the window can still wait for them
+_load_threads: List[Tuple[QThread, "FileLoadWorker"]] = []
+
+class FileLoadWorker(QObject):
+    progress = pyqtSignal(int)
+    loaded = pyqtSignal(str)
+    failed = pyqtSignal(str)
+    cancelled = pyqtSignal()
+
+    def __init__(self, file_name: str):
+        super().__init__()
+        self.file_name = file_name
+        self._cancel_requested = False
+
+    # Only flips a flag, the worker notices it between chunks
+    def cancel(self):
+        self._cancel_requested = True
+
+    def run(self):
+        try:
+            total = max(1, os.path.getsize(self.file_name))
+            chunks = []
+            read = 0
+            with open(self.file_name, "rb") as file:
+                while True:
+                    if self._cancel_requested:
+                        debug.info("File load cancelled while reading: %s", self.file_name)
+                        self.cancelled.emit()
+                        return
+                    chunk = file.read(_READ_CHUNK_SIZE)
+                    if not chunk:
+                        break
+                    chunks.append(chunk)
+                    read += len(chunk)
+                    self.progress.emit(min(100, read * 100 // total))
+            raw_bytes = b"".join(chunks)
+            debug.debug("Read %d bytes from file", len(raw_bytes))
+
+            # Control character replacment (visually)
+            visible_content = decode_bytes_to_visible(raw_bytes)
+            if self._cancel_requested:
+                self.cancelled.emit()
+                return
+            self.loaded.emit(visible_content)
+        except Exception as e:
+            self.failed.emit(str(e))
+
+# =====================================================================
+# Cancel whatever open is currently running (safe to call when idle)
+# =====================================================================
+# wait also blocks until every load thread still winding down has finished (used when the window closes)
+def cancel_open(parent, wait: bool = False) -> bool:
+    load = getattr(parent, "_file_load", None)
+    if load:
+        debug.debug("Cancelling in-flight file open: %s", load["file_name"])
+        if load["populate_timer"] is not None:
+            # Half a file in the editor is worse than none, it could get saved over the original
+            load["populate_timer"].stop()
+            load["text_editor"].clear()
+            load["text_editor"].document().setUndoRedoEnabled(True)
+            load["text_editor"].setReadOnly(False)
+        else:
+            load["worker"].cancel()
+        load["status_label"].setText('<span style="color:yellow; font-weight:bold; font-size:12pt;">Open cancelled.</span>')
+        play_sound_by_name("menu_cancel")
+        parent._file_load = None
+    if wait:
+        # quit() straight away, the quit queued by the worker's signals would wait for this (blocked) thread
+        for thread, worker in list(_load_threads):
+            worker.cancel()
+            thread.quit()
+            thread.wait()
+    return load is not None
+
 #===================================================================================================================================
 #Open Handler for the open button (only looks and opens txt's)                                                                     
 #===================================================================================================================================
@@ -126,23 +205,51 @@ def open_file_or_folder(parent, text_editor, status_label, box_button, tag_butto
 
     if file_name:
         debug.debug("User selected file: %s", file_name)
-        try:
-            # Only allow txt's to be read!
-            if not file_name.lower().endswith('.txt'):
-                debug.warning("Rejected file (not .txt): %s", file_name)
-                raise ValueError("Only .txt files are supported.")
-            
-            # Read as binary to preserve special characters
-            with open(file_name, "rb") as file:
-                raw_bytes = file.read()
-            debug.debug("Read %d bytes from file", len(raw_bytes))
 
-            # Control character replacment (visually) 
-            visible_content = decode_bytes_to_visible(raw_bytes)
+        # Only allow txt's to be read!
+        if not file_name.lower().endswith('.txt'):
+            debug.warning("Rejected file (not .txt): %s", file_name)
+            _open_failed(parent, status_label, file_name, "Only .txt files are supported.")
+            return
+
+        # A new open replaces any slow one still running
+        cancel_open(parent)
+
+        worker = FileLoadWorker(file_name)
+        thread = QThread(parent)
+        worker.moveToThread(thread)
+        load = {
+            "file_name": file_name,
+            "worker": worker,
+            "text_editor": text_editor,
+            "status_label": status_label,
+            "populate_timer": None,
+        }
+        parent._file_load = load
+
+        # Every handler checks the load is still the current one so a cancelled worker can't touch the UI
+        def is_current() -> bool:
+            return getattr(parent, "_file_load", None) is load
+
+        def on_progress(percent: int):
+            if is_current():
+                status_label.setText(f'<span style="font-weight:bold; font-size:12pt;">Opening {file_name}... {percent}% (Esc to cancel)</span>')
+
+        def on_failed(message: str):
+            if is_current():
+                parent._file_load = None
+                _open_failed(parent, status_label, file_name, message)
+
+        # The editor stops belonging to the previous file as soon as the new text starts going in
+        def on_loaded(visible_content: str):
+            if is_current():
+                parent.current_file_path = None
+                parent.update_window_title()
+                _populate_editor(parent, load, visible_content, on_populated)
+
+        def on_populated():
+            parent._file_load = None
 
-            # Set the content as in text editor
-            text_editor.setPlainText(visible_content)
-            
             #Other things to do when the file is opened
             status_label.setText(f'<span style="color:#32CD32; font-weight:bold; font-size:12pt;">SPM Text File Opened at: {file_name}</span>')
             box_button.setEnabled(True)
@@ -151,32 +258,28 @@ def open_file_or_folder(parent, text_editor, status_label, box_button, tag_butto
             parent.current_file_path = file_name
             parent.update_window_title()
 
-            # Make the main window rebuild the bubble view if it's enabled
-            if hasattr(parent, "refresh_view"):
-                debug.debug("Refreshing view for opened file")
-                parent.refresh_view()
-            
             # Select sound effect for the file that was selected (added a redundancy incase the file cannot be loaded)
             play_sound_by_name("menu_select")
             debug.info("File opened successfully: %s", file_name)
 
-        # The scenario if an incompatible file is picked (basically a lot of fuck you and an appropriate sound effect being played)!
-        except Exception as e:
-
-            # Creating the error box explaining the issue
-            debug.error("Failed to open file %s: %s", file_name, e)
-            error_box = QMessageBox(parent)
-            error_box.setIcon(QMessageBox.Critical)
-            error_box.setWindowTitle("Error")
-            error_box.setText(f"Could not open file:\n{str(e)}")
-            error_box.setStandardButtons(QMessageBox.Ok)
-            error_box.show()
+            # Make the main window rebuild the bubble view if it's enabled (next tick so the editor paints first)
+            if hasattr(parent, "refresh_view"):
+                debug.debug("Refreshing view for opened file")
+                QTimer.singleShot(0, parent.refresh_view)
 
-            # Failed sound effect for opening an invalid file whomp whomp!
-            play_sound_by_name("menu_failed")
+        worker.progress.connect(on_progress)
+        worker.loaded.connect(on_loaded)
+        worker.failed.connect(on_failed)
+        for done in (worker.loaded, worker.failed, worker.cancelled):
+            done.connect(thread.quit)
+        thread.started.connect(worker.run)
+        thread.finished.connect(lambda: _load_threads.remove((thread, worker)))
+        thread.finished.connect(worker.deleteLater)
+        thread.finished.connect(thread.deleteLater)
 
-            # Updating the status label to reflect what happened (in red because it's bad)!
-            status_label.setText('<span style="color:red; font-weight:bold; font-size:12pt;">Failed to open file!</span>')
+        status_label.setText(f'<span style="font-weight:bold; font-size:12pt;">Opening {file_name}... (Esc to cancel)</span>')
+        _load_threads.append((thread, worker))
+        thread.start()
     
     # Scenario if you decide to cancel out of the "Open File" menu.
     else:
@@ -184,4 +287,66 @@ def open_file_or_folder(parent, text_editor, status_label, box_button, tag_butto
         play_sound_by_name("menu_cancel")
 
         # Updating the status label to reflect what happened (in yellow because it's neutral)!
-        status_label.setText('<span style="color:yellow; font-weight:bold; font-size:12pt;">No file selected.</span>')
\ No newline at end of file
+        status_label.setText('<span style="color:yellow; font-weight:bold; font-size:12pt;">No file selected.</span>')
+
+# =====================================================================
+# Pushes the decoded text into the editor a chunk per tick so the window keeps repainting
+# =====================================================================
+def _populate_editor(parent, load, visible_content: str, on_done):
+    text_editor = load["text_editor"]
+    status_label = load["status_label"]
+    total = len(visible_content)
+
+    # Small files go in in one shot just like before
+    if total <= _POPULATE_CHUNK_SIZE:
+        text_editor.setPlainText(visible_content)
+        on_done()
+        return
+
+    # setPlainText wipes the undo history anyway, so skip recording every chunk. No typing into a half filled editor either.
+    text_editor.document().setUndoRedoEnabled(False)
+    text_editor.setReadOnly(True)
+    text_editor.setPlainText(visible_content[:_POPULATE_CHUNK_SIZE])
+    cursor = QTextCursor(text_editor.document())
+    state = {"offset": _POPULATE_CHUNK_SIZE}
+
+    timer = QTimer(parent)
+    load["populate_timer"] = timer
+
+    def push_chunk():
+        offset = state["offset"]
+        if offset >= total:
+            timer.stop()
+            timer.deleteLater()
+            text_editor.document().setUndoRedoEnabled(True)
+            text_editor.setReadOnly(False)
+            on_done()
+            return
+        cursor.movePosition(QTextCursor.End)
+        cursor.insertText(visible_content[offset:offset + _POPULATE_CHUNK_SIZE])
+        state["offset"] = offset + _POPULATE_CHUNK_SIZE
+        status_label.setText(f'<span style="font-weight:bold; font-size:12pt;">Loading text... {min(100, state["offset"] * 100 // total)}% (Esc to cancel)</span>')
+
+    timer.timeout.connect(push_chunk)
+    timer.start(0)
+
+# =====================================================================
+# Shared failure handling for the open handler and the worker
+# =====================================================================
+def _open_failed(parent, status_label, file_name: str, message: str):
+
+    # The scenario if an incompatible file is picked (basically a lot of fuck you and an appropriate sound effect being played)!
+    # Creating the error box explaining the issue
+    debug.error("Failed to open file %s: %s", file_name, message)
+    error_box = QMessageBox(parent)
+    error_box.setIcon(QMessageBox.Critical)
+    error_box.setWindowTitle("Error")
+    error_box.setText(f"Could not open file:\n{message}")
+    error_box.setStandardButtons(QMessageBox.Ok)
+    error_box.show()
+
+    # Failed sound effect for opening an invalid file whomp whomp!
+    play_sound_by_name("menu_failed")
+
+    # Updating the status label to reflect what happened (in red because it's bad)!
+    status_label.setText('<span style="color:red; font-weight:bold; font-size:12pt;">Failed to open file!</span>')
@@ -0,0 +1,118 @@
+from PyQt5.QtCore import QObject, QThread, QTimer, pyqtSignal, pyqtSlot
+
+# Project Imports
+from managers.Debug_Manager import debug
+
+#===================================================================================================================================
+# Live Bubble Preview (reparses while typing, off the GUI thread)
+#===================================================================================================================================
+# While enabled every parse goes through the worker thread in order, so the incremental parser is never used by two threads
+# at once. The GUI thread only bumps a counter and restarts a timer per keystroke, then hands over a snapshot of the text plus
+# the edit range collected by the parser once the typing settles. Results from before the latest keystroke are dropped.
+_DEBOUNCE_MS = 300
+
+class _ParseWorker(QObject):
+    parsed = pyqtSignal(int, object, object)
+
+    def __init__(self, parser):
+        super().__init__()
+        self._parser = parser
+
+    # The text comes in as object so the snapshot isn't copied into a QString and back on its way across threads
+    @pyqtSlot(int, object, object)
+    def parse(self, generation: int, visible_text: str, pending):
+        try:
+            self._parser.reparse_edit(visible_text, pending)
+        except Exception as e:
+            # The incremental state can't be trusted after a failed edit, so start over from a full parse of the snapshot
+            debug.error("Live preview parse failed, reparsing everything: %s", e)
+            self._parser.invalidate()
+            try:
+                self._parser.reparse_edit(visible_text, None)
+            except Exception as e:
+                debug.error("Live preview full reparse failed: %s", e)
+                self._parser.invalidate()
+                return
+        self.parsed.emit(generation, list(self._parser.blocks), self._parser.source_index())
+
+
+class LivePreview(QObject):
+    _request = pyqtSignal(int, object, object)
+
+    # apply(blocks, source_index) is called on the GUI thread with every parse that is still current
+    def __init__(self, text_editor, parser, apply, parent=None):
+        super().__init__(parent)
+        self._text_editor = text_editor
+        self._parser = parser
+        self._apply_parse = apply
+        self._generation = 0
+        self._applied_generation = -1
+        self._thread = None
+        self._worker = None
+
+        self._debounce = QTimer(self)
+        self._debounce.setSingleShot(True)
+        self._debounce.setInterval(_DEBOUNCE_MS)
+        self._debounce.timeout.connect(self.refresh_now)
+
+    def is_enabled(self) -> bool:
+        return self._thread is not None
+
+    # True once the last edit has been parsed and applied (the source index matches the editor again)
+    def is_settled(self) -> bool:
+        return self._applied_generation == self._generation and not self._debounce.isActive()
+
+    # =====================================================================
+    # Turning it on and off
+    # =====================================================================
+    def set_enabled(self, enabled: bool):
+        if enabled == self.is_enabled():
+            return
+        if enabled:
+            self._worker = _ParseWorker(self._parser)
+            self._thread = QThread(self)
+            self._worker.moveToThread(self._thread)
+            self._request.connect(self._worker.parse)
+            self._worker.parsed.connect(self._apply)
+            self._thread.finished.connect(self._worker.deleteLater)
+            self._thread.start()
+            self._text_editor.textChanged.connect(self._on_text_changed)
+            debug.info("Live preview enabled")
+            self.refresh_now()
+        else:
+            self._text_editor.textChanged.disconnect(self._on_text_changed)
+            self._debounce.stop()
+            self._generation += 1
+
+            # Wait for a parse still running so the parser is back to single threaded use
+            self._request.disconnect(self._worker.parse)
+            self._thread.quit()
+            self._thread.wait()
+            self._thread.deleteLater()
+            self._thread = None
+            self._worker = None
+            debug.info("Live preview disabled")
+
+    def shutdown(self):
+        self.set_enabled(False)
+
+    # =====================================================================
+    # GUI thread side
+    # =====================================================================
+    def _on_text_changed(self):
+        self._generation += 1
+        self._debounce.start()
+
+    # Parses the current text right away (also used by refresh_view while live preview is on)
+    def refresh_now(self):
+        if not self.is_enabled():
+            return
+        self._debounce.stop()
+        self._request.emit(self._generation, self._text_editor.toPlainText(), self._parser.take_pending())
+
+    def _apply(self, generation: int, blocks, source_index):
+        if generation != self._generation:
+            debug.debug("Dropping stale live preview parse (generation %d, now %d)", generation, self._generation)
+            return
+        self._applied_generation = generation
+        self._apply_parse(blocks, source_index)
@@ -17,3 +17,7 @@ class BubbleBlock:
         self.position = position
         self.pages = pages
         self.bubble_sound = bubble_sound
+
+    # Identity used to match a freshly parsed block with the one already on screen (stage id plus a hash of the rest)
+    def content_key(self) -> Tuple[str, int]:
+        return self.stage_npc, hash((self.bubble_type, tuple(self.position), tuple(self.pages), self.bubble_sound))
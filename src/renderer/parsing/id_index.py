@@ -0,0 +1,212 @@
+import re
+from typing import Dict, Iterable, List, Optional
+
+# Project Imports
+from managers.Debug_Manager import debug
+from renderer.models.bubble_block import BubbleBlock
+
+#===================================================================================================================================
+# Stage id lookup (prefix trie plus typo / subsequence fallbacks, for the search dropdown)
+#===================================================================================================================================
+# Ids are stored case folded in a trie, a node keeps the original spelling of the ids ending there and a mask of every
+# character found below it. A query is answered in up to three passes, each ranked below the one before it:
+#   1. ids starting with the query (walk down the trie, then depth first in sorted order)
+#   2. ids starting with something one typo away (edit distance rows carried down the trie, branches pruned early)
+#   3. ids containing the query's characters in order ("s11000" -> stg1_1_000)
+# Blocks are tracked by identity like the text index, each id is counted so it leaves the trie with its last bubble.
+_MAX_TYPOS = 1
+
+def _bit(ch: str) -> int:
+    return 1 << (ord(ch) & 63)
+
+# Masks of the characters of key from every position on (one more entry than key has characters)
+def _suffix_masks(key: str) -> List[int]:
+    masks = [0] * (len(key) + 1)
+    for position in range(len(key) - 1, -1, -1):
+        masks[position] = masks[position + 1] | _bit(key[position])
+    return masks
+
+class _Node:
+    __slots__ = ("children", "spellings", "mask")
+
+    def __init__(self):
+        self.children: Dict[str, "_Node"] = {}
+        self.spellings: List[str] = []
+        self.mask = 0
+
+
+class StageIdIndex:
+    def __init__(self):
+        self._root = _Node()
+        self._counts: Dict[str, int] = {}
+        self._id_of: Dict[BubbleBlock, str] = {}
+        self._blocks_of: Dict[str, List[BubbleBlock]] = {}
+        self._joined: Optional[str] = None      # every id case folded, one per line (for the subsequence pass)
+
+    def __len__(self) -> int:
+        return len(self._counts)
+
+    # =====================================================================
+    # Keeping up with the viewer
+    # =====================================================================
+    def update(self, blocks: Iterable[BubbleBlock]):
+        current = set(blocks)
+        indexed = self._id_of.keys()
+        removed = indexed - current
+        added = current - indexed
+
+        # Dropping most of the ids node by node costs more than starting over
+        if len(removed) > len(current):
+            self.clear()
+            indexed = self._id_of.keys()
+            removed, added = set(), current
+
+        for block in removed:
+            stage_id = self._id_of.pop(block)
+            self._blocks_of[stage_id].remove(block)
+            self._counts[stage_id] -= 1
+            if not self._counts[stage_id]:
+                del self._counts[stage_id]
+                del self._blocks_of[stage_id]
+                self._remove(stage_id)
+
+        for block in added:
+            stage_id = block.stage_npc
+            self._id_of[block] = stage_id
+            self._blocks_of.setdefault(stage_id, []).append(block)
+            if stage_id in self._counts:
+                self._counts[stage_id] += 1
+            else:
+                self._counts[stage_id] = 1
+                self._insert(stage_id)
+
+        if removed or added:
+            self._joined = None
+            debug.debug("Id index updated: %d removed, %d added, %d ids", len(removed), len(added), len(self._counts))
+
+    def clear(self):
+        self._root = _Node()
+        self._counts.clear()
+        self._id_of.clear()
+        self._blocks_of.clear()
+        self._joined = None
+
+    # Bubbles currently carrying an id (in no particular order)
+    def blocks_for(self, stage_id: str) -> List[BubbleBlock]:
+        return self._blocks_of.get(stage_id, [])
+
+    def _insert(self, stage_id: str):
+        key = stage_id.casefold()
+        masks = _suffix_masks(key)
+        node = self._root
+        for depth, ch in enumerate(key):
+            node.mask |= masks[depth]
+            child = node.children.get(ch)
+            if child is None:
+                child = node.children[ch] = _Node()
+            node = child
+        node.spellings.append(stage_id)
+
+    def _remove(self, stage_id: str):
+        key = stage_id.casefold()
+        path = [self._root]
+        for ch in key:
+            path.append(path[-1].children[ch])
+        path[-1].spellings.remove(stage_id)
+
+        # Drop the nodes that no longer lead anywhere and recompute the masks of the ones above them
+        for depth in range(len(key), 0, -1):
+            node, parent = path[depth], path[depth - 1]
+            if not node.children and not node.spellings:
+                del parent.children[key[depth - 1]]
+            parent.mask = 0
+            for ch, child in parent.children.items():
+                parent.mask |= _bit(ch) | child.mask
+
+    # =====================================================================
+    # Queries
+    # =====================================================================
+    def lookup(self, query: str, limit: int = 20) -> List[str]:
+        key = query.strip().casefold()
+        if not key or limit <= 0:
+            return []
+        results = self._prefix_matches(key, limit)
+        for fallback in (self._typo_matches, self._subsequence_matches):
+            if len(results) >= limit:
+                break
+            seen = set(results)
+            results.extend(stage_id for stage_id in fallback(key, limit) if stage_id not in seen)
+            del results[limit:]
+        return results
+
+    # Exact id first, then the rest of the subtree in sorted order
+    def _prefix_matches(self, key: str, limit: int) -> List[str]:
+        node = self._root
+        for ch in key:
+            node = node.children.get(ch)
+            if node is None:
+                return []
+        return _collect(node, limit)
+
+    # Ids whose start is a typo away from the query (one edit distance row per trie node), in sorted order
+    def _typo_matches(self, key: str, limit: int) -> List[str]:
+        found: List[str] = []
+        first_row = list(range(len(key) + 1))
+        stack = [(child, ch, first_row) for ch, child in self._root.children.items()]
+        while stack and len(found) < limit:
+            node, ch, previous = stack.pop()
+            row = [previous[0] + 1]
+            for column in range(1, len(key) + 1):
+                row.append(min(
+                    row[column - 1] + 1,
+                    previous[column] + 1,
+                    previous[column - 1] + (key[column - 1] != ch),
+                ))
+            if row[-1] <= _MAX_TYPOS:
+                # Everything below starts close enough, going deeper can only find what the prefix pass already did
+                found.extend(_collect(node, limit - len(found)))
+            elif min(row) <= _MAX_TYPOS:
+                stack.extend((child, next_ch, row) for next_ch, child in node.children.items())
+        return sorted(found, key=str.casefold)
+
+    # Ids containing the query's characters in order, in sorted order. The root's mask rules out most misses straight away,
+    # the rest is one regex over all the (case folded) ids, each character taken at its first occurrence so a line never
+    # backtracks.
+    def _subsequence_matches(self, key: str, limit: int) -> List[str]:
+        needed = _suffix_masks(key)[0]
+        if self._root.mask & needed != needed:
+            return []
+        if self._joined is None:
+            self._joined = "\n".join(sorted({stage_id.casefold() for stage_id in self._counts}))
+        joined = self._joined
+        pattern = re.compile(re.escape(key[0]) + "".join(f"[^{re.escape(ch)}\n]*{re.escape(ch)}" for ch in key[1:]))
+
+        results: List[str] = []
+        position = 0
+        while len(results) < limit:
+            match = pattern.search(joined, position)
+            if match is None:
+                break
+            line_start = joined.rfind("\n", 0, match.start()) + 1
+            line_end = joined.find("\n", match.end())
+            if line_end < 0:
+                line_end = len(joined)
+            results.extend(self._spellings(joined[line_start:line_end]))
+            position = line_end + 1
+        return results[:limit]
+
+    def _spellings(self, key: str) -> List[str]:
+        node = self._root
+        for ch in key:
+            node = node.children[ch]
+        return node.spellings
+
+# First ids below a trie node, depth first with the children in sorted order (so shorter ids come before their extensions)
+def _collect(node: _Node, limit: int) -> List[str]:
+    results: List[str] = []
+    stack = [node]
+    while stack and len(results) < limit:
+        node = stack.pop()
+        results.extend(node.spellings)
+        stack.extend(node.children[ch] for ch in sorted(node.children, reverse=True))
+    return results[:limit]
@@ -0,0 +1,202 @@
+from bisect import bisect_left, bisect_right
+from typing import List, Optional, Tuple
+
+# Project Imports
+from managers.Debug_Manager import debug
+from renderer.models.bubble_block import BubbleBlock
+from renderer.parsing.spm_parser import Token, TOKEN_STAGE, _tokenize_line, _parse_tokens
+from renderer.parsing.source_index import SourceIndex
+
+#===================================================================================================================================
+# Incremental SPM Text parser (only reparses the messages an edit touched)
+#===================================================================================================================================
+# Parsing is local to a message: every bubble is built only from the tokens between its stage token and the next one.
+# So the parser keeps the tokens of every physical line plus the list of "segments" (a stage token and everything up to
+# the next one, segment 0 being whatever comes before the first stage token) and on an edit only re-tokenizes the changed
+# lines and reparses the segments around them.
+class IncrementalSpmParser:
+    def __init__(self):
+        self.blocks: List[BubbleBlock] = []
+        self._text: Optional[str] = None
+        self._line_tokens: List[List[Token]] = []
+        self._line_lengths: List[int] = []     # characters per \n line, counting its \n
+
+        # Segment starts as (line, token index in that line) plus the blocks each segment produced
+        self._seg_lines: List[int] = []
+        self._seg_toks: List[int] = []
+        self._seg_blocks: List[List[BubbleBlock]] = []
+
+        # Edits collected since the last reparse: old text [start, start + removed) became new text [start, start + added)
+        self._pending: Optional[Tuple[int, int, int]] = None
+
+    # =====================================================================
+    # Edit tracking (connect QTextDocument.contentsChange straight to this)
+    # =====================================================================
+    def note_change(self, position: int, chars_removed: int, chars_added: int):
+        if self._pending is None:
+            self._pending = (position, chars_removed, chars_added)
+            return
+
+        # Merge with the region already dirty so several edits become one reparse
+        start, removed, added = self._pending
+        new_start = min(start, position)
+        current_end = max(start + added, position + chars_removed)
+        merged_removed = (current_end - new_start) - added + removed
+        merged_added = (current_end - new_start) - chars_removed + chars_added
+        self._pending = (new_start, merged_removed, merged_added)
+
+    def has_pending_edits(self) -> bool:
+        return self._pending is not None
+
+    def invalidate(self):
+        self._text = None
+        self._pending = None
+
+    # Hands over (and forgets) the edits collected so far, for parsing them somewhere else with reparse_edit
+    def take_pending(self) -> Optional[Tuple[int, int, int]]:
+        pending, self._pending = self._pending, None
+        return pending
+
+    # =====================================================================
+    # Full parse
+    # =====================================================================
+    def parse(self, visible_text: str) -> List[BubbleBlock]:
+        self._pending = None
+        return self._parse_all(visible_text)
+
+    def _parse_all(self, visible_text: str) -> List[BubbleBlock]:
+        self._text = visible_text
+        pieces = visible_text.split("\n")
+        self._line_tokens = [self._tokenize_physical_line(piece) for piece in pieces]
+        self._line_lengths = [len(piece) + 1 for piece in pieces]
+        self._line_lengths[-1] -= 1
+        self._seg_lines, self._seg_toks, self._seg_blocks = [0], [0], [[]]
+        self.blocks = self._rebuild_segments(0, 1)
+        debug.info("Parsing complete. Total bubbles: %d", len(self.blocks))
+        return self.blocks
+
+    # =====================================================================
+    # Reparse after edits, returns (first block index, number of old blocks replaced, new blocks)
+    # =====================================================================
+    def reparse(self, visible_text: str) -> Tuple[int, int, List[BubbleBlock]]:
+        return self.reparse_edit(visible_text, self.take_pending())
+
+    # Same as reparse but with the edit range given explicitly, so the live preview can run it off the UI thread while
+    # note_change keeps collecting the next edits (only touches the parser state, never _pending)
+    def reparse_edit(self, visible_text: str, pending: Optional[Tuple[int, int, int]]) -> Tuple[int, int, List[BubbleBlock]]:
+        old_text = self._text
+        if old_text is None or pending is None:
+            if old_text == visible_text:
+                return 0, 0, []
+            old_count = len(self.blocks)
+            self._parse_all(visible_text)
+            return 0, old_count, list(self.blocks)
+
+        position, removed, added = pending
+
+        # contentsChange counts the document's closing paragraph separator, so clamp to the real text
+        position = min(position, len(old_text), len(visible_text))
+        removed = min(removed, len(old_text) - position)
+        added = min(added, len(visible_text) - position)
+        if len(visible_text) - len(old_text) != added - removed:
+            debug.warning("Edit range doesn't match the text, falling back to a full reparse")
+            old_count = len(self.blocks)
+            self._parse_all(visible_text)
+            return 0, old_count, list(self.blocks)
+
+        self._text = visible_text
+
+        # Physical lines touched by the edit (old and new numbering share the first one)
+        first_line = old_text.count("\n", 0, position)
+        last_old_line = first_line + old_text.count("\n", position, position + removed)
+        last_new_line = first_line + visible_text.count("\n", position, position + added)
+
+        region_start = visible_text.rfind("\n", 0, position) + 1
+        region_end = visible_text.find("\n", position + added)
+        if region_end == -1:
+            region_end = len(visible_text)
+        pieces = visible_text[region_start:region_end].split("\n")
+        self._line_tokens[first_line:last_old_line + 1] = [self._tokenize_physical_line(piece) for piece in pieces]
+        lengths = [len(piece) + 1 for piece in pieces]
+        if region_end == len(visible_text):
+            lengths[-1] -= 1
+        self._line_lengths[first_line:last_old_line + 1] = lengths
+
+        # Segments that start before the edit are kept, the ones after it are kept but shifted
+        first_seg = max(0, bisect_left(self._seg_lines, first_line) - 1)
+        next_seg = bisect_right(self._seg_lines, last_old_line)
+        line_delta = last_new_line - last_old_line
+        if line_delta:
+            for index in range(next_seg, len(self._seg_lines)):
+                self._seg_lines[index] += line_delta
+
+        block_start = sum(len(blocks) for blocks in self._seg_blocks[:first_seg])
+        old_count = sum(len(blocks) for blocks in self._seg_blocks[first_seg:next_seg])
+        new_blocks = self._rebuild_segments(first_seg, next_seg)
+        self.blocks[block_start:block_start + old_count] = new_blocks
+
+        debug.debug(
+            "Incremental reparse: lines %d-%d, segments %d-%d, %d bubbles replaced by %d",
+            first_line, last_new_line, first_seg, next_seg, old_count, len(new_blocks),
+        )
+        return block_start, old_count, new_blocks
+
+    # =====================================================================
+    # Snapshot of where the current blocks came from (see SourceIndex)
+    # =====================================================================
+    def source_index(self) -> SourceIndex:
+        return SourceIndex(
+            self._text or "",
+            list(self._line_lengths),
+            list(self._line_tokens),
+            list(self._seg_lines),
+            list(self._seg_toks),
+            list(self._seg_blocks),
+        )
+
+    # =====================================================================
+    # Helpers
+    # =====================================================================
+    # Tokens of one \n separated line (splitlines may still split it further, same as the full tokenizer)
+    @staticmethod
+    def _tokenize_physical_line(piece: str) -> List[Token]:
+        tokens: List[Token] = []
+        for raw in piece.splitlines():
+            _tokenize_line(raw, tokens)
+        return tokens
+
+    # Re-splits the tokens from segment first_seg up to segment next_seg and reparses them, returns the new blocks
+    def _rebuild_segments(self, first_seg: int, next_seg: int) -> List[BubbleBlock]:
+        line, tok = self._seg_lines[first_seg], self._seg_toks[first_seg]
+        if next_seg < len(self._seg_lines):
+            end_line, end_tok = self._seg_lines[next_seg], self._seg_toks[next_seg]
+        else:
+            end_line, end_tok = len(self._line_tokens), 0
+
+        seg_lines, seg_toks, seg_blocks = [], [], []
+        current: List[Token] = []
+        current_start = (line, tok)
+
+        while (line, tok) < (end_line, end_tok):
+            tokens = self._line_tokens[line]
+            if tok >= len(tokens):
+                line, tok = line + 1, 0
+                continue
+            token = tokens[tok]
+            if token[0] == TOKEN_STAGE and (line, tok) != current_start:
+                seg_lines.append(current_start[0])
+                seg_toks.append(current_start[1])
+                seg_blocks.append(_parse_tokens(current))
+                current = []
+                current_start = (line, tok)
+            current.append(token)
+            tok += 1
+
+        seg_lines.append(current_start[0])
+        seg_toks.append(current_start[1])
+        seg_blocks.append(_parse_tokens(current))
+
+        self._seg_lines[first_seg:next_seg] = seg_lines
+        self._seg_toks[first_seg:next_seg] = seg_toks
+        self._seg_blocks[first_seg:next_seg] = seg_blocks
+        return [block for blocks in seg_blocks for block in blocks]
@@ -0,0 +1,162 @@
+from bisect import bisect_right
+from functools import lru_cache
+from itertools import accumulate
+from typing import Dict, List, Optional, Tuple
+
+# Project Imports
+from renderer.models.bubble_block import BubbleBlock
+from renderer.parsing.spm_parser import Token, TOKEN_STAGE
+from renderer.utils import spm_codec
+
+#===================================================================================================================================
+# Source Index (where every parsed bubble lives in the editor text and in the saved file)
+#===================================================================================================================================
+# A snapshot of the incremental parser's lines and segments taken right after a parse, so it always matches the blocks the
+# viewer is showing even while the live preview is already parsing the next edit. The lookup tables are only built on the
+# first query, after that stage id lookups are O(1) and offset -> bubble lookups are a bisect.
+class SourceIndex:
+    def __init__(
+        self,
+        visible_text: str,
+        line_lengths: List[int],
+        line_tokens: List[List[Token]],
+        seg_lines: List[int],
+        seg_toks: List[int],
+        seg_blocks: List[List[BubbleBlock]],
+    ):
+        self._text = visible_text
+        self._line_lengths = line_lengths
+        self._line_tokens = line_tokens
+        self._seg_lines = seg_lines
+        self._seg_toks = seg_toks
+        self._seg_blocks = seg_blocks
+
+        self._line_starts: Optional[List[int]] = None
+        self._line_byte_starts: Optional[List[int]] = None
+        self._block_lines: List[int] = []
+        self._block_toks: List[int] = []
+        self._stages: Dict[str, List[int]] = {}
+        self._extra_starts: Dict[int, int] = {}
+
+    # =====================================================================
+    # Lazy tables
+    # =====================================================================
+    def _build(self):
+        if self._line_starts is not None:
+            return
+        self._line_starts = [0]
+        self._line_starts.extend(accumulate(self._line_lengths[:-1]))
+        for line, tok, blocks in zip(self._seg_lines, self._seg_toks, self._seg_blocks):
+            for extra, block in enumerate(blocks):
+                index = len(self._block_lines)
+                self._stages.setdefault(block.stage_npc.lower(), []).append(index)
+                if not extra:
+                    self._block_lines.append(line)
+                    self._block_toks.append(tok)
+                    continue
+
+                # A second bubble in one segment came from text glued to a header tag (<adv>stg1_1_000), no token of its own
+                previous = self.block_char_start(index - 1)
+                start = self._text.find(block.stage_npc, previous + 1)
+                if start < 0:
+                    start = previous
+                self._extra_starts[index] = start
+                self._block_lines.append(bisect_right(self._line_starts, start) - 1)
+                self._block_toks.append(-1)
+
+    def __len__(self) -> int:
+        self._build()
+        return len(self._block_lines)
+
+    # =====================================================================
+    # Stage id -> bubbles
+    # =====================================================================
+    def find_stage(self, stage_id: str) -> List[int]:
+        self._build()
+        return self._stages.get(stage_id.lower(), [])
+
+    # =====================================================================
+    # Bubble -> editor text / file bytes
+    # =====================================================================
+    def block_char_start(self, index: int) -> int:
+        self._build()
+        line, tok = self._block_lines[index], self._block_toks[index]
+        if tok < 0:
+            return self._extra_starts[index]
+        line_start = self._line_starts[line]
+        tokens = self._line_tokens[line]
+        if tok >= len(tokens) or tokens[tok][0] != TOKEN_STAGE:
+            return line_start
+
+        # Walk the line's tokens in order so the id isn't matched inside an earlier token.
+        # Tokens come from the line with its [LF] markup removed, so search there and map the column back.
+        raw_line = self._text[line_start:line_start + self._line_lengths[line]]
+        clean_line = raw_line.replace("[LF]", "")
+        column, search_from = 0, 0
+        for _, text in tokens[:tok + 1]:
+            column = clean_line.find(text, search_from)
+            if column < 0:
+                return line_start
+            search_from = column + len(text)
+        return line_start + _raw_column(raw_line, column)
+
+    def block_char_range(self, index: int) -> Tuple[int, int]:
+        start = self.block_char_start(index)
+        end = self.block_char_start(index + 1) if index + 1 < len(self) else len(self._text)
+        return start, max(start, end)
+
+    def block_byte_range(self, index: int) -> Tuple[int, int]:
+        start, end = self.block_char_range(index)
+        return self.char_to_byte(start), self.char_to_byte(end)
+
+    # =====================================================================
+    # Editor text -> bubble / file bytes
+    # =====================================================================
+    def block_at_char(self, offset: int) -> int:
+        self._build()
+        if not self._block_lines:
+            return -1
+        line = bisect_right(self._line_starts, offset) - 1
+        index = bisect_right(self._block_lines, line) - 1
+
+        # Several bubbles can start on the same line, step back until one starts at or before the offset
+        while index > 0 and self._block_lines[index] == line and self.block_char_start(index) > offset:
+            index -= 1
+
+        # Bubbles sharing a start (glued id that couldn't be located) resolve to the first one
+        while index > 0 and index in self._extra_starts and self.block_char_start(index - 1) == self._extra_starts[index]:
+            index -= 1
+        return index
+
+    def char_to_byte(self, offset: int) -> int:
+        self._build()
+        if self._line_byte_starts is None:
+            byte_lengths = [
+                _encoded_length(self._text[start:start + length])
+                for start, length in zip(self._line_starts, self._line_lengths)
+            ]
+            self._line_byte_starts = [0]
+            self._line_byte_starts.extend(accumulate(byte_lengths[:-1]))
+        offset = max(0, min(offset, len(self._text)))
+        line = bisect_right(self._line_starts, offset) - 1
+        line_start = self._line_starts[line]
+        return self._line_byte_starts[line] + _encoded_length(self._text[line_start:offset])
+
+# Column in a line with its [LF] markup removed -> column in the line itself
+def _raw_column(raw_line: str, clean_column: int) -> int:
+    column, search_from = clean_column, 0
+    while True:
+        found = raw_line.find("[LF]", search_from)
+        if found < 0 or found > column:
+            return column
+        column += 4
+        search_from = found + 4
+
+# Encoding is line local (markup never spans a \n) so every line's byte length can be cached on its own
+@lru_cache(maxsize=65536)
+def _encoded_length(piece: str) -> int:
+    try:
+        return len(spm_codec.encode(piece))
+    except UnicodeEncodeError:
+        # Same count the file would have once the stray character is replaced (saving it would fail anyway)
+        return len(spm_codec.encode(piece.encode("latin1", "replace").decode("latin1")))
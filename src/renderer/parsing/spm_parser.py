@@ -35,42 +35,50 @@ _STAGE_LINE_RE = re.compile(
 )
 
 # =====================================================================
-# Tokenize Function from raw
+# Lexer (one pass over the lines, every token comes out already typed)
 # =====================================================================
-def _tokenize_lines(visible_text: str) -> List[str]:
+# Token kinds
+TOKEN_STAGE = 0         # stage id (stg1_1_000, anna_stg3_02_15...)
+TOKEN_TAG = 1           # anything else starting with "<" (header tags like <system>, <se 1>, <wpos ...>)
+TOKEN_PAGE_BREAK = 2    # <k>
+TOKEN_TEXT = 3          # dialogue text
+
+Token = Tuple[int, str]
+
+def _classify(token: str) -> Token:
+    if token.startswith("<"):
+        return (TOKEN_PAGE_BREAK if token.startswith("<k>") else TOKEN_TAG, token)
+    if _STAGE_LINE_RE.fullmatch(token):
+        return (TOKEN_STAGE, token)
+    return (TOKEN_TEXT, token)
+
+def _tokenize_line(raw: str, tokens: List[Token]):
+    cleaned = _clean_line(raw)
+    if not cleaned:
+        return
+
+    # Repeatedly cut out stage tokens that occur only at start or after [NUL]
+    pos = 0
+    for match in _STAGE_TOKEN_RE.finditer(cleaned):
+        prefix = cleaned[pos:match.start()].strip()
+        if prefix:
+            tokens.append(_classify(prefix))
+        tokens.append((TOKEN_STAGE, match.group(1).strip()))
+        pos = match.end()
+
+    # Potential trailing text as final token
+    tail = cleaned[pos:].strip()
+    if tail:
+        tokens.append(_classify(tail))
+
+def _tokenize_lines(visible_text: str) -> List[Token]:
     raw_lines = visible_text.splitlines()
-    tokens: List[str] = []
+    tokens: List[Token] = []
 
     debug.debug("Starting tokenization. Total lines: %d", len(raw_lines))
-
-    for line_index, raw in enumerate(raw_lines, start=1):
-        cleaned = _clean_line(raw)
-        debug.debug("Line %d: '%s' -> Cleaned: '%s'", line_index, raw, cleaned)
-        if not cleaned:
-            debug.debug("Line %d is empty after cleaning. Skipping.", line_index)
-            continue
-
-        # Repeatedly cut out stage tokens that occur only at start or after [NUL]
-        pos = 0
-        for match in _STAGE_TOKEN_RE.finditer(cleaned):
-            prefix = cleaned[pos:match.start()].strip()
-            stage_id = match.group(1)
-
-            if prefix:
-                tokens.append(prefix)
-
-            debug.debug("Line %d stage token: '%s'", line_index, stage_id)
-            tokens.append(stage_id.strip())
-
-            pos = match.end()
-
-        # Potential trailing text as final token
-        tail = cleaned[pos:].strip()
-        if tail:
-            tokens.append(tail)
-
+    for raw in raw_lines:
+        _tokenize_line(raw, tokens)
     debug.debug("Tokenization complete. Total tokens: %d", len(tokens))
-    debug.debug("All tokens collected: %s", tokens)
     return tokens
 
 # =====================================================================
@@ -105,32 +113,41 @@ def _join_page_lines(lines: List[str]) -> str:
 # =====================================================================
 # Parsing function
 # =====================================================================
+# Header tags, matched against the lower cased token
+_SOUND_TAGS = (("<se 1>", "Typewriter"), ("<se 2>", "Pencil"))
+_BUBBLE_TAG_RE = re.compile(r"<(diary|system|fairy|kanban|fairy2|housou|majo|adv|clear|small)>")
+_SELECT_TAGS = ("select", "adv_select")
+
+# Position tags, matched against the original token
+_POSITION_RES = {
+    tag: re.compile(fr"<{tag}\s+(-?\d+)\s+(-?\d+)\s+(\d+)\s+(\d+)>", flags=re.IGNORECASE)
+    for tag in ("select", "adv_select", "wpos")
+}
+
+def _parse_position(line: str, tag: str) -> Optional[Tuple[int, int, int, int]]:
+    m = _POSITION_RES[tag].match(line)
+    return tuple(map(int, m.groups())) if m else None
+
 def parse_spm_text(visible_text: str) -> List[BubbleBlock]:
-    lines = _tokenize_lines(visible_text)
+    bubbles = _parse_tokens(_tokenize_lines(visible_text))
+    debug.info("Parsing complete. Total bubbles: %d", len(bubbles))
+    return bubbles
+
+# Builds bubbles from a token list (the list is consumed, a tag's trailing text is written back into the tag's slot)
+def _parse_tokens(tokens: List[Token]) -> List[BubbleBlock]:
     bubbles: List[BubbleBlock] = []
+    count = len(tokens)
     i = 0
 
-    debug.debug("Starting parse_spm_text. Total tokenized lines: %d", len(lines))
-
-    def is_stage_line(line: str) -> bool:
-        return bool(_STAGE_LINE_RE.fullmatch(line.strip()))
-    
-    _BUBBLE_TAGS = {"diary", "system", "fairy", "kanban", "fairy2", "housou", "majo", "adv", "clear", "small"}
-    
-    def _parse_position(line: str, tag: str) -> Optional[Tuple[int, int, int, int]]:
-        m = re.match(
-            fr"<{tag}\s+(-?\d+)\s+(-?\d+)\s+(\d+)\s+(\d+)>",
-            line,
-            flags=re.IGNORECASE,
-        )
-        return tuple(map(int, m.groups())) if m else None
-
-    while i < len(lines):
-        if not is_stage_line(lines[i]):
+    debug.debug("Starting parse_spm_text. Total tokens: %d", count)
+
+    while i < count:
+        kind, text = tokens[i]
+        if kind != TOKEN_STAGE:
             i += 1
             continue
 
-        stage_npc = lines[i].strip()
+        stage_npc = text.strip()
         i += 1
 
         bubble_type = "none"
@@ -138,49 +155,43 @@ def parse_spm_text(visible_text: str) -> List[BubbleBlock]:
         position = (0, 0, 0, 0)
 
         # Read multiple tag lines immediately after stage token
-        while i < len(lines) and lines[i].startswith("<") and not lines[i].lower().startswith("<p"):
-            inner_line = lines[i].lower().strip()
+        while i < count and tokens[i][0] != TOKEN_STAGE and tokens[i][0] != TOKEN_TEXT:
+            line = tokens[i][1]
+            inner_line = line.lower().strip()
+            if inner_line.startswith("<p"):
+                break
 
             # Handle sound tags
-            if inner_line.startswith("<se 1>"):
-                bubble_sound = "Typewriter"
-                i += 1
-                continue
-            elif inner_line.startswith("<se 2>"):
-                bubble_sound = "Pencil"
+            sound = next((name for tag, name in _SOUND_TAGS if inner_line.startswith(tag)), None)
+            if sound:
+                bubble_sound = sound
                 i += 1
                 continue
 
-            # Handle bubble types
-            matched_type = False
-            for tag in _BUBBLE_TAGS:
-                if inner_line.startswith(f"<{tag}>"):
-                    bubble_type = tag
-                    remainder = lines[i][len(f"<{tag}>") :].strip()
+            # Handle bubble types (text after the tag is reread in place as the next token)
+            match = _BUBBLE_TAG_RE.match(inner_line)
+            if match:
+                bubble_type = match.group(1)
+                remainder = line[match.end():].strip()
+                if remainder:
+                    tokens[i] = _classify(remainder)
+                else:
                     i += 1
-                    if remainder:
-                        lines.insert(i, remainder)
-                    matched_type = True
-                    break
-            if matched_type:
                 continue
 
             # Handle <select> and <adv_select>
-            for select_tag in ("select", "adv_select"):
-                if inner_line.startswith(f"<{select_tag}"):
-                    bubble_type = select_tag
-                    pos = _parse_position(lines[i], select_tag)
-                    if pos:
-                        position = pos
-                    i += 1
-                    matched_type = True
-                    break
-            if matched_type:
+            select_tag = next((tag for tag in _SELECT_TAGS if inner_line.startswith(f"<{tag}")), None)
+            if select_tag:
+                bubble_type = select_tag
+                pos = _parse_position(line, select_tag)
+                if pos:
+                    position = pos
+                i += 1
                 continue
 
             # Handle <wpos> anywhere in these lines
             if inner_line.startswith("<wpos"):
-                pos = _parse_position(lines[i], "wpos")
+                pos = _parse_position(line, "wpos")
                 if pos:
                     position = pos
                 i += 1
@@ -192,9 +203,9 @@ def parse_spm_text(visible_text: str) -> List[BubbleBlock]:
         # Collect pages, <k> splits pages, <p> ignored
         pages: List[str] = []
         page_buf: List[str] = []
-        while i < len(lines) and not is_stage_line(lines[i]):
-            line = lines[i]
-            if line.startswith("<k>"):
+        while i < count and tokens[i][0] != TOKEN_STAGE:
+            kind, line = tokens[i]
+            if kind == TOKEN_PAGE_BREAK:
                 if page_buf:
                     pages.append(_join_page_lines(page_buf))
                     page_buf = []
@@ -207,5 +218,4 @@ def parse_spm_text(visible_text: str) -> List[BubbleBlock]:
         # Store parsed bubble
         bubbles.append(BubbleBlock(stage_npc, bubble_type, position, pages, bubble_sound))
 
-    debug.info("Parsing complete. Total bubbles: %d", len(bubbles))
-    return bubbles
\ No newline at end of file
+    return bubbles
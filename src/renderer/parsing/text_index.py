@@ -0,0 +1,141 @@
+import re
+from bisect import bisect_left
+from typing import Dict, FrozenSet, Iterable, List, Optional, Set
+
+# Project Imports
+from managers.Debug_Manager import debug
+from renderer.models.bubble_block import BubbleBlock
+
+#===================================================================================================================================
+# Inverted index over the bubbles (search as you type over text, ids, bubble types and sounds)
+#===================================================================================================================================
+# Terms are case folded words of the tag-stripped page text, plus the stage id (and its _ separated tails so "1_000" still
+# finds stg1_1_000), the bubble type and the sound. Stage ids also keep their old substring match ("tg1", "_05"...) through
+# a scan over the distinct ids. Blocks are tracked by identity: the viewer keeps the same BubbleBlock object for every
+# bubble that didn't change, so an update only has to tokenize the blocks that are actually new.
+_TAG_RE = re.compile(r"<[^>]*>|\[(?:NUL|LF|CR)\]")
+_WORD_RE = re.compile(r"\w+")
+
+def _words(text: str) -> List[str]:
+    return _WORD_RE.findall(_TAG_RE.sub(" ", text).casefold())
+
+# Id, type and sound terms repeat a lot between bubbles, so they're worked out once per distinct value
+_ID_TERMS: Dict[str, FrozenSet[str]] = {}
+_META_TERMS: Dict[tuple, FrozenSet[str]] = {}
+
+def _id_terms(stage_npc: str) -> FrozenSet[str]:
+    terms = _ID_TERMS.get(stage_npc)
+    if terms is None:
+        parts = stage_npc.casefold().split("_")
+        terms = _ID_TERMS[stage_npc] = frozenset("_".join(parts[i:]) for i in range(len(parts))) - {""}
+    return terms
+
+def _meta_terms(bubble_type: str, bubble_sound: str, type_names: Optional[Dict[str, str]]) -> FrozenSet[str]:
+    key = (bubble_type, bubble_sound, id(type_names))
+    terms = _META_TERMS.get(key)
+    if terms is None:
+        words = _words(bubble_type) + _words(bubble_sound)
+        if type_names and bubble_type in type_names:
+            words += _words(type_names[bubble_type])
+        terms = _META_TERMS[key] = frozenset(words)
+    return terms
+
+def block_terms(block: BubbleBlock, type_names: Optional[Dict[str, str]] = None) -> Set[str]:
+    terms = set(_words(" ".join(block.pages)))
+    terms |= _id_terms(block.stage_npc)
+    terms |= _meta_terms(block.bubble_type, block.bubble_sound, type_names)
+    return terms
+
+
+class BubbleTextIndex:
+    def __init__(self, type_names: Optional[Dict[str, str]] = None):
+        self._type_names = type_names
+        self._postings: Dict[str, Set[BubbleBlock]] = {}
+        self._terms_of: Dict[BubbleBlock, Set[str]] = {}
+        self._sorted_terms: Optional[List[str]] = None
+
+        # Case folded stage id -> its blocks, for the substring match
+        self._ids: Dict[str, Set[BubbleBlock]] = {}
+
+    def __len__(self) -> int:
+        return len(self._terms_of)
+
+    # =====================================================================
+    # Keeping up with the viewer (only blocks that weren't indexed before get tokenized)
+    # =====================================================================
+    def update(self, blocks: Iterable[BubbleBlock]):
+        current = set(blocks)
+        indexed = self._terms_of.keys()
+        removed = indexed - current
+        added = current - indexed
+
+        for block in removed:
+            for term in self._terms_of.pop(block):
+                postings = self._postings[term]
+                postings.discard(block)
+                if not postings:
+                    del self._postings[term]
+                    self._sorted_terms = None
+            stage_id = block.stage_npc.casefold()
+            same_id = self._ids[stage_id]
+            same_id.discard(block)
+            if not same_id:
+                del self._ids[stage_id]
+
+        for block in added:
+            terms = block_terms(block, self._type_names)
+            self._terms_of[block] = terms
+            for term in terms:
+                postings = self._postings.get(term)
+                if postings is None:
+                    postings = self._postings[term] = set()
+                    self._sorted_terms = None
+                postings.add(block)
+            self._ids.setdefault(block.stage_npc.casefold(), set()).add(block)
+
+        if removed or added:
+            debug.debug("Text index updated: %d removed, %d added, %d terms", len(removed), len(added), len(self._postings))
+
+    def clear(self):
+        self._postings.clear()
+        self._terms_of.clear()
+        self._sorted_terms = None
+        self._ids.clear()
+
+    # =====================================================================
+    # Queries (every word of the query has to prefix some term of the bubble, or the whole query is part of its stage id)
+    # =====================================================================
+    def search(self, query: str) -> Set[BubbleBlock]:
+        result = self._word_search(_words(query))
+        needle = query.strip().casefold()
+        if needle:
+            for stage_id, blocks in self._ids.items():
+                if needle in stage_id:
+                    result |= blocks
+        return result
+
+    def _word_search(self, words: List[str]) -> Set[BubbleBlock]:
+        if not words:
+            return set()
+
+        # Rarest prefix first keeps the intersections small
+        candidates = sorted((self._prefix_postings(word) for word in words), key=len)
+        result = set(candidates[0])
+        for postings in candidates[1:]:
+            if not result:
+                break
+            result &= postings
+        return result
+
+    def _prefix_postings(self, prefix: str) -> Set[BubbleBlock]:
+        if self._sorted_terms is None:
+            self._sorted_terms = sorted(self._postings)
+        terms = self._sorted_terms
+        start = bisect_left(terms, prefix)
+        end = bisect_left(terms, prefix + "\U0010ffff", start)
+        if end - start == 1:
+            return self._postings[terms[start]]
+        matched: Set[BubbleBlock] = set()
+        for term in terms[start:end]:
+            matched |= self._postings[term]
+        return matched
@@ -0,0 +1,41 @@
+from typing import Set
+from PyQt5.QtCore import QObject, QTimer
+
+# Project Imports
+from managers.Debug_Manager import debug
+
+#===================================================================================================================================
+# Animation Clock (one timer for every animated bubble, owned by the BubbleViewer)
+#===================================================================================================================================
+# Anything animated (the active bubble's cursor, later <shake>/<wave>/<dynamic> text) registers itself here while it is on
+# screen and gets advance_animation(frame) on every tick. The timer only runs while something is registered.
+class AnimationClock(QObject):
+    INTERVAL_MS = 150
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.frame = 0
+        self._targets: Set[object] = set()
+        self._timer = QTimer(self)
+        self._timer.setInterval(self.INTERVAL_MS)
+        self._timer.timeout.connect(self._tick)
+
+    def add(self, target):
+        self._targets.add(target)
+        if not self._timer.isActive():
+            debug.debug("Animation clock started")
+            self._timer.start()
+
+    def discard(self, target):
+        self._targets.discard(target)
+        if not self._targets and self._timer.isActive():
+            debug.debug("Animation clock stopped, nothing left to animate")
+            self._timer.stop()
+
+    def is_running(self) -> bool:
+        return self._timer.isActive()
+
+    def _tick(self):
+        self.frame += 1
+        for target in list(self._targets):
+            target.advance_animation(self.frame)
@@ -1,73 +1,311 @@
-from typing import List
-from PyQt5.QtWidgets import QWidget, QVBoxLayout, QScrollArea
+import weakref
+from bisect import bisect_right
+from typing import Dict, List, Optional, Tuple
+from PyQt5.QtWidgets import QScrollArea
+from PyQt5.QtCore import pyqtSignal
 from managers.Debug_Manager import debug
-from renderer.ui.bubble_widget import BubbleWidget, BubbleBlock
+from renderer.ui.bubble_widget import BubbleWidget, BubbleBlock, OUTER_MARGINS, OUTER_SPACING, bubble_background_size
+from renderer.ui.param_box import ParamBox
+from renderer.ui.animation_clock import AnimationClock
 from managers.Sound_Manager import play_sound_by_name, should_play_sounds
 
 #===================================================================================================================================
-# Bubble Viewer
+# Bubble Viewer (virtualized: only the bubbles in or near the viewport get a widget)
 #===================================================================================================================================
+# Every bubble's height is known from its block alone (param row + background size), so the viewer lays out the whole
+# list as plain y offsets and binds a small pool of recycled BubbleWidgets to whatever is on screen while scrolling.
+# The scroll bar range is driven by hand (no giant content widget) since Qt caps widget heights at 16777215px.
 class BubbleViewer(QScrollArea):
+    source_requested = pyqtSignal(int)     # Ctrl+click on a bubble, asks to show its raw text
+    blocks_changed = pyqtSignal()          # the block list was replaced or reconciled
+
+    _MARGINS = (12, 12, 24, 24)     # left, top, right, bottom around the bubble list
+    _SPACING = 18                   # gap between bubbles
+    _OVERSCAN = 400                 # extra pixels above/below the viewport that still get widgets
+
     def __init__(self, blocks: List[BubbleBlock], font_family: str, parent=None):
         super().__init__(parent)
         debug.debug("Initializing BubbleViewer with %d blocks", len(blocks))
-        self.setWidgetResizable(True)
-        self.active_bubble = None
+        self.font_family = font_family
+        self.active_index = -1
+
+        # Single timer driving the cursor (and any other animation) of the bubbles on screen
+        self.animation_clock = AnimationClock(self)
+
+        self.blocks: List[BubbleBlock] = []
+        self._offsets: List[int] = []
+        self._heights: List[int] = []
 
-        container = QWidget()
-        lay = QVBoxLayout(container)
-        lay.setContentsMargins(12, 12, 24, 24)
-        lay.setSpacing(18)
+        # Widgets bound to a block index, and spare widgets waiting to be reused
+        self._bound: Dict[int, BubbleWidget] = {}
+        self._pool: List[BubbleWidget] = []
 
-        self.bubble_widgets: List[BubbleWidget] = []
-        for index, b in enumerate(blocks):
-            widget = BubbleWidget(b, font_family, self)
-            lay.addWidget(widget)
-            self.bubble_widgets.append(widget)
-            debug.info("Added BubbleWidget %d: '%s'", index, b.stage_npc)
+        # Page each block was left on, survives its widget being recycled
+        self._page_state = weakref.WeakKeyDictionary()
 
-        lay.addStretch(1)
-        self.setWidget(container)
+        # Everything but the background is the same height for every bubble
+        top, bottom = OUTER_MARGINS[1], OUTER_MARGINS[3]
+        self._chrome_height = top + ParamBox.height_for_font(font_family) + OUTER_SPACING + bottom
 
-        if self.bubble_widgets:
+        self._content_height = 0
+        self.verticalScrollBar().setSingleStep(40)
+        self.verticalScrollBar().valueChanged.connect(self._update_visible)
+
+        self.set_blocks(blocks)
+
+    # =====================================================================
+    # Replacing the blocks shown
+    # =====================================================================
+    def set_blocks(self, blocks: List[BubbleBlock]):
+        debug.debug("BubbleViewer showing %d blocks", len(blocks))
+        for index in list(self._bound):
+            self._release(index)
+        self.blocks = list(blocks)
+        self.active_index = -1
+        self._relayout()
+
+        if self.blocks:
             debug.info("Setting first bubble as active")
-            self.set_active_bubble(self.bubble_widgets[0], play_sound=False)
+            self.set_active_index(0, play_sound=False)
+        self.blocks_changed.emit()
+
+    def clear_bubbles(self):
+        self.set_blocks([])
+        self._trim_pool(0)
+
+    # =====================================================================
+    # Reconcile with a fresh parse (keeps unchanged bubbles, the scroll position and the active bubble)
+    # =====================================================================
+    def update_blocks(self, blocks: List[BubbleBlock]):
+        old_blocks = self.blocks
+        if not old_blocks:
+            self.set_blocks(blocks)
+            return
+        blocks = list(blocks)
+        new_to_old = self._match_blocks(old_blocks, blocks)
+
+        # Matched blocks keep the old object so their widgets (and saved page) stay bound without re-rendering
+        for new_index, old_index in new_to_old.items():
+            blocks[new_index] = old_blocks[old_index]
+        old_to_new = {old_index: new_index for new_index, old_index in new_to_old.items()}
+
+        # Scroll anchor: the first bubble on screen that survived, and how far into it the view was
+        scroll = self.verticalScrollBar().value()
+        anchor = None
+        for old_index in range(max(0, bisect_right(self._offsets, scroll) - 1), len(old_blocks)):
+            if old_index in old_to_new:
+                anchor = (old_to_new[old_index], scroll - self._offsets[old_index])
+                break
+
+        # Active bubble follows its block, else the closest bubble with the same stage id to where it would have moved
+        old_active = self.active_index
+        new_active = old_to_new.get(old_active, -1)
+        if new_active < 0 and 0 <= old_active < len(old_blocks):
+            expected = old_active
+            for old_index in range(old_active - 1, -1, -1):
+                if old_index in old_to_new:
+                    expected = old_to_new[old_index] + (old_active - old_index)
+                    break
+            stage_npc = old_blocks[old_active].stage_npc
+            same_id = [i for i, block in enumerate(blocks) if block.stage_npc == stage_npc]
+            if same_id:
+                new_active = min(same_id, key=lambda i: abs(i - expected))
+        if new_active < 0 and blocks:
+            new_active = min(max(old_active, 0), len(blocks) - 1)
+
+        # Widgets whose block is gone go back to the pool first, so they can't collide with a survivor's new index
+        bound = self._bound
+        for old_index in [old_index for old_index in bound if old_index not in old_to_new]:
+            self._recycle(bound.pop(old_index))
+
+        # Widgets move with their block
+        self._bound = {}
+        for old_index, widget in bound.items():
+            new_index = old_to_new[old_index]
+            self._bound[new_index] = widget
+            widget.index = new_index
+
+        self.blocks = blocks
+        self.active_index = new_active
+        for index, widget in self._bound.items():
+            widget.set_cursor_visible(index == new_active)
+
+        self._relayout(update_visible=False)
+        if anchor is not None:
+            self.verticalScrollBar().setValue(self._offsets[anchor[0]] + anchor[1])
+        self._update_visible()
+        self._trim_pool(len(self._bound))
+
+        debug.debug(
+            "BubbleViewer reconciled %d blocks into %d (%d reused, %d widgets live)",
+            len(old_blocks), len(blocks), len(new_to_old), len(self._bound),
+        )
+        self.blocks_changed.emit()
+
+    # New index -> old index for blocks that didn't change (same object, or same stage id and content)
+    @staticmethod
+    def _match_blocks(old_blocks: List[BubbleBlock], new_blocks: List[BubbleBlock]) -> Dict[int, int]:
+        matches: Dict[int, int] = {}
+
+        # Untouched runs at either end are the same objects when the parser reparsed incrementally
+        prefix = 0
+        limit = min(len(old_blocks), len(new_blocks))
+        while prefix < limit and (old_blocks[prefix] is new_blocks[prefix]
+                                  or old_blocks[prefix].content_key() == new_blocks[prefix].content_key()):
+            matches[prefix] = prefix
+            prefix += 1
+        suffix = 0
+        while suffix < limit - prefix and (old_blocks[-1 - suffix] is new_blocks[-1 - suffix]
+                                           or old_blocks[-1 - suffix].content_key() == new_blocks[-1 - suffix].content_key()):
+            matches[len(new_blocks) - 1 - suffix] = len(old_blocks) - 1 - suffix
+            suffix += 1
+
+        # Whatever is left in the middle is matched by key, in order
+        candidates: Dict[Tuple[str, int], List[int]] = {}
+        for old_index in range(len(old_blocks) - suffix - 1, prefix - 1, -1):
+            candidates.setdefault(old_blocks[old_index].content_key(), []).append(old_index)
+        for new_index in range(prefix, len(new_blocks) - suffix):
+            stack = candidates.get(new_blocks[new_index].content_key())
+            if stack:
+                matches[new_index] = stack.pop()
+        return matches
 
     # =====================================================================
     # Set the active bubble
     # =====================================================================
-    def set_active_bubble(self, bubble: BubbleWidget, play_sound: bool = True):
-        if self.active_bubble is bubble:
-            debug.info("Bubble '%s' is already active, skipping", bubble.block.stage_npc)
+    def set_active_index(self, index: int, play_sound: bool = True):
+        if index == self.active_index:
+            debug.info("Bubble '%s' is already active, skipping", self.blocks[index].stage_npc)
             return
-        if self.active_bubble:
-            debug.debug("Deactivating previous bubble: '%s'", self.active_bubble.block.stage_npc)
-            self.active_bubble.set_cursor_visible(False)
-        self.active_bubble = bubble
-        self.active_bubble.set_cursor_visible(True)
-        debug.info("Active bubble set to: '%s'", bubble.block.stage_npc)
+        previous = self._bound.get(self.active_index)
+        if previous:
+            debug.debug("Deactivating previous bubble: '%s'", previous.block.stage_npc)
+            previous.set_cursor_visible(False)
+        self.active_index = index
+        current = self._bound.get(index)
+        if current:
+            current.set_cursor_visible(True)
+        debug.info("Active bubble set to: '%s'", self.blocks[index].stage_npc)
         if play_sound and should_play_sounds():
             play_sound_by_name("menu_cursor_move")
 
+    def set_active_bubble(self, bubble: BubbleWidget, play_sound: bool = True):
+        self.set_active_index(bubble.index, play_sound)
+
     # =====================================================================
     # Helpers for SearchableBubbleViewer
     # =====================================================================
-    def get_all_bubbles(self) -> List[BubbleWidget]:
-        return self.bubble_widgets
+    def get_all_blocks(self) -> List[BubbleBlock]:
+        return self.blocks
+
+    def widget_for_index(self, index: int) -> Optional[BubbleWidget]:
+        return self._bound.get(index)
+
+    def scroll_to_index(self, index: int):
+        scroll_bar = self.verticalScrollBar()
+        scroll_bar.setValue(self._offsets[index] - scroll_bar.pageStep() // 2)
+
+    def ensure_index_visible(self, index: int):
+        scroll = self.verticalScrollBar().value()
+        top, bottom = self._offsets[index], self._offsets[index] + self._heights[index]
+        if top < scroll or bottom > scroll + self.viewport().height():
+            self.scroll_to_index(index)
 
     def scroll_to_bubble(self, bubble: BubbleWidget):
-        widget_y = bubble.y()
+        self.scroll_to_index(bubble.index)
+
+    # =====================================================================
+    # Layout (offsets only, no widgets)
+    # =====================================================================
+    def _bubble_height(self, block: BubbleBlock) -> int:
+        return self._chrome_height + bubble_background_size(block)[1]
+
+    def _relayout(self, update_visible: bool = True):
+        left, top, right, bottom = self._MARGINS
+        self._heights = [self._bubble_height(block) for block in self.blocks]
+        self._offsets = []
+        y = top
+        for height in self._heights:
+            self._offsets.append(y)
+            y += height + self._SPACING
+        self._content_height = (y - self._SPACING if self.blocks else top) + bottom
+        self._update_scroll_range()
+        if update_visible:
+            self._update_visible()
+
+    def _update_scroll_range(self):
         scroll_bar = self.verticalScrollBar()
-        scroll_bar.setValue(widget_y - scroll_bar.pageStep() // 2)
+        page = self.viewport().height()
+        scroll_bar.setPageStep(page)
+        scroll_bar.setRange(0, max(0, self._content_height - page))
 
-    def clear_bubbles(self):
-        layout = self.widget().layout()
-        for i in reversed(range(layout.count())):
-            item = layout.itemAt(i)
-            w = item.widget() if item.widget() else None
-            if w:
-                w.setParent(None)
-            else:
-                layout.removeItem(item)
-        self.bubble_widgets.clear()
-        self.active_bubble = None
\ No newline at end of file
+    # =====================================================================
+    # Binding widgets to the visible range
+    # =====================================================================
+    def _visible_range(self) -> range:
+        if not self.blocks:
+            return range(0)
+        view_top = self.verticalScrollBar().value() - self._OVERSCAN
+        view_bottom = self.verticalScrollBar().value() + self.viewport().height() + self._OVERSCAN
+        first = max(0, bisect_right(self._offsets, view_top) - 1)
+        last = bisect_right(self._offsets, view_bottom)
+        return range(first, min(last, len(self.blocks)))
+
+    def _update_visible(self, *_):
+        visible = self._visible_range()
+        for index in [index for index in self._bound if index not in visible]:
+            self._release(index)
+
+        left, _, right, _ = self._MARGINS
+        width = max(0, self.viewport().width() - left - right)
+        scroll = self.verticalScrollBar().value()
+        for index in visible:
+            widget = self._bound.get(index)
+            if widget is None:
+                widget = self._acquire(index)
+            widget.setGeometry(left, self._offsets[index] - scroll, width, self._heights[index])
+
+    def _acquire(self, index: int) -> BubbleWidget:
+        block = self.blocks[index]
+        page = self._page_state.get(block, 0)
+        if self._pool:
+            widget = self._pool.pop()
+            widget.set_block(block, index, page)
+        else:
+            widget = BubbleWidget(block, self.font_family, self, self.viewport())
+            widget.set_block(block, index, page)
+            debug.debug("Created pooled BubbleWidget (%d live)", len(self._bound) + 1)
+        widget.set_cursor_visible(index == self.active_index)
+        widget.show()
+        self._bound[index] = widget
+        return widget
+
+    def _release(self, index: int):
+        self._recycle(self._bound.pop(index))
+
+    # Saves the widget's page for its block and parks it in the pool
+    def _recycle(self, widget: BubbleWidget):
+        if widget.current_page:
+            self._page_state[widget.block] = widget.current_page
+        else:
+            self._page_state.pop(widget.block, None)
+        widget.set_cursor_visible(False)
+        widget.hide()
+        self._pool.append(widget)
+
+    # Spare widgets beyond what the viewport needs are destroyed now rather than whenever Python collects them
+    def _trim_pool(self, keep: int):
+        while len(self._pool) > keep:
+            widget = self._pool.pop()
+            self.animation_clock.discard(widget)
+            widget.setParent(None)
+            widget.deleteLater()
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        self._update_scroll_range()
+        self._update_visible()
+
+    # QScrollArea would scroll the viewport's children itself, the bubbles are placed by _update_visible instead
+    def scrollContentsBy(self, dx: int, dy: int):
+        self.viewport().update()
@@ -1,30 +1,85 @@
+from typing import Dict, Tuple
 from PyQt5.QtWidgets import QWidget, QLabel, QVBoxLayout, QHBoxLayout, QTextBrowser
-from PyQt5.QtGui import QPixmap, QFont
-from PyQt5.QtCore import Qt, QTimer
+from PyQt5.QtGui import QFont, QImageReader, QTextDocument
+from PyQt5.QtCore import Qt
 
 # Project Imports
 from renderer.models.bubble_block import BubbleBlock
 from renderer.utils.text_renderer import render_text_with_tags
 from renderer.utils.bubble_assets import bubble_image_path
 from renderer.ui.param_box import ParamBox
-from managers.Resource_Manager import get_resource
+from renderer.utils.asset_cache import cursor_frames, pixmap_from_path, pixmap_for_url
 from managers.Sound_Manager import play_sound_by_name, should_play_sounds
 
+# =====================================================================
+# Bubble display tables
+# =====================================================================
+TYPE_DISPLAY_MAP = {
+    "none": "Normal",
+    "housou": "Robo",
+    "fairy": "Tippi",
+    "fairy2": "Pixl",
+    "diary": "Diary",
+    "system": "System",
+    "select": "Select",
+    "kanban": "Signpost",
+    "majo": "Mimi",
+    "adv": "Swoon.exe",
+    "adv_select": "Swoon.exe Select",
+    "clear": "Intermission",
+    "small": "Small",
+}
+
+SELECT_TYPES = ("select", "adv_select")
+LIGHT_TEXT_TYPES = ("system", "majo", "adv", "adv_select", "clear")
+
+# Outer layout margins/spacing, the bubble viewer uses these to size bubbles without building them
+OUTER_MARGINS = (6, 6, 6, 18)
+OUTER_SPACING = 6
+
+# Image sizes read from the file header only (no decode), one read per bubble type
+_IMAGE_SIZES: Dict[str, Tuple[int, int]] = {}
+
+def _image_size(bubble_type: str) -> Tuple[int, int]:
+    if bubble_type not in _IMAGE_SIZES:
+        size = QImageReader(bubble_image_path(bubble_type)).size()
+        _IMAGE_SIZES[bubble_type] = (max(0, size.width()), max(0, size.height()))
+    return _IMAGE_SIZES[bubble_type]
+
+# Size of the bubble background for a block (select boxes keep the image size, others honour a <wpos>/<select> size)
+def bubble_background_size(block: BubbleBlock) -> Tuple[int, int]:
+    _, _, w, h = block.position
+    if block.bubble_type not in SELECT_TYPES and w > 0 and h > 0:
+        return w, h
+    return _image_size(block.bubble_type)
+
+# =====================================================================
+# Text browser that serves icon <img> tags from the shared asset cache instead of decoding them on every setHtml
+# =====================================================================
+class _BubbleTextBrowser(QTextBrowser):
+    def loadResource(self, resource_type, url):
+        if resource_type == QTextDocument.ImageResource:
+            pixmap = pixmap_for_url(url)
+            if pixmap is not None:
+                return pixmap
+        return super().loadResource(resource_type, url)
+
 #===================================================================================================================================
 # Bubble Widget
 #===================================================================================================================================
 class BubbleWidget(QWidget):
     def __init__(self, block: BubbleBlock, font_family: str, viewer, parent=None):
         super().__init__(parent)
-        self.block = block
+        self.block = None
+        self.index = -1
         self.viewer = viewer
         self.current_page = 0
         self.cursor_visible = False
         self.cursor_frame_index = 0
 
         outer = QVBoxLayout(self)
-        outer.setContentsMargins(6, 6, 6, 18)
-        outer.setSpacing(6)
+        outer.setContentsMargins(*OUTER_MARGINS)
+        outer.setSpacing(OUTER_SPACING)
 
         # =====================================================================
         # Meta row (aka the Paramboxes data)
@@ -32,81 +87,31 @@ class BubbleWidget(QWidget):
         meta_row = QHBoxLayout()
         meta_row.setSpacing(8)
         meta_row.addStretch(1)
-        meta_row.addWidget(ParamBox(block.stage_npc, font_family))
-
-        type_display_map = {
-            "none": "Normal",
-            "housou": "Robo",
-            "fairy": "Tippi",
-            "fairy2": "Pixl",
-            "diary": "Diary",
-            "system": "System",
-            "select": "Select",
-            "kanban": "Signpost",
-            "majo": "Mimi",
-            "adv": "Swoon.exe",
-            "adv_select": "Swoon.exe Select",
-            "clear": "Intermission",
-            "small": "Small",
-        }
-        bubble_type_text = type_display_map.get(block.bubble_type, block.bubble_type)
-        meta_row.addWidget(ParamBox(bubble_type_text, font_family))
-
-        x, y, w, h = block.position
-        pos_text = f"{x} {y} {w} {h}" if any((x, y, w, h)) else "auto"
-        meta_row.addWidget(ParamBox(pos_text, font_family))
-
-        bubble_sound_text = block.bubble_sound.capitalize()
-        meta_row.addWidget(ParamBox(bubble_sound_text, font_family))
+        self.id_box = ParamBox("", font_family)
+        self.type_box = ParamBox("", font_family)
+        self.pos_box = ParamBox("", font_family)
+        self.sound_box = ParamBox("", font_family)
+        for box in (self.id_box, self.type_box, self.pos_box, self.sound_box):
+            meta_row.addWidget(box)
         meta_row.addStretch(1)
         outer.addLayout(meta_row)
 
         # =====================================================================
         # Bubble background
         # =====================================================================
-        bubble_img = bubble_image_path(block.bubble_type)
-        pixmap = QPixmap(bubble_img)
         self.bg_label = QLabel(self)
-        self.bg_label.setPixmap(pixmap)
-
-        if block.bubble_type in ("select", "adv_select"):
-            self.bg_label.setFixedSize(pixmap.size())
-            self.bg_label.setScaledContents(False)
-        else:
-            self.bg_label.setScaledContents(True)
-            if w > 0 and h > 0:
-                self.bg_label.setFixedSize(w, h)
-            else:
-                self.bg_label.setFixedSize(pixmap.size())
-
         outer.addWidget(self.bg_label, alignment=Qt.AlignHCenter)
 
         # =====================================================================
         # Text Label inside bubble -> use QTextBrowser to support icons
         # =====================================================================
-        self.text_label = QTextBrowser(self.bg_label)
+        self.text_label = _BubbleTextBrowser(self.bg_label)
         self.text_label.setOpenExternalLinks(False)
         self.text_label.setFrameStyle(0)
         self.text_label.setVerticalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
         self.text_label.setHorizontalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
         self.text_label.setFont(QFont(font_family, 12))
 
-        if block.bubble_type in ("system", "majo", "adv", "adv_select", "clear"):
-            self.text_label.setStyleSheet("QTextBrowser { color: white; background: transparent; }")
-        else:
-            self.text_label.setStyleSheet("QTextBrowser { color: black; background: transparent; }")
-
-        # Margins for text
-        self.margin_x = max(40, int(self.bg_label.width() * 0.02))
-        self.margin_y_top = max(25, int(self.bg_label.height() * 0.18))
-        self.margin_y_bottom = max(20, int(self.bg_label.height() * 0.04))
-        self.text_label.setGeometry(
-            self.margin_x,
-            self.margin_y_top,
-            self.bg_label.width() - (2 * self.margin_x),
-            self.bg_label.height() - (self.margin_y_top + self.margin_y_bottom),
-        )
-
         # =====================================================================
         # Page Counter
         # =====================================================================
@@ -119,23 +124,51 @@ class BubbleWidget(QWidget):
         # Cursor Animation
         # =====================================================================
         self.cursor_label = QLabel(self.bg_label)
-        self.cursor_frames = [
-            QPixmap(get_resource("Packaged_Resources/Images/Icons/Crusor_1.png")),
-            QPixmap(get_resource("Packaged_Resources/Images/Icons/Crusor_2.png")),
-            QPixmap(get_resource("Packaged_Resources/Images/Icons/Crusor_3.png")),
-            QPixmap(get_resource("Packaged_Resources/Images/Icons/Crusor_4.png")),
-            QPixmap(get_resource("Packaged_Resources/Images/Icons/Crusor_5.png")),
-        ]
+        self.cursor_frames = cursor_frames()
         self.cursor_label.setPixmap(self.cursor_frames[0])
         self.cursor_label.setScaledContents(True)
-        self.cursor_label.setGeometry(self.bg_label.width() - 36 - 2, 6, 32, 32)
         self.cursor_label.hide()
 
-        self.cursor_timer = QTimer(self)
-        self.cursor_timer.timeout.connect(self._animate_cursor)
-        self.cursor_timer.start(150)
-
         self.setFocusPolicy(Qt.StrongFocus)
+        self.set_block(block)
+
+    # =====================================================================
+    # Binding a block (the viewer recycles widgets, so everything block specific lives here)
+    # =====================================================================
+    def set_block(self, block: BubbleBlock, index: int = -1, page: int = 0):
+        self.index = index
+        if block is self.block:
+            if page != self.current_page:
+                self.current_page = page
+                self._render_page()
+            return
+        self.block = block
+        self.current_page = page
+
+        self.id_box.set_text(block.stage_npc)
+        self.type_box.set_text(TYPE_DISPLAY_MAP.get(block.bubble_type, block.bubble_type))
+        x, y, w, h = block.position
+        self.pos_box.set_text(f"{x} {y} {w} {h}" if any((x, y, w, h)) else "auto")
+        self.sound_box.set_text(block.bubble_sound.capitalize())
+
+        # Bubble background
+        pixmap = pixmap_from_path(bubble_image_path(block.bubble_type))
+        self.bg_label.setPixmap(pixmap)
+        self.bg_label.setScaledContents(block.bubble_type not in SELECT_TYPES)
+        self.bg_label.setFixedSize(*bubble_background_size(block))
+
+        if block.bubble_type in LIGHT_TEXT_TYPES:
+            self.text_label.setStyleSheet("QTextBrowser { color: white; background: transparent; }")
+        else:
+            self.text_label.setStyleSheet("QTextBrowser { color: black; background: transparent; }")
+
+        # Margins for text
+        self.margin_x = max(40, int(self.bg_label.width() * 0.02))
+        self.margin_y_top = max(25, int(self.bg_label.height() * 0.18))
+        self.margin_y_bottom = max(20, int(self.bg_label.height() * 0.04))
+        self._position_text_label()
+        self.cursor_label.setGeometry(self.bg_label.width() - 36 - 2, 6, 32, 32)
+
         self._render_page()
 
     # =====================================================================
@@ -155,7 +188,7 @@ class BubbleWidget(QWidget):
     # =====================================================================
     def _render_page(self):
         raw_text = self.block.pages[self.current_page] if self.block.pages else ""
-        if self.block.bubble_type in ("select", "adv_select"):
+        if self.block.bubble_type in SELECT_TYPES:
             options = raw_text.split("\n")
             html_lines = [f"• {opt.strip()}" for opt in options if opt.strip()]
             processed = "<br>".join(html_lines)
@@ -179,6 +212,9 @@ class BubbleWidget(QWidget):
     def mousePressEvent(self, event):
         if self.viewer:
             self.viewer.set_active_bubble(self)
+            if event.button() == Qt.LeftButton and event.modifiers() & Qt.ControlModifier:
+                self.viewer.source_requested.emit(self.index)
+                return
         if event.button() == Qt.LeftButton and self.current_page < len(self.block.pages) - 1:
             self.current_page += 1
             self._render_page()
@@ -191,12 +227,7 @@ class BubbleWidget(QWidget):
                 play_sound_by_name("menu_message_skip")
 
     def resizeEvent(self, event):
-        self.text_label.setGeometry(
-            self.margin_x,
-            self.margin_y_top,
-            self.bg_label.width() - (2 * self.margin_x),
-            self.bg_label.height() - (self.margin_y_top + self.margin_y_bottom),
-        )
+        self._position_text_label()
         self._position_page_counter()
         super().resizeEvent(event)
 
@@ -204,6 +235,14 @@ class BubbleWidget(QWidget):
         self._position_page_counter()
         super().showEvent(event)
 
+    def _position_text_label(self):
+        self.text_label.setGeometry(
+            self.margin_x,
+            self.margin_y_top,
+            self.bg_label.width() - (2 * self.margin_x),
+            self.bg_label.height() - (self.margin_y_top + self.margin_y_bottom),
+        )
+
     def _position_page_counter(self):
         if not self.page_counter.isVisible():
             return
@@ -214,11 +253,21 @@ class BubbleWidget(QWidget):
         y = self.bg_label.height() - self.margin_y_bottom - h - 2
         self.page_counter.setGeometry(x, y, w, h)
 
-    def _animate_cursor(self):
+    # =====================================================================
+    # Animation (ticked by the viewer's AnimationClock while the cursor is shown)
+    # =====================================================================
+    def advance_animation(self, frame: int):
         if self.cursor_visible:
-            self.cursor_frame_index = (self.cursor_frame_index + 1) % len(self.cursor_frames)
+            self.cursor_frame_index = frame % len(self.cursor_frames)
             self.cursor_label.setPixmap(self.cursor_frames[self.cursor_frame_index])
 
     def set_cursor_visible(self, visible: bool):
+        if visible == self.cursor_visible:
+            return
         self.cursor_visible = visible
         self.cursor_label.setVisible(visible)
+        if self.viewer:
+            if visible:
+                self.viewer.animation_clock.add(self)
+            else:
+                self.viewer.animation_clock.discard(self)
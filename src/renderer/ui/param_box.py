@@ -1,9 +1,9 @@
 from PyQt5.QtWidgets import QWidget, QLabel
-from PyQt5.QtGui import QPixmap, QFont, QFontMetrics
+from PyQt5.QtGui import QFont, QFontMetrics
 from PyQt5.QtCore import Qt
 
 # Project Imports
-from managers.Resource_Manager import get_resource
+from renderer.utils.asset_cache import get_pixmap
 from managers.Debug_Manager import debug
 
 #===================================================================================================================================
@@ -25,24 +25,35 @@ class ParamBox(QWidget):
         self.text_label.setStyleSheet("QLabel { color: white; background: transparent; }")
         self.text_label.setAlignment(Qt.AlignCenter)
         #debug.debug("Font set for text label: family='%s', size=%d", font_family, font.pointSize())
-
-        # Measure font and add padding (width and height)
-        fm = QFontMetrics(font)
-        text_width = fm.horizontalAdvance(text) + 20
-        text_height = fm.height() + 8
-        #debug.debug("Calculated ParamBox size: width=%d, height=%d", text_width, text_height)
+        self._font_metrics = QFontMetrics(font)
 
         # Setting Background Label Image
-        pixmap = QPixmap(get_resource("Packaged_Resources/Images/Bubbles/ParamBox.png"))
+        pixmap = get_pixmap("Packaged_Resources/Images/Bubbles/ParamBox.png")
         self.bg_label.setPixmap(pixmap)
         self.bg_label.setScaledContents(True)
 
+        self.set_text(text)
+
+    # Swaps the text and refits the box (used when a recycled bubble gets a new block)
+    def set_text(self, text: str):
+        self.text_label.setText(text)
+
+        # Measure font and add padding (width and height)
+        text_width = self._font_metrics.horizontalAdvance(text) + 20
+        text_height = self._font_metrics.height() + 8
+        #debug.debug("Calculated ParamBox size: width=%d, height=%d", text_width, text_height)
+
         # Fixes widget size to fit calculated size + padding, layers both labels in widget
         self.setFixedSize(text_width, text_height)
         self.bg_label.setGeometry(0, 0, self.width(), self.height())
         self.text_label.setGeometry(0, 0, self.width(), self.height())
         #debug.debug("ParamBox geometry set: width=%d, height=%d", self.width(), self.height())
 
+    # Height every ParamBox gets for a font (lets the bubble viewer size bubbles without building them)
+    @staticmethod
+    def height_for_font(font_family: str) -> int:
+        return QFontMetrics(QFont(font_family, 10)).height() + 8
+
     # Manual resizer
     def resizeEvent(self, event):
         self.bg_label.setGeometry(0, 0, self.width(), self.height())
@@ -0,0 +1,126 @@
+import re
+from PyQt5.QtGui import QSyntaxHighlighter, QTextCharFormat, QColor, QFont
+
+# Project Imports
+from renderer.parsing.spm_parser import INLINE_TAGS, _STAGE_TOKEN_RE
+from renderer.ui.bubble_widget import TYPE_DISPLAY_MAP
+
+#===================================================================================================================================
+# SPM syntax highlighting for the raw text view
+#===================================================================================================================================
+# QSyntaxHighlighter only calls highlightBlock for the lines an edit touched, and keeps going down only while a line's end
+# state changes. The state is the number of open paired tags (<col>, <shake>...) in the current message, 3 bits per tag,
+# reset at every stage id, so a change never runs past the next message. Inline flags (red wavy underline):
+#   - closing tag without a matching opening tag, or a tag missing its ">"
+#   - the [NUL] in front of the next stage id when the message before it left paired tags open
+# Tags this editor doesn't know get an orange wavy underline, they may still be valid in the game.
+_MARKUP_RE = re.compile(r"<(/?)([^<>\s]*)([^<>]*)(>)?|\[(?:NUL|LF|CR)\]")
+
+_PAIRED_TAGS = ("col", "center", "shake", "wave", "dynamic", "scale", "dkey")
+_PAIRED_SHIFT = {name: index * 3 for index, name in enumerate(_PAIRED_TAGS)}
+_COUNT_MASK = 0b111
+
+# Everything the parser, the renderer and the tag reference know about
+_INLINE_NAMES = {tag.strip("</>") for tag in INLINE_TAGS}
+_HEADER_NAMES = {name for name in TYPE_DISPLAY_MAP if name != "none"} | {"se", "wpos", "select", "adv_select"}
+_CONTROL_NAMES = {"k", "p", "o", "keyyon", "wait", "dkey", "an", "item", "an_item", "num", "s"}
+_PAGE_BREAKS = {"k", "p"}
+KNOWN_TAGS = _INLINE_NAMES | _HEADER_NAMES | _CONTROL_NAMES
+
+# Same colors as the tag reference window
+_TAG_COLOR = "#4CAF50"
+_PARAM_COLOR = "#2196F3"
+_STAGE_COLOR = "#FF9800"
+_PAGE_BREAK_COLOR = "#9C27B0"
+_MARKER_COLOR = "#9E9E9E"
+_ERROR_COLOR = "#F44336"
+_WARNING_COLOR = "#FF9800"
+
+def _format(color: str, bold: bool = False) -> QTextCharFormat:
+    fmt = QTextCharFormat()
+    fmt.setForeground(QColor(color))
+    if bold:
+        fmt.setFontWeight(QFont.Bold)
+    return fmt
+
+def _underline(color: str) -> QTextCharFormat:
+    fmt = QTextCharFormat()
+    fmt.setUnderlineStyle(QTextCharFormat.WaveUnderline)
+    fmt.setUnderlineColor(QColor(color))
+    return fmt
+
+
+class SpmHighlighter(QSyntaxHighlighter):
+    def __init__(self, document=None):
+        super().__init__(document)
+        self._tag = _format(_TAG_COLOR)
+        self._param = _format(_PARAM_COLOR)
+        self._stage = _format(_STAGE_COLOR, bold=True)
+        self._page_break = _format(_PAGE_BREAK_COLOR, bold=True)
+        self._marker = _format(_MARKER_COLOR)
+        self._error = _underline(_ERROR_COLOR)
+        self._warning = _underline(_WARNING_COLOR)
+
+    def highlightBlock(self, text: str):
+        state = max(0, self.previousBlockState())
+        errors = []
+        warnings = []
+
+        # Stage ids (same rule as the parser: at the start of the line or right after [NUL])
+        stages = list(_STAGE_TOKEN_RE.finditer(text)) if "_" in text else []
+        next_stage = 0
+
+        for match in _MARKUP_RE.finditer(text):
+            start, end = match.span()
+
+            # A stage id begins a new message, anything still open belonged to the one before
+            while next_stage < len(stages) and stages[next_stage].start() <= start:
+                state = self._enter_message(stages[next_stage], state, errors)
+                next_stage += 1
+
+            if match.group(0)[0] == "[":
+                self.setFormat(start, end - start, self._marker)
+                continue
+
+            closing, name, params, terminated = match.groups()
+            key = name.lower()
+            self.setFormat(start, end - start, self._page_break if key in _PAGE_BREAKS else self._tag)
+            if params:
+                self.setFormat(match.start(3), len(params), self._param)
+
+            if not terminated:
+                errors.append((start, end))
+            elif key not in KNOWN_TAGS:
+                warnings.append((start, end))
+            elif key in _PAIRED_SHIFT:
+                shift = _PAIRED_SHIFT[key]
+                count = (state >> shift) & _COUNT_MASK
+                if closing:
+                    if not count:
+                        errors.append((start, end))
+                        continue
+                    count -= 1
+                else:
+                    count = min(count + 1, _COUNT_MASK)
+                state = (state & ~(_COUNT_MASK << shift)) | (count << shift)
+
+        for stage in stages[next_stage:]:
+            state = self._enter_message(stage, state, errors)
+
+        # Underlines go on top of the colors
+        for spans, fmt in ((warnings, self._warning), (errors, self._error)):
+            for start, end in spans:
+                for position in range(start, end):
+                    merged = QTextCharFormat(self.format(position))
+                    merged.merge(fmt)
+                    self.setFormat(position, 1, merged)
+        self.setCurrentBlockState(state)
+
+    # Colors the id and returns the state for the new message. A message left with open tags is flagged on the [NUL] in
+    # front of the next stage id (on the id itself when it starts the line).
+    def _enter_message(self, stage, state: int, errors: list) -> int:
+        self.setFormat(stage.start(1), stage.end(1) - stage.start(1), self._stage)
+        if state:
+            start = stage.start()
+            errors.append((start, stage.start(1) if stage.start(1) > start else stage.end(1)))
+        return 0
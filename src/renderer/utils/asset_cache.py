@@ -0,0 +1,68 @@
+from typing import Dict, List, Optional
+from PyQt5.QtGui import QPixmap
+from PyQt5.QtCore import QUrl
+
+# Project Imports
+from managers.Resource_Manager import get_resource
+from managers.Debug_Manager import debug
+
+#===================================================================================================================================
+# Process wide image cache (bubble backgrounds, cursor frames, icons) so every PNG is decoded once
+#===================================================================================================================================
+_PIXMAPS: Dict[str, QPixmap] = {}       # full path -> decoded pixmap
+_PATHS: Dict[str, str] = {}             # relative path -> full path
+_URL_KEYS: Dict[str, str] = {}          # QUrl(src).toString() -> full path, for <img> lookups from QTextBrowser
+_STATS = {"hits": 0, "misses": 0}
+
+CURSOR_FRAME_PATHS = [f"Packaged_Resources/Images/Icons/Crusor_{n}.png" for n in range(1, 6)]
+
+# =====================================================================
+# Paths
+# =====================================================================
+def resource_path(relative_path: str) -> str:
+    full_path = _PATHS.get(relative_path)
+    if full_path is None:
+        full_path = _PATHS[relative_path] = get_resource(relative_path)
+    return full_path
+
+# Full path to drop into an <img src=...>, remembered so the bubble text browser can serve it from the cache
+def icon_src(relative_path: str) -> str:
+    full_path = resource_path(relative_path)
+    key = QUrl(full_path).toString()
+    if key not in _URL_KEYS:
+        _URL_KEYS[key] = full_path
+    return full_path
+
+# =====================================================================
+# Pixmaps (GUI thread only, like QPixmap itself)
+# =====================================================================
+def pixmap_from_path(full_path: str) -> QPixmap:
+    pixmap = _PIXMAPS.get(full_path)
+    if pixmap is not None:
+        _STATS["hits"] += 1
+        return pixmap
+    _STATS["misses"] += 1
+    pixmap = QPixmap(full_path)
+    if pixmap.isNull():
+        debug.warning("Image could not be loaded: %s", full_path)
+    _PIXMAPS[full_path] = pixmap
+    return pixmap
+
+def get_pixmap(relative_path: str) -> QPixmap:
+    return pixmap_from_path(resource_path(relative_path))
+
+def cursor_frames() -> List[QPixmap]:
+    return [get_pixmap(path) for path in CURSOR_FRAME_PATHS]
+
+# Pixmap for an image url handed out by icon_src (None if it isn't one of ours)
+def pixmap_for_url(url: QUrl) -> Optional[QPixmap]:
+    full_path = _URL_KEYS.get(url.toString())
+    if full_path is None:
+        return None
+    return pixmap_from_path(full_path)
+
+# =====================================================================
+# Stats
+# =====================================================================
+def asset_cache_stats() -> Dict[str, int]:
+    return {"hits": _STATS["hits"], "misses": _STATS["misses"], "entries": len(_PIXMAPS)}
@@ -0,0 +1,46 @@
+from typing import List, Tuple
+
+#===================================================================================================================================
+# SPM Control Character Codec (raw bytes <-> [NUL]/[LF]/[CR] markup)
+#===================================================================================================================================
+# Each entry is (markup, raw byte, line break shown after the markup in the editor).
+# Adding a new control character only needs a new row here, both directions are built from this table.
+CONTROL_CHARS: Tuple[Tuple[bytes, bytes, bytes], ...] = (
+    (b"[NUL]", b"\x00", b""),
+    (b"[LF]", b"\x0A", b"\n"),
+    (b"[CR]", b"\x0D", b"\n"),
+)
+
+# =====================================================================
+# Replacement passes built once from CONTROL_CHARS
+# =====================================================================
+# Raw byte -> markup plus its editor line break
+_DECODE_PASSES: List[Tuple[bytes, bytes]] = [(raw, markup + line_break) for markup, raw, line_break in CONTROL_CHARS]
+
+# Editor line breaks after markup are dropped first (\r\n before \n so it isn't split), then markup -> raw byte.
+# Every strip runs before any swap so a swapped-in \n can never be swallowed by a later row.
+_ENCODE_PASSES: List[Tuple[bytes, bytes]] = []
+for _markup, _, _line_break in CONTROL_CHARS:
+    if _line_break:
+        _ENCODE_PASSES.append((_markup + b"\r\n", _markup))
+        _ENCODE_PASSES.append((_markup + b"\n", _markup))
+_ENCODE_PASSES.extend((markup, raw) for markup, raw, _ in CONTROL_CHARS)
+
+
+# =====================================================================
+# Decoder (all passes run on the raw bytes, the file is only turned into a str once at the end)
+# =====================================================================
+def decode(raw_bytes: bytes) -> str:
+    for raw, visible in _DECODE_PASSES:
+        raw_bytes = raw_bytes.replace(raw, visible)
+    return raw_bytes.decode("latin1")
+
+
+# =====================================================================
+# Encoder (text is turned into bytes once up front, one C level pass per table step)
+# =====================================================================
+def encode(visible_text: str) -> bytes:
+    encoded = visible_text.encode("latin1")
+    for visible, raw in _ENCODE_PASSES:
+        encoded = encoded.replace(visible, raw)
+    return encoded
@@ -0,0 +1,97 @@
+import re
+from bisect import bisect_right
+from functools import lru_cache
+from typing import List, Tuple
+
+#===================================================================================================================================
+# Markup-stripped projection of the editor text (for tag-aware searching)
+#===================================================================================================================================
+# Tags and [NUL]/[LF]/[CR] notation are dropped so "Hello <col ff0000ff>world</col>" reads "Hello world". Page breaks and
+# control characters become a space so words on either side don't run together. Every kept piece remembers where it came
+# from, so a hit in the projection maps straight back to a range of the raw text (and to the plain text pieces inside it).
+_MARKUP_RE = re.compile(r"<[^>\n]*>|\[(?:NUL|LF|CR)\]")
+_SEPARATORS = ("[nul]", "[lf]", "[cr]", "<k>", "<p>")
+
+# A run is (projected offset, raw offset, length, is text) inside one line, separators are the runs that aren't text
+Run = Tuple[int, int, int, bool]
+
+@lru_cache(maxsize=65536)
+def project_line(line: str) -> Tuple[str, Tuple[Run, ...]]:
+    parts: List[str] = []
+    runs: List[Run] = []
+    projected = 0
+    pos = 0
+    for match in _MARKUP_RE.finditer(line):
+        start = match.start()
+        if start > pos:
+            parts.append(line[pos:start])
+            runs.append((projected, pos, start - pos, True))
+            projected += start - pos
+        if match.group().lower() in _SEPARATORS:
+            parts.append(" ")
+            runs.append((projected, start, 1, False))
+            projected += 1
+        pos = match.end()
+    if pos < len(line):
+        parts.append(line[pos:])
+        runs.append((projected, pos, len(line) - pos, True))
+    return "".join(parts), tuple(runs)
+
+
+class TextProjection:
+    def __init__(self, visible_text: str):
+        self.source = visible_text
+        self._line_runs: List[Tuple[Run, ...]] = []
+        self._projected_starts: List[int] = []
+        self._raw_starts: List[int] = []
+        self._line_ends: List[Tuple[int, int]] = []
+
+        pieces = []
+        projected_start = raw_start = 0
+        for line in visible_text.split("\n"):
+            projected, runs = project_line(line)
+            pieces.append(projected)
+            self._line_runs.append(runs)
+            self._projected_starts.append(projected_start)
+            self._raw_starts.append(raw_start)
+            self._line_ends.append((len(projected), len(line)))
+            projected_start += len(projected) + 1
+            raw_start += len(line) + 1
+        self.text = "\n".join(pieces)
+
+    # =====================================================================
+    # Projection offsets -> raw text offsets
+    # =====================================================================
+    def to_raw(self, offset: int) -> int:
+        line = bisect_right(self._projected_starts, offset) - 1
+        local = offset - self._projected_starts[line]
+        runs = self._line_runs[line]
+        projected_length, raw_length = self._line_ends[line]
+        if local >= projected_length:
+            # The \n after the line (or the end of the text)
+            return self._raw_starts[line] + raw_length
+        index = max(0, bisect_right(runs, (local, float("inf"))) - 1)
+        run_start, raw_offset, length, _ = runs[index]
+        return self._raw_starts[line] + raw_offset + min(local - run_start, length)
+
+    def span_to_raw(self, start: int, end: int) -> Tuple[int, int]:
+        raw_start = self.to_raw(start)
+        raw_end = self.to_raw(end - 1) + 1 if end > start else raw_start
+        return raw_start, raw_end
+
+    # Raw ranges of the plain text a projected span covers, in order. The tags, [LF]/[NUL]/[CR] markers and line breaks
+    # between them aren't included, so rewriting only these ranges leaves the markup where it was.
+    def span_to_raw_text(self, start: int, end: int) -> List[Tuple[int, int]]:
+        spans = []
+        line = bisect_right(self._projected_starts, start) - 1
+        while line < len(self._line_runs) and self._projected_starts[line] < end:
+            local_start = start - self._projected_starts[line]
+            local_end = end - self._projected_starts[line]
+            for run_start, raw_offset, length, is_text in self._line_runs[line]:
+                piece_start = max(local_start, run_start)
+                piece_end = min(local_end, run_start + length)
+                if is_text and piece_start < piece_end:
+                    raw = self._raw_starts[line] + raw_offset - run_start
+                    spans.append((raw + piece_start, raw + piece_end))
+            line += 1
+        return spans
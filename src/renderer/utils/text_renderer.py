@@ -1,8 +1,9 @@
 import re
+from collections import OrderedDict
 from typing import Dict, List, Tuple, Optional, Callable
 
 # Project Imports
-from managers.Resource_Manager import get_resource
+from renderer.utils.asset_cache import icon_src
 
 # =====================================================================
 # Icon Tag Mapping
@@ -38,11 +39,167 @@ def _span_fontsize(size: int) -> str:
     return f'<span style="font-size: {size}px;">'
 
 def _icon_with_value(icon_key: str, base_font_size: int, value: Optional[int] = None) -> str:
-    icon_img = _img_tag(get_resource(TAG_ICON_MAP[icon_key]), base_font_size)
+    icon_img = _img_tag(icon_src(TAG_ICON_MAP[icon_key]), base_font_size)
     if value is not None:
         return f"{icon_img}<span style='color: gray;'>{value}</span>"
     return icon_img
 
+# Special characters drawn as icons
+SPECIAL_CHAR_ICONS: Dict[str, str] = {
+    "Þ": "Packaged_Resources/Images/Icons/Icon_Star.png",
+    "®": "Packaged_Resources/Images/Icons/Icon_Arrow_Left.png",
+}
+
+_TAG_RE = re.compile(r"<([^>]+)>")
+
+# =====================================================================
+# Per call render state (what the handlers share while one page is rendered)
+# =====================================================================
+class _RenderState:
+    __slots__ = ("base_font_size", "persistent_color", "scale_stack", "color_stack", "center_stack")
+
+    def __init__(self, base_font_size: int, persistent_color: Optional[Tuple[int, int, int]]):
+        self.base_font_size = base_font_size
+        self.persistent_color = persistent_color
+        self.scale_stack: List[int] = []
+        self.color_stack: List[Tuple[int, int, int]] = []
+        self.center_stack: List[bool] = []
+
+# =================================================================
+# Dispatcher functions for each tag
+# =================================================================
+def _handle_icon(parts: List[str], state: _RenderState) -> str:
+    if len(parts) < 2:
+        return f"<{' '.join(parts)}>"
+    icon = parts[1]
+    if icon in TAG_ICON_MAP:
+        return _img_tag(icon_src(TAG_ICON_MAP[icon]), state.base_font_size)
+    return f"<{' '.join(parts)}>"
+
+def _handle_scale(parts: List[str], state: _RenderState) -> str:
+    if len(parts) == 2:
+        try:
+            factor = float(parts[1])
+            scaled = int(state.base_font_size * factor * 0.5)
+            state.scale_stack.append(scaled)
+            return _span_fontsize(scaled)
+        except ValueError:
+            pass
+    return f"<{' '.join(parts)}>"
+
+def _handle_endscale(_: List[str], state: _RenderState) -> str:
+    if state.scale_stack:
+        state.scale_stack.pop()
+    return "</span>"
+
+def _handle_wait(parts: List[str], state: _RenderState) -> str:
+    if len(parts) == 2:
+        try:
+            wait_time = int(parts[1])
+            img = _img_tag(icon_src(TAG_ICON_MAP["WAIT"]), state.base_font_size)
+            return f"{img}<span style='color: gray;'>{wait_time}ms</span>"
+        except ValueError:
+            pass
+    return f"<{' '.join(parts)}>"
+
+def _handle_col(parts: List[str], state: _RenderState) -> str:
+    if len(parts) == 2 and len(parts[1]) == 8:
+        try:
+            r, g, b = (int(parts[1][i:i+2], 16) for i in (0, 2, 4))
+            state.color_stack.append((r, g, b))
+            return _span_color(r, g, b)
+        except ValueError:
+            pass
+    return f"<{' '.join(parts)}>"
+
+def _handle_endcol(_: List[str], state: _RenderState) -> str:
+    if state.color_stack:
+        state.color_stack.pop()
+    return "</span>"
+
+def _handle_center(_: List[str], state: _RenderState) -> str:
+    state.center_stack.append(True)
+    if state.color_stack:
+        r, g, b = state.color_stack[-1]
+        return f'</span><div style="text-align:center;">{_span_color(r,g,b)}'
+    elif state.persistent_color:
+        r, g, b = state.persistent_color
+        return f'<div style="text-align:center;">{_span_color(r,g,b)}'
+    return '<div style="text-align:center;">'
+
+def _handle_endcenter(_: List[str], state: _RenderState) -> str:
+    if state.center_stack:
+        state.center_stack.pop()
+        if state.color_stack:
+            r, g, b = state.color_stack[-1]
+            return f'</span></div>{_span_color(r,g,b)}'
+        elif state.persistent_color:
+            r, g, b = state.persistent_color
+            return f'</span></div>{_span_color(r,g,b)}'
+    return "</div>"
+
+# ---- Generic tag handler factory for similar icon-value pairs ----
+def _make_icon_value_handler(icon_key: str) -> Callable[[List[str], _RenderState], str]:
+    def handler(parts: List[str], state: _RenderState) -> str:
+        value = None
+        if len(parts) == 2:
+            try:
+                value = int(parts[1])
+            except ValueError:
+                pass
+        return _icon_with_value(icon_key, state.base_font_size, value)
+    return handler
+
+# =================================================================
+# Tag dispatcher mapping (built once)
+# =================================================================
+TAG_HANDLERS: Dict[str, Callable[[List[str], _RenderState], str]] = {
+    "icon": _handle_icon,
+    "scale": _handle_scale,
+    "/scale": _handle_endscale,
+    "wait": _handle_wait,
+    "col": _handle_col,
+    "/col": _handle_endcol,
+    "center": _handle_center,
+    "/center": _handle_endcenter,
+    "dynamic": _make_icon_value_handler("DYNAMIC"),
+    "/dynamic": _make_icon_value_handler("DYNAMIC"),
+    "shake": _make_icon_value_handler("SHAKE"),
+    "/shake": _make_icon_value_handler("SHAKE"),
+    "wave": _make_icon_value_handler("WAVE"),
+    "/wave": _make_icon_value_handler("WAVE"),
+}
+
+# =====================================================================
+# Rendered HTML cache (LRU keyed by page text, font size and persistent color)
+# =====================================================================
+DEFAULT_RENDER_CACHE_SIZE = 4096
+
+_RENDER_CACHE: "OrderedDict[Tuple[str, int, Optional[Tuple[int, int, int]]], str]" = OrderedDict()
+_RENDER_CACHE_LIMIT = DEFAULT_RENDER_CACHE_SIZE
+_RENDER_STATS = {"hits": 0, "misses": 0}
+
+def set_render_cache_size(max_entries: int):
+    global _RENDER_CACHE_LIMIT
+    _RENDER_CACHE_LIMIT = max(0, max_entries)
+    while len(_RENDER_CACHE) > _RENDER_CACHE_LIMIT:
+        _RENDER_CACHE.popitem(last=False)
+
+def clear_render_cache():
+    _RENDER_CACHE.clear()
+    _RENDER_STATS["hits"] = _RENDER_STATS["misses"] = 0
+
+def render_cache_stats() -> Dict[str, float]:
+    hits, misses = _RENDER_STATS["hits"], _RENDER_STATS["misses"]
+    total = hits + misses
+    return {
+        "hits": hits,
+        "misses": misses,
+        "entries": len(_RENDER_CACHE),
+        "max_entries": _RENDER_CACHE_LIMIT,
+        "hit_rate": hits / total if total else 0.0,
+    }
+
 # =====================================================================
 # Main renderer
 # =====================================================================
@@ -51,10 +208,27 @@ def render_text_with_tags(
     base_font_size: int,
     persistent_color: Optional[Tuple[int, int, int]] = None
 ) -> str:
+    key = (text, base_font_size, tuple(persistent_color) if persistent_color else None)
+    html = _RENDER_CACHE.get(key)
+    if html is not None:
+        _RENDER_STATS["hits"] += 1
+        _RENDER_CACHE.move_to_end(key)
+        return html
 
-    scale_stack: List[int] = []
-    color_stack: List[Tuple[int, int, int]] = []
-    center_stack: List[bool] = []
+    _RENDER_STATS["misses"] += 1
+    html = _render(text, base_font_size, persistent_color)
+    if _RENDER_CACHE_LIMIT:
+        _RENDER_CACHE[key] = html
+        if len(_RENDER_CACHE) > _RENDER_CACHE_LIMIT:
+            _RENDER_CACHE.popitem(last=False)
+    return html
+
+def _render(
+    text: str,
+    base_font_size: int,
+    persistent_color: Optional[Tuple[int, int, int]]
+) -> str:
+    state = _RenderState(base_font_size, persistent_color)
 
     # Persistent color wrapper
     html_prefix, html_suffix = "", ""
@@ -64,117 +238,9 @@ def render_text_with_tags(
         html_suffix = "</span>"
 
     # Special character replacements
-    specials = {
-        "Þ": "Packaged_Resources/Images/Icons/Icon_Star.png",
-        "®": "Packaged_Resources/Images/Icons/Icon_Arrow_Left.png",
-    }
-    for char, path in specials.items():
-        text = text.replace(char, _img_tag(get_resource(path), base_font_size))
-
-    # =================================================================
-    # Dispatcher functions for each tag
-    # =================================================================
-    def handle_icon(parts: List[str]) -> str:
-        if len(parts) < 2:
-            return f"<{' '.join(parts)}>"
-        icon = parts[1]
-        if icon in TAG_ICON_MAP:
-            return _img_tag(get_resource(TAG_ICON_MAP[icon]), base_font_size)
-        return f"<{' '.join(parts)}>"
-
-    def handle_scale(parts: List[str]) -> str:
-        if len(parts) == 2:
-            try:
-                factor = float(parts[1])
-                scaled = int(base_font_size * factor * 0.5)
-                scale_stack.append(scaled)
-                return _span_fontsize(scaled)
-            except ValueError:
-                pass
-        return f"<{' '.join(parts)}>"
-
-    def handle_endscale(_: List[str]) -> str:
-        if scale_stack:
-            scale_stack.pop()
-        return "</span>"
-
-    def handle_wait(parts: List[str]) -> str:
-        if len(parts) == 2:
-            try:
-                wait_time = int(parts[1])
-                img = _img_tag(get_resource(TAG_ICON_MAP["WAIT"]), base_font_size)
-                return f"{img}<span style='color: gray;'>{wait_time}ms</span>"
-            except ValueError:
-                pass
-        return f"<{' '.join(parts)}>"
-
-    def handle_col(parts: List[str]) -> str:
-        if len(parts) == 2 and len(parts[1]) == 8:
-            try:
-                r, g, b = (int(parts[1][i:i+2], 16) for i in (0, 2, 4))
-                color_stack.append((r, g, b))
-                return _span_color(r, g, b)
-            except ValueError:
-                pass
-        return f"<{' '.join(parts)}>"
-
-    def handle_endcol(_: List[str]) -> str:
-        if color_stack:
-            color_stack.pop()
-        return "</span>"
-
-    def handle_center(_: List[str]) -> str:
-        center_stack.append(True)
-        if color_stack:
-            r, g, b = color_stack[-1]
-            return f'</span><div style="text-align:center;">{_span_color(r,g,b)}'
-        elif persistent_color:
-            r, g, b = persistent_color
-            return f'<div style="text-align:center;">{_span_color(r,g,b)}'
-        return '<div style="text-align:center;">'
-
-    def handle_endcenter(_: List[str]) -> str:
-        if center_stack:
-            center_stack.pop()
-            if color_stack:
-                r, g, b = color_stack[-1]
-                return f'</span></div>{_span_color(r,g,b)}'
-            elif persistent_color:
-                r, g, b = persistent_color
-                return f'</span></div>{_span_color(r,g,b)}'
-        return "</div>"
-
-    # ---- Generic tag handler factory for similar icon-value pairs ----
-    def make_icon_value_handler(icon_key: str) -> Callable[[List[str]], str]:
-        def handler(parts: List[str]) -> str:
-            value = None
-            if len(parts) == 2:
-                try:
-                    value = int(parts[1])
-                except ValueError:
-                    pass
-            return _icon_with_value(icon_key, base_font_size, value)
-        return handler
-
-    # =================================================================
-    # Tag dispatcher mapping
-    # =================================================================
-    tag_handlers: Dict[str, Callable[[List[str]], str]] = {
-        "icon": handle_icon,
-        "scale": handle_scale,
-        "/scale": handle_endscale,
-        "wait": handle_wait,
-        "col": handle_col,
-        "/col": handle_endcol,
-        "center": handle_center,
-        "/center": handle_endcenter,
-        "dynamic": make_icon_value_handler("DYNAMIC"),
-        "/dynamic": make_icon_value_handler("DYNAMIC"),
-        "shake": make_icon_value_handler("SHAKE"),
-        "/shake": make_icon_value_handler("SHAKE"),
-        "wave": make_icon_value_handler("WAVE"),
-        "/wave": make_icon_value_handler("WAVE"),
-    }
+    for char, path in SPECIAL_CHAR_ICONS.items():
+        if char in text:
+            text = text.replace(char, _img_tag(icon_src(path), base_font_size))
 
     # =================================================================
     # Regex replacement
@@ -184,17 +250,18 @@ def render_text_with_tags(
         parts = tag_content.split()
         key = parts[0].lower()
 
-        if key in tag_handlers:
-            return tag_handlers[key](parts)
+        if key in TAG_HANDLERS:
+            return TAG_HANDLERS[key](parts, state)
         if tag_content in TAG_HTML_MAP:
             return TAG_HTML_MAP[tag_content]
         return match.group(0)
 
-    html_body = re.sub(r"<([^>]+)>", repl, text)
+    html_body = _TAG_RE.sub(repl, text)
 
     # Close any unclosed color spans
+    color_stack = state.color_stack
     while color_stack:
         color_stack.pop()
         html_body += "</span>"
 
-    return f"{html_prefix}{html_body}{html_suffix}"
\ No newline at end of file
+    return f"{html_prefix}{html_body}{html_suffix}"
@@ -0,0 +1,81 @@
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from fake_multimedia import qt_app   # before the project imports (offscreen platform, QtMultimedia stand-in if needed)
+from PyQt5.QtCore import Qt
+from PyQt5.QtGui import QFont
+from PyQt5.QtTest import QTest
+
+# Project Imports
+from managers.Search_Text_Manager import SearchableTextEdit
+from renderer.ui.spm_highlighter import SpmHighlighter
+from bench_spm_parser import sample_text
+
+#===================================================================================================================================
+# Keystroke latency: QTextEdit vs QPlainTextEdit (large document mode) with the same big document loaded
+#===================================================================================================================================
+# Run from the repo root: python tests/bench_editor_typing.py [message count]
+# Runs on the offscreen platform, so it works without a display. The editor is shown at a typical dock size, loaded like
+# Main_Frame loads a file (highlighter attached first) and gets key presses in the middle of the document: a word, a line
+# break and the backspaces undoing them. Each keystroke is timed until the event queue is empty again.
+_KEYS = list("hello") + [Qt.Key_Return] + [Qt.Key_Backspace] * 6
+
+def _type(editor, keys) -> list:
+    app = qt_app()
+    timings = []
+    for key in keys:
+        start = time.perf_counter()
+        QTest.keyClick(editor, key)
+        app.processEvents()
+        timings.append(time.perf_counter() - start)
+    return timings
+
+def measure(large_document: bool, messages: int, highlighting: bool = True, rounds: int = 10):
+    app = qt_app()
+    widget = SearchableTextEdit(font=QFont("Monospace", 12), large_document=large_document)
+    widget.resize(700, 900)
+    widget.show()
+    editor = widget.text_editor
+    highlighter = SpmHighlighter(editor.document()) if highlighting else None
+
+    start = time.perf_counter()
+    widget.setPlainText(sample_text(messages))
+    app.processEvents()
+    load = time.perf_counter() - start
+
+    cursor = editor.textCursor()
+    cursor.setPosition(editor.document().characterCount() // 2)
+    editor.setTextCursor(cursor)
+    editor.setFocus()
+    app.processEvents()
+
+    timings = []
+    for _ in range(rounds):
+        timings.extend(_type(editor, _KEYS))
+
+    widget.shutdown_search()
+    if highlighter is not None:
+        highlighter.setDocument(None)
+    widget.close()
+    widget.deleteLater()
+    app.processEvents()
+    return load, timings
+
+def run(messages: int = 20000):
+    print(f"{messages} messages, {len(_KEYS) * 10} keystrokes in the middle of the document")
+    for highlighting in (True, False):
+        for name, large_document in (("QTextEdit     ", False), ("QPlainTextEdit", True)):
+            load, timings = measure(large_document, messages, highlighting)
+            timings_ms = sorted(t * 1000 for t in timings)
+            p95 = timings_ms[int(len(timings_ms) * 0.95) - 1]
+            print(
+                f"  {name} ({'highlighted' if highlighting else 'plain'}): load {load:6.2f} s, per keystroke "
+                f"median {statistics.median(timings_ms):7.2f} ms, p95 {p95:7.2f} ms, max {timings_ms[-1]:7.2f} ms"
+            )
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 20000)
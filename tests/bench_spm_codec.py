@@ -0,0 +1,67 @@
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+# Project Imports
+from renderer.utils import spm_codec
+
+#===================================================================================================================================
+# Micro-benchmark: table-driven codec vs the str.replace chains File_Handler used before it
+#===================================================================================================================================
+# Run from the repo root: python tests/bench_spm_codec.py [size in MB]
+# The legacy functions are kept here as written in File_Handler, test_spm_codec.py also checks the codec against them.
+
+# Convert visually marked-up text to raw bytes with control characters (old File_Handler.encode_visible_to_bytes)
+def legacy_encode(visible_text: str) -> bytes:
+    clean_text = visible_text.replace('[LF]\r\n', '[LF]').replace('[LF]\n', '[LF]')
+    clean_text = clean_text.replace('[CR]\r\n', '[CR]').replace('[CR]\n', '[CR]')
+    return (
+        clean_text
+        .replace('[NUL]', '\x00')
+        .replace('[LF]', '\x0A')
+        .replace('[CR]', '\x0D')
+    ).encode('latin1')
+
+# Convert raw bytes into visually marked-up text for the editor (old File_Handler.decode_bytes_to_visible)
+def legacy_decode(raw_bytes: bytes) -> str:
+    content = raw_bytes.decode('latin1')
+    return (
+        content
+        .replace('\x00', '[NUL]')
+        .replace('\x0A', '[LF]\n')
+        .replace('\x0D', '[CR]\n')
+    )
+
+# Something shaped like global.txt: id, NUL, tagged text with LF line breaks, NUL
+def sample_file(size: int) -> bytes:
+    message = b"stg1_1_%03d\x00<system>\nHello <col ff0000ff>world</col> \x83\x65\nPage two\r\n<k>\n\x00"
+    chunks = []
+    total = 0
+    index = 0
+    while total < size:
+        chunk = message % (index % 1000)
+        chunks.append(chunk)
+        total += len(chunk)
+        index += 1
+    return b"".join(chunks)
+
+def run(size_mb: float = 8.0, repeat: int = 5):
+    raw = sample_file(int(size_mb * 1024 * 1024))
+    visible = spm_codec.decode(raw)
+    assert visible == legacy_decode(raw)
+    assert spm_codec.encode(visible) == legacy_encode(visible) == raw
+
+    print(f"{len(raw) / (1024 * 1024):.1f} MB file, best of {repeat}")
+    for name, func, arg in (
+        ("decode (legacy)", legacy_decode, raw),
+        ("decode (codec) ", spm_codec.decode, raw),
+        ("encode (legacy)", legacy_encode, visible),
+        ("encode (codec) ", spm_codec.encode, visible),
+    ):
+        best = min(timeit.repeat(lambda: func(arg), number=1, repeat=repeat))
+        print(f"  {name}: {best * 1000:8.1f} ms")
+
+if __name__ == "__main__":
+    run(float(sys.argv[1]) if len(sys.argv) > 1 else 8.0)
@@ -0,0 +1,159 @@
+import os
+import re
+import sys
+import timeit
+from typing import List, Optional, Tuple
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+# Project Imports
+from renderer.models.bubble_block import BubbleBlock
+from renderer.parsing.spm_parser import _STAGE_LINE_RE, _STAGE_TOKEN_RE, _clean_line, _join_page_lines, parse_spm_text
+
+#===================================================================================================================================
+# Micro-benchmark: typed lexer parse vs the token list + list.insert parse spm_parser used before it
+#===================================================================================================================================
+# Run from the repo root: python tests/bench_spm_parser.py [largest message count]
+# The legacy parser is kept here as written in spm_parser (minus its per-line debug output), test_spm_parser.py also checks
+# the parser against it. The helpers it shares with the current parser (_clean_line, _join_page_lines, the stage patterns)
+# are unchanged, so they're imported instead of copied.
+
+# Old spm_parser.parse_spm_text, tokenizer included
+def legacy_parse_spm_text(visible_text: str) -> List[BubbleBlock]:
+    lines: List[str] = []
+    for raw in visible_text.splitlines():
+        cleaned = _clean_line(raw)
+        if not cleaned:
+            continue
+        pos = 0
+        for match in _STAGE_TOKEN_RE.finditer(cleaned):
+            prefix = cleaned[pos:match.start()].strip()
+            if prefix:
+                lines.append(prefix)
+            lines.append(match.group(1).strip())
+            pos = match.end()
+        tail = cleaned[pos:].strip()
+        if tail:
+            lines.append(tail)
+
+    bubbles: List[BubbleBlock] = []
+    i = 0
+
+    def is_stage_line(line: str) -> bool:
+        return bool(_STAGE_LINE_RE.fullmatch(line.strip()))
+
+    _BUBBLE_TAGS = {"diary", "system", "fairy", "kanban", "fairy2", "housou", "majo", "adv", "clear", "small"}
+
+    def _parse_position(line: str, tag: str) -> Optional[Tuple[int, int, int, int]]:
+        m = re.match(
+            fr"<{tag}\s+(-?\d+)\s+(-?\d+)\s+(\d+)\s+(\d+)>",
+            line,
+            flags=re.IGNORECASE,
+        )
+        return tuple(map(int, m.groups())) if m else None
+
+    while i < len(lines):
+        if not is_stage_line(lines[i]):
+            i += 1
+            continue
+
+        stage_npc = lines[i].strip()
+        i += 1
+
+        bubble_type = "none"
+        bubble_sound = "none"
+        position = (0, 0, 0, 0)
+
+        while i < len(lines) and lines[i].startswith("<") and not lines[i].lower().startswith("<p"):
+            inner_line = lines[i].lower().strip()
+
+            if inner_line.startswith("<se 1>"):
+                bubble_sound = "Typewriter"
+                i += 1
+                continue
+            elif inner_line.startswith("<se 2>"):
+                bubble_sound = "Pencil"
+                i += 1
+                continue
+
+            matched_type = False
+            for tag in _BUBBLE_TAGS:
+                if inner_line.startswith(f"<{tag}>"):
+                    bubble_type = tag
+                    remainder = lines[i][len(f"<{tag}>") :].strip()
+                    i += 1
+                    if remainder:
+                        lines.insert(i, remainder)
+                    matched_type = True
+                    break
+            if matched_type:
+                continue
+
+            for select_tag in ("select", "adv_select"):
+                if inner_line.startswith(f"<{select_tag}"):
+                    bubble_type = select_tag
+                    pos = _parse_position(lines[i], select_tag)
+                    if pos:
+                        position = pos
+                    i += 1
+                    matched_type = True
+                    break
+            if matched_type:
+                continue
+
+            if inner_line.startswith("<wpos"):
+                pos = _parse_position(lines[i], "wpos")
+                if pos:
+                    position = pos
+                i += 1
+                continue
+
+            break
+
+        pages: List[str] = []
+        page_buf: List[str] = []
+        while i < len(lines) and not is_stage_line(lines[i]):
+            line = lines[i]
+            if line.startswith("<k>"):
+                if page_buf:
+                    pages.append(_join_page_lines(page_buf))
+                    page_buf = []
+            else:
+                page_buf.append(line)
+            i += 1
+        if page_buf:
+            pages.append(_join_page_lines(page_buf))
+
+        bubbles.append(BubbleBlock(stage_npc, bubble_type, position, pages, bubble_sound))
+
+    return bubbles
+
+# Everything a bubble carries, for comparing two parses
+def block_fields(blocks: List[BubbleBlock]) -> List[tuple]:
+    return [(b.stage_npc, b.bubble_type, tuple(b.position), b.pages, b.bubble_sound) for b in blocks]
+
+# Something shaped like global.txt as the editor shows it, two pages per message
+def sample_text(messages: int) -> str:
+    message = "[NUL]stg1_1_{:03d}[NUL]<system>Hi there[LF]\nSecond line <col ff0000ff>red</col>[LF]\n<k>[LF]\nPage two[LF]\n"
+    return "".join(message.format(index % 1000) for index in range(messages))
+
+def run(max_messages: int = 40000, repeat: int = 3):
+    # The legacy parse is quadratic, past 20k messages it takes longer than the rest of the run put together
+    legacy_limit = 20000
+
+    print(f"best of {repeat}, time per message in brackets")
+    messages = 5000
+    while messages <= max_messages:
+        text = sample_text(messages)
+        if messages <= legacy_limit:
+            assert block_fields(parse_spm_text(text)) == block_fields(legacy_parse_spm_text(text))
+
+        for name, func in (("legacy", legacy_parse_spm_text), ("parser", parse_spm_text)):
+            if func is legacy_parse_spm_text and messages > legacy_limit:
+                continue
+            best = min(timeit.repeat(lambda: func(text), number=1, repeat=repeat))
+            print(f"  {messages:6d} messages, {name}: {best * 1000:8.1f} ms ({best * 1e6 / messages:5.1f} us)")
+        messages *= 2
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 40000)
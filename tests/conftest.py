@@ -0,0 +1,5 @@
+import os
+import sys
+
+# The app runs from src/ (python Flint.py), so its modules are imported the same way here
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
@@ -0,0 +1,145 @@
+import os
+import sys
+import types
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt5.QtCore import QObject, pyqtSignal
+from PyQt5.QtWidgets import QApplication
+
+#===================================================================================================================================
+# Offscreen Qt for the widget tests, plus stand-ins for the QtMultimedia classes Sound_Manager uses
+#===================================================================================================================================
+# Import this before any project module: Sound_Manager imports QtMultimedia at module level, and where the audio backend
+# libraries are missing (headless machines) the real module can't be loaded. The fakes then stand in for it so modules that
+# import Sound_Manager (the search bar plays sounds) can still be tested. The sound tests swap the fakes in either way.
+
+# Widgets need an application object, every test in the run shares the one
+def qt_app() -> QApplication:
+    return QApplication.instance() or QApplication([])
+
+# A QSoundEffect whose backend lags like the real one: isPlaying() stays False after play() until started() is called,
+# and the sound only ends when the test says so with finished() (or when it's stopped)
+class FakeSoundEffect(QObject):
+    playingChanged = pyqtSignal()
+    statusChanged = pyqtSignal()
+    Null, Loading, Ready, Error = range(4)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._playing = False
+        self.play_calls = 0
+        self.stop_calls = 0
+
+    def setSource(self, url):
+        pass
+
+    def status(self) -> int:
+        return self.Ready
+
+    def isLoaded(self) -> bool:
+        return True
+
+    def setVolume(self, volume: float):
+        pass
+
+    def setMuted(self, muted: bool):
+        pass
+
+    def play(self):
+        self.play_calls += 1
+
+    def stop(self):
+        self.stop_calls += 1
+        self.finished()
+
+    def isPlaying(self) -> bool:
+        return self._playing
+
+    def started(self):
+        if not self._playing:
+            self._playing = True
+            self.playingChanged.emit()
+
+    def finished(self):
+        if self._playing:
+            self._playing = False
+            self.playingChanged.emit()
+
+# A QMediaPlayer that never decodes anything: every file is duration_ms long, position only moves with tick()
+class FakeMediaPlayer(QObject):
+    mediaStatusChanged = pyqtSignal(int)
+    positionChanged = pyqtSignal("qint64")
+    durationChanged = pyqtSignal("qint64")
+    StoppedState, PlayingState, PausedState = range(3)
+    LoadedMedia, BufferedMedia, EndOfMedia = 3, 6, 7
+    duration_ms = 10000
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._state = self.StoppedState
+        self._position = 0
+        self.media = None
+        self.loads = 0
+        self.played_from = []       # position at every play() call
+
+    def setNotifyInterval(self, interval: int):
+        pass
+
+    def setVolume(self, volume: int):
+        pass
+
+    def setMuted(self, muted: bool):
+        pass
+
+    def setMedia(self, media):
+        self.media = media
+        self.loads += 1
+        self._position = 0
+
+    def play(self):
+        self._state = self.PlayingState
+        self.played_from.append(self._position)
+
+    def pause(self):
+        self._state = self.PausedState
+
+    def stop(self):
+        self._state = self.StoppedState
+        self._position = 0
+
+    def state(self) -> int:
+        return self._state
+
+    def duration(self) -> int:
+        return self.duration_ms if self.media is not None else 0
+
+    def position(self) -> int:
+        return self._position
+
+    def setPosition(self, position: int):
+        self._position = position
+
+    def tick(self, position: int):
+        self._position = position
+        self.positionChanged.emit(position)
+
+    def reach_end(self):
+        self._state = self.StoppedState
+        self.mediaStatusChanged.emit(self.EndOfMedia)
+
+class FakeMediaContent:
+    def __init__(self, url=None):
+        self.url = url
+
+def _install_if_missing():
+    try:
+        import PyQt5.QtMultimedia  # noqa: F401
+    except ImportError:
+        module = types.ModuleType("PyQt5.QtMultimedia")
+        module.QSoundEffect = FakeSoundEffect
+        module.QMediaPlayer = FakeMediaPlayer
+        module.QMediaContent = FakeMediaContent
+        sys.modules["PyQt5.QtMultimedia"] = module
+
+_install_if_missing()
@@ -0,0 +1,113 @@
+import pytest
+
+from fake_multimedia import FakeMediaContent, FakeMediaPlayer, qt_app
+
+# Project Imports
+from managers import Sound_Manager
+
+#===================================================================================================================================
+# Gapless BGM handovers (fake players, position updates and end of media are sent by the test)
+#===================================================================================================================================
+_FOLDER = "Audio/BGM"
+
+class _Catalog:
+    def __init__(self, tracks, loops):
+        self._tracks = tracks
+        self._loops = loops
+
+    def tracks(self, folder):
+        return self._tracks
+
+    def info(self, folder, track_name):
+        if track_name not in self._tracks:
+            return None
+        loop = self._loops.get(track_name, {})
+        return {"loop_start": loop.get("loop_start"), "loop_end": loop.get("loop_end")}
+
+    def set_duration(self, folder, track_name, duration_ms):
+        pass
+
+@pytest.fixture
+def handovers(monkeypatch):
+    qt_app()
+    catalog = _Catalog(["A.ogg", "B.ogg"], {"A.ogg": {"loop_start": 2000, "loop_end": 8000}})
+    current = []
+    monkeypatch.setattr(Sound_Manager, "QMediaPlayer", FakeMediaPlayer)
+    monkeypatch.setattr(Sound_Manager, "QMediaContent", FakeMediaContent)
+    monkeypatch.setattr(Sound_Manager, "_get_bgm_catalog", lambda: catalog)
+    monkeypatch.setattr(Sound_Manager, "_set_current_track", lambda folder, track_name: current.append(track_name))
+    monkeypatch.setattr(Sound_Manager, "_loop_current", True)
+    monkeypatch.setattr(Sound_Manager, "_loop_all", False)
+    return current
+
+# Sends position updates every 20 ms (like the notify interval) while the player is still the one heard, returns the last
+def _play_until(bgm, player, end: int) -> int:
+    position = 0
+    for position in range(0, end + 1, 20):
+        if bgm._players[bgm._active] is not player:
+            break
+        player.tick(position)
+    return position
+
+def test_loop_end_switches_to_player_parked_at_loop_start(handovers):
+    bgm = Sound_Manager._GaplessBgm()
+    bgm.play(_FOLDER, "A.ogg", True)
+    first, second = bgm._players
+
+    # Buffered a few seconds ahead of the loop end, paused on the loop start
+    _play_until(bgm, first, 8000 - Sound_Manager._PREBUFFER_MS)
+    assert bgm._queued == (_FOLDER, "A.ogg", 2000)
+    assert second.state() == FakeMediaPlayer.PausedState and second.position() == 2000
+
+    switched_at = _play_until(bgm, first, 10000)
+    assert 8000 - Sound_Manager._SWITCH_AHEAD_MS <= switched_at <= 8000 + 20
+    assert bgm._players[bgm._active] is second
+    assert second.played_from == [2000]
+    assert first.state() == FakeMediaPlayer.StoppedState
+    assert handovers == ["A.ogg"]
+
+def test_loop_all_hands_over_at_end_of_media(handovers, monkeypatch):
+    monkeypatch.setattr(Sound_Manager, "_loop_current", False)
+    monkeypatch.setattr(Sound_Manager, "_loop_all", True)
+    bgm = Sound_Manager._GaplessBgm()
+    bgm.play(_FOLDER, "A.ogg", True)
+    first, second = bgm._players
+
+    # A's loop end only applies while A repeats itself, the next track waits for the end of the file
+    _play_until(bgm, first, FakeMediaPlayer.duration_ms)
+    assert bgm._players[bgm._active] is first
+    assert bgm._queued == (_FOLDER, "B.ogg", 0)
+    assert second.loads == 1 and second.played_from == []
+
+    first.reach_end()
+    assert bgm._players[bgm._active] is second
+    assert second.played_from == [0]
+    assert handovers == ["B.ogg"]
+
+# A track without loop points (or a backend that never sent position updates) still loops once its file ends
+def test_end_of_media_fallback(handovers):
+    bgm = Sound_Manager._GaplessBgm()
+    bgm.play(_FOLDER, "B.ogg", True)
+    first, second = bgm._players
+
+    _play_until(bgm, first, FakeMediaPlayer.duration_ms)
+    assert bgm._players[bgm._active] is first
+    first.reach_end()
+    assert bgm._players[bgm._active] is second
+    assert second.played_from == [0]
+
+    second.reach_end()
+    assert bgm._players[bgm._active] is first
+    assert first.played_from == [0, 0]
+    assert handovers == ["B.ogg", "B.ogg"]
+
+def test_no_handover_without_looping(handovers):
+    bgm = Sound_Manager._GaplessBgm()
+    bgm.play(_FOLDER, "A.ogg", False)
+    first, second = bgm._players
+
+    _play_until(bgm, first, FakeMediaPlayer.duration_ms)
+    first.reach_end()
+    assert bgm._players[bgm._active] is first
+    assert second.played_from == [] and bgm._queued is None
+    assert handovers == []
@@ -0,0 +1,92 @@
+import random
+
+# Project Imports
+from renderer.parsing.incremental_parser import IncrementalSpmParser
+from renderer.parsing.spm_parser import parse_spm_text
+from bench_spm_parser import block_fields
+
+#===================================================================================================================================
+# Incremental reparse vs a full parse of the same text
+#===================================================================================================================================
+# Random edits go through note_change exactly like QTextDocument.contentsChange reports them (position, removed, added),
+# a few of them per reparse so the merging of pending edits gets exercised too. Stage ids are among the inserted fragments
+# and deletions cut through them, so edits keep adding, splitting and removing messages.
+_FRAGMENTS = [
+    "[NUL]", "stg1_1_000", "stg2_3_01", "anna_stg3_02_15", "[LF]\n", "\n", "\r\n", " ", "x", "Hello", "\x85",
+    "<system>", "<system>hi", "<k>", "<p>", "<se 1>", "<wpos 1 -2 3 4>", "<select 0 0 100 50>", "<adv>stg1_1_000",
+    "<fairy>", "<col ff0000ff>", "</col>",
+]
+_STAGE_LINES = ["[NUL]stg1_1_010[NUL]\n", "stg4_2_003[NUL]\n", "[NUL]anna_stg3_02_16\n"]
+
+def _random_text(rng: random.Random, count: int) -> str:
+    return "".join(rng.choice(_FRAGMENTS) for _ in range(count))
+
+def _edit(parser: IncrementalSpmParser, text: str, position: int, removed: int, inserted: str) -> str:
+    parser.note_change(position, removed, len(inserted))
+    return text[:position] + inserted + text[position + removed:]
+
+def _assert_matches_full_parse(parser: IncrementalSpmParser, text: str):
+    parser.reparse(text)
+    assert block_fields(parser.blocks) == block_fields(parse_spm_text(text)), repr(text)
+
+def test_random_edits():
+    rng = random.Random(4)
+    for _ in range(2000):
+        text = _random_text(rng, rng.randint(0, 40))
+        parser = IncrementalSpmParser()
+        parser.parse(text)
+        for _ in range(rng.randint(1, 4)):
+            for _ in range(rng.randint(1, 3)):
+                position = rng.randint(0, len(text))
+                removed = rng.randint(0, min(8, len(text) - position))
+                text = _edit(parser, text, position, removed, _random_text(rng, rng.randint(0, 3)))
+            _assert_matches_full_parse(parser, text)
+
+# Whole stage lines typed in or deleted, plus edits pinned to the very start and end of the document
+def test_stage_lines_and_document_edges():
+    rng = random.Random(9)
+    for _ in range(1000):
+        text = _random_text(rng, rng.randint(0, 30))
+        parser = IncrementalSpmParser()
+        parser.parse(text)
+        for _ in range(rng.randint(1, 6)):
+            action = rng.randrange(4)
+            if action == 0:
+                line_starts = [0] + [index + 1 for index, char in enumerate(text) if char == "\n"]
+                text = _edit(parser, text, rng.choice(line_starts), 0, rng.choice(_STAGE_LINES))
+            elif action == 1:
+                stage = next((line for line in _STAGE_LINES if line in text), None)
+                if stage is None:
+                    continue
+                text = _edit(parser, text, text.index(stage), len(stage), "")
+            elif action == 2:
+                text = _edit(parser, text, 0, rng.randint(0, min(6, len(text))), _random_text(rng, rng.randint(0, 2)))
+            else:
+                removed = rng.randint(0, min(6, len(text)))
+                text = _edit(parser, text, len(text) - removed, removed, _random_text(rng, rng.randint(0, 2)))
+            _assert_matches_full_parse(parser, text)
+
+def test_first_stage_line_removed_and_restored():
+    text = "[NUL]stg1_1_000[NUL]\nHi[LF]\n[NUL]stg1_1_001[NUL]\nThere"
+    parser = IncrementalSpmParser()
+    parser.parse(text)
+
+    first = "[NUL]stg1_1_000[NUL]\n"
+    text = _edit(parser, text, 0, len(first), "")
+    _assert_matches_full_parse(parser, text)
+    assert [block.stage_npc for block in parser.blocks] == ["stg1_1_001"]
+
+    text = _edit(parser, text, 0, 0, first)
+    _assert_matches_full_parse(parser, text)
+    assert [block.stage_npc for block in parser.blocks] == ["stg1_1_000", "stg1_1_001"]
+
+# contentsChange counts the document's closing paragraph separator, so an edit at the end reports one character too many
+def test_change_past_the_end_is_clamped():
+    text = "[NUL]stg1_1_000[NUL]\nHi"
+    parser = IncrementalSpmParser()
+    parser.parse(text)
+
+    parser.note_change(len(text) - 2, 3, 6)
+    text = text[:-2] + "Hello"
+    _assert_matches_full_parse(parser, text)
+    assert parser.blocks[0].pages == ["Hello"]
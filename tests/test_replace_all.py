@@ -0,0 +1,64 @@
+import time
+
+import pytest
+
+from fake_multimedia import qt_app
+
+# Project Imports
+from managers.Search_Text_Manager import SearchableTextEdit
+
+#===================================================================================================================================
+# Replace All in tag-aware mode (through the search thread, applied to the editor like a click on the button would)
+#===================================================================================================================================
+@pytest.fixture(params=[False, True], ids=["QTextEdit", "QPlainTextEdit"])
+def editor(request):
+    app = qt_app()
+    widget = SearchableTextEdit(large_document=request.param)
+    yield widget
+    widget.shutdown_search()
+    widget.deleteLater()
+    app.processEvents()
+
+# Runs Replace All with the given options and waits for the result, returns (replaced, skipped)
+def _replace_all(editor, search: str, replacement: str, regex: bool = False):
+    results = []
+    editor.text_replaced.connect(lambda replaced, skipped: results.append((replaced, skipped)))
+    editor.tags_btn.setChecked(True)
+    editor.regex_btn.setChecked(regex)
+    editor.search_input.setText(search)
+    editor.replace_input.setText(replacement)
+    editor.replace_all()
+
+    deadline = time.monotonic() + 5
+    while not results and time.monotonic() < deadline:
+        qt_app().processEvents()
+    assert results, "Replace All never finished"
+    return results[0]
+
+def test_text_spanning_markup_keeps_its_tags(editor):
+    original = "stg1_1_000[NUL]\nHello <col ff0000ff>big</col> world[LF]\n<k>[LF]\nbig<wait 5>\nworld"
+    editor.setPlainText(original)
+
+    assert _replace_all(editor, "big world", "small planet") == (2, 0)
+    assert editor.toPlainText() == (
+        "stg1_1_000[NUL]\nHello <col ff0000ff>small planet</col>[LF]\n<k>[LF]\nsmall planet<wait 5>\n"
+    )
+
+# A match made only of separators has no plain text to rewrite, it's counted as skipped and left alone
+def test_markup_only_matches_are_skipped(editor):
+    editor.setPlainText("a b<k>c[NUL]d")
+
+    assert _replace_all(editor, "[ ]", "_", regex=True) == (1, 2)
+    assert editor.toPlainText() == "a_b<k>c[NUL]d"
+
+def test_one_undo_reverts_everything(editor):
+    original = "Hi <col 1>there</col>[LF]\nHi there[LF]\n<k>[LF]\nHi<k>there"
+    editor.setPlainText(original)
+
+    assert _replace_all(editor, "hi there", "Bye") == (3, 0)
+    assert editor.toPlainText() == "Bye<col 1></col>[LF]\nBye[LF]\n<k>[LF]\nBye<k>"
+
+    document = editor.text_editor.document()
+    document.undo()
+    assert editor.text_editor.toPlainText() == original
+    assert not document.isUndoAvailable()
@@ -0,0 +1,85 @@
+import types
+
+import pytest
+
+from fake_multimedia import FakeSoundEffect, qt_app
+
+# Project Imports
+from managers import Sound_Manager
+
+#===================================================================================================================================
+# SFX voice allocation (fake voices that report playing only when the test says so, like a backend lagging behind play())
+#===================================================================================================================================
+@pytest.fixture
+def clock(monkeypatch):
+    qt_app()
+    now = [0.0]
+    monkeypatch.setattr(Sound_Manager, "QSoundEffect", FakeSoundEffect)
+    monkeypatch.setattr(Sound_Manager, "_load_sound", lambda effect, relative_path, label: None)
+    monkeypatch.setattr(Sound_Manager, "_manifest", {name: name + ".wav" for name in "abcd"})
+    monkeypatch.setattr(Sound_Manager, "_EFFECTS", {})
+    monkeypatch.setattr(Sound_Manager, "_active_voices", [])
+    monkeypatch.setattr(Sound_Manager, "_play_requested", {})
+    monkeypatch.setattr(Sound_Manager, "time", types.SimpleNamespace(perf_counter=lambda: now[0]))
+    return now
+
+def _play(clock, name: str, after: float = 0.01) -> FakeSoundEffect:
+    clock[0] += after
+    Sound_Manager.play_sound_by_name(name)
+    return Sound_Manager._EFFECTS[name].voices
+
+def test_round_robin_then_oldest_is_restarted(clock):
+    voices = _play(clock, "a")
+    _play(clock, "a")
+    _play(clock, "a")
+    assert [voice.play_calls for voice in voices] == [1, 1, 1]
+    for voice in voices:
+        voice.started()
+
+    # Every voice busy: the one started first is stopped and played again
+    _play(clock, "a")
+    assert [voice.play_calls for voice in voices] == [2, 1, 1]
+    assert [voice.stop_calls for voice in voices] == [1, 0, 0]
+    voices[0].started()
+
+    # A voice that finished is free again and the round robin picks it up
+    voices[1].finished()
+    _play(clock, "a")
+    assert [voice.play_calls for voice in voices] == [2, 2, 1]
+    assert [voice.stop_calls for voice in voices] == [1, 0, 0]
+
+def test_cap_holds_while_voices_have_not_started(clock):
+    played = []
+    for name in "abcd":
+        for _ in range(Sound_Manager._VOICES_PER_EFFECT):
+            voices = _play(clock, name)
+            played.append(next(voice for voice in voices if voice.play_calls and voice not in played))
+            assert len(Sound_Manager._active_voices) <= Sound_Manager._MAX_ACTIVE_VOICES
+
+    # None of them reported playing yet, still the oldest ones were stopped to make room
+    extra = len(played) - Sound_Manager._MAX_ACTIVE_VOICES
+    assert [voice.stop_calls for voice in played] == [1] * extra + [0] * Sound_Manager._MAX_ACTIVE_VOICES
+    assert Sound_Manager._active_voices == played[extra:]
+
+def test_voice_counts_until_it_reports_stopping(clock):
+    voice = _play(clock, "a")[0]
+    voice.started()
+    assert Sound_Manager._active_voices == [voice]
+
+    # Playing voices stay counted however long they play
+    _play(clock, "b", after=Sound_Manager._START_GRACE_S * 2)
+    assert voice in Sound_Manager._active_voices
+
+    voice.finished()
+    assert voice not in Sound_Manager._active_voices
+
+def test_voice_that_never_starts_is_released(clock):
+    stuck = _play(clock, "a")[0]
+
+    _play(clock, "b", after=Sound_Manager._START_GRACE_S / 2)
+    assert stuck in Sound_Manager._active_voices
+
+    _play(clock, "c", after=Sound_Manager._START_GRACE_S)
+    assert stuck not in Sound_Manager._active_voices
+    assert stuck not in Sound_Manager._play_requested
+    assert stuck.stop_calls == 0
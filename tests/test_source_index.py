@@ -0,0 +1,56 @@
+import random
+
+# Project Imports
+from renderer.parsing.incremental_parser import IncrementalSpmParser
+from renderer.utils import spm_codec
+from test_incremental_parser import _edit, _random_text
+
+#===================================================================================================================================
+# Source index after incremental edits (offsets must match the editor text and the bytes the file would be saved as)
+#===================================================================================================================================
+def _check_index(parser: IncrementalSpmParser, text: str):
+    index = parser.source_index()
+    assert len(index) == len(parser.blocks)
+
+    for offset in range(len(text) + 1):
+        assert index.char_to_byte(offset) == len(spm_codec.encode(text[:offset])), (text, offset)
+
+    # Ranges run back to back, each one starts at its own stage id and maps back to its own bubble
+    expected_start = None
+    for block_index, block in enumerate(parser.blocks):
+        start, end = index.block_char_range(block_index)
+        if expected_start is not None:
+            assert start == expected_start, (text, block_index)
+        expected_start = end
+        assert text[start:start + len(block.stage_npc)] == block.stage_npc, (text, block_index)
+        assert index.block_byte_range(block_index) == (index.char_to_byte(start), index.char_to_byte(end))
+        if end > start:
+            assert index.block_at_char(start) == block_index, (text, block_index)
+            assert index.block_at_char(end - 1) == block_index, (text, block_index)
+    if parser.blocks:
+        assert expected_start == len(text)
+
+def test_offsets_after_random_edits():
+    rng = random.Random(11)
+    for _ in range(300):
+        text = _random_text(rng, rng.randint(0, 40))
+        parser = IncrementalSpmParser()
+        parser.parse(text)
+        _check_index(parser, text)
+        for _ in range(3):
+            position = rng.randint(0, len(text))
+            removed = rng.randint(0, min(8, len(text) - position))
+            text = _edit(parser, text, position, removed, _random_text(rng, rng.randint(0, 3)))
+            parser.reparse(text)
+            _check_index(parser, text)
+
+def test_stage_lookup_and_bytes():
+    text = "[NUL]stg1_1_000[NUL]<system>[LF]\r\nHi[LF]\n[NUL]STG1_1_001[NUL]\nYo\x85[CR]\n"
+    parser = IncrementalSpmParser()
+    parser.parse(text)
+    index = parser.source_index()
+
+    assert index.find_stage("stg1_1_001") == [1]
+    start, end = index.block_char_range(1)
+    assert text[start:end] == "STG1_1_001[NUL]\nYo\x85[CR]\n"
+    assert index.block_byte_range(1) == (len(b"\x00stg1_1_000\x00<system>\nHi\n\x00"), len(spm_codec.encode(text)))
@@ -0,0 +1,56 @@
+import itertools
+import random
+
+# Project Imports
+from renderer.utils import spm_codec
+from bench_spm_codec import legacy_decode, legacy_encode
+
+#===================================================================================================================================
+# Round trips for the control character codec (raw bytes -> editor text -> raw bytes)
+#===================================================================================================================================
+# Raw text that already spells out "[NUL]"/"[LF]"/"[CR]" can't survive a round trip (it reads back as the control byte),
+# so random samples containing markup are left out. Control bytes are weighted up so they land next to each other and next
+# to \n a lot, which is where the encoder's strip-before-swap ordering matters.
+_MARKUP = tuple(markup for markup, _, _ in spm_codec.CONTROL_CHARS)
+_CONTROL_BYTES = [raw[0] for _, raw, _ in spm_codec.CONTROL_CHARS]
+_ALPHABET = list(range(256)) + _CONTROL_BYTES * 40 + list(b"[]NULFCR") * 10
+
+def _random_raw(rng: random.Random, length: int) -> bytes:
+    while True:
+        raw = bytes(rng.choice(_ALPHABET) for _ in range(length))
+        if not any(markup in raw for markup in _MARKUP):
+            return raw
+
+def test_round_trip_random_bytes():
+    rng = random.Random(48)
+    for _ in range(3000):
+        raw = _random_raw(rng, rng.randint(0, 64))
+        assert spm_codec.encode(spm_codec.decode(raw)) == raw
+
+def test_round_trip_every_control_byte_next_to_newline():
+    pieces = [b"\x00", b"\n", b"\r", b"\r\n", b"a", b"["]
+    for length in range(1, 5):
+        for combo in itertools.product(pieces, repeat=length):
+            raw = b"".join(combo)
+            assert spm_codec.encode(spm_codec.decode(raw)) == raw, raw
+
+def test_decode_matches_legacy():
+    rng = random.Random(7)
+    for _ in range(2000):
+        raw = bytes(rng.choice(_ALPHABET) for _ in range(rng.randint(0, 64)))
+        assert spm_codec.decode(raw) == legacy_decode(raw)
+
+# Text as it can look after editing: markup with and without its line break, Windows line breaks, stray brackets
+def test_encode_matches_legacy():
+    rng = random.Random(11)
+    pieces = ["[NUL]", "[LF]", "[CR]", "\n", "\r\n", "\r", "[", "]", "LF", "a", "\x83", "<k>"]
+    for _ in range(3000):
+        text = "".join(rng.choice(pieces) for _ in range(rng.randint(0, 20)))
+        assert spm_codec.encode(text) == legacy_encode(text)
+
+def test_line_break_after_markup_is_editor_only():
+    assert spm_codec.decode(b"stg1\x00Hi\nthere\r\x00") == "stg1[NUL]Hi[LF]\nthere[CR]\n[NUL]"
+    assert spm_codec.encode("Hi[LF]\r\nthere[CR]\n[NUL]") == b"Hi\nthere\r\x00"
+
+    # A line break typed in the editor that doesn't follow markup isn't part of the file format, it's kept as is
+    assert spm_codec.encode("Hi\nthere") == b"Hi\nthere"
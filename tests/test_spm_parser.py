@@ -0,0 +1,56 @@
+import random
+
+# Project Imports
+from renderer.parsing.spm_parser import parse_spm_text
+from bench_spm_parser import block_fields, legacy_parse_spm_text, sample_text
+
+#===================================================================================================================================
+# Bubble parsing (typed lexer vs the legacy parser, plus a few documents with their expected bubbles written out)
+#===================================================================================================================================
+# Fragments are glued together at random, so tags, stage ids and text end up sharing lines, following [NUL], split by
+# Windows line breaks and so on. Mixed case tags and a bubble tag followed by a stage id are in there on purpose.
+_FRAGMENTS = [
+    "[NUL]", "stg1_1_000", "STG2_3_01", "anna_stg3_02_15", "[LF]\n", "\n", "\r\n", " ", "x", "Hello", "\x85",
+    "<system>", "<SYSTEM>hi", "<k>", "<k>x", "<p>", "<P>", "<se 1>", "<se 2>x", "<wpos 1 -2 3 4>",
+    "<select 0 0 100 50>", "<adv_select 1 2 3 4>", "<ADV>", "<adv>stg1_1_000", "<fairy2><system>", "<fairy>",
+    "<kanban> <k>", "<majo><wait 5>", "<col ff0000ff>", "</col>",
+]
+
+def test_matches_legacy_on_random_text():
+    rng = random.Random(5)
+    for _ in range(5000):
+        text = "".join(rng.choice(_FRAGMENTS) for _ in range(rng.randint(0, 30)))
+        assert block_fields(parse_spm_text(text)) == block_fields(legacy_parse_spm_text(text)), repr(text)
+
+def test_matches_legacy_on_sample_file():
+    text = sample_text(500)
+    assert block_fields(parse_spm_text(text)) == block_fields(legacy_parse_spm_text(text))
+
+# Frozen expectations, these don't depend on the legacy parser being right
+def test_header_tags_and_pages():
+    text = (
+        "[NUL]stg1_1_000[NUL]<se 2>\n<wpos 10 -20 300 40>\n<system>Hi there[LF]\n"
+        "Second line[LF]\n<col ff0000ff>red</col>[LF]\n<k>[LF]\nPage two[LF]\n"
+        "[NUL]anna_stg3_02_15[NUL]<select 0 0 100 50>\nYes[LF]\nNo[LF]\n"
+    )
+    assert block_fields(parse_spm_text(text)) == [
+        ("stg1_1_000", "system", (10, -20, 300, 40), ["Hi there\nSecond line<col ff0000ff>red</col>", "Page two"], "Pencil"),
+        ("anna_stg3_02_15", "select", (0, 0, 100, 50), ["Yes\nNo"], "none"),
+    ]
+
+def test_bubble_tag_trailing_text_is_reread():
+    # Text after a bubble tag is read as the next token, so a second header tag there still counts
+    assert block_fields(parse_spm_text("stg1_1_000[NUL]<fairy2><system>Hey")) == [
+        ("stg1_1_000", "system", (0, 0, 0, 0), ["Hey"], "none"),
+    ]
+
+# A line is one token, so text sharing a line with a non-bubble tag or a <k> goes with it
+def test_text_on_a_tag_line_is_dropped():
+    assert block_fields(parse_spm_text("[NUL]stg1_1_000[NUL]<se 1>Hi[LF]\nthere[LF]\n<k>Gone[LF]\nPage two")) == [
+        ("stg1_1_000", "none", (0, 0, 0, 0), ["there", "Page two"], "Typewriter"),
+    ]
+
+def test_text_before_first_stage_is_ignored():
+    assert block_fields(parse_spm_text("stray text[LF]\n<k>\n<p>\n[NUL]stg1_1_000[NUL]\nHi")) == [
+        ("stg1_1_000", "none", (0, 0, 0, 0), ["Hi"], "none"),
+    ]
@@ -0,0 +1,60 @@
+# Project Imports
+from renderer.utils.text_projection import TextProjection, project_line
+
+#===================================================================================================================================
+# Markup-stripped projection (what tag-aware search sees) and the mapping of its hits back to the raw text
+#===================================================================================================================================
+# Finds needle in the projection and returns (raw slice span_to_raw covers, raw slices span_to_raw_text covers)
+def _hit(raw: str, needle: str):
+    projection = TextProjection(raw)
+    start = projection.text.index(needle)
+    end = start + len(needle)
+    raw_start, raw_end = projection.span_to_raw(start, end)
+    return raw[raw_start:raw_end], [raw[a:b] for a, b in projection.span_to_raw_text(start, end)]
+
+def test_project_line():
+    text, runs = project_line("Hi <col ff0000ff>you</col>[LF]")
+    assert text == "Hi you "
+    assert runs == ((0, 0, 3, True), (3, 17, 3, True), (6, 26, 1, False))
+
+    # Separators are matched case-insensitively, other tags just vanish
+    assert project_line("a<K>b<P>c[NUL]d<wait 5>e")[0] == "a b c de"
+    assert project_line("<system>")[0] == ""
+
+def test_match_next_to_tags():
+    raw = "Hello <col ff0000ff>world</col>!"
+    assert TextProjection(raw).text == "Hello world!"
+    assert _hit(raw, "world") == ("world", ["world"])
+    assert _hit(raw, "Hello") == ("Hello", ["Hello"])
+    assert _hit(raw, "!") == ("!", ["!"])
+
+def test_match_across_tags():
+    raw = "Hello <col ff0000ff>world</col>!"
+    assert _hit(raw, "lo wo") == ("lo <col ff0000ff>wo", ["lo ", "wo"])
+    assert _hit(raw, "world!") == ("world</col>!", ["world", "!"])
+
+def test_match_across_separators():
+    assert _hit("Hi<k>there", "i t") == ("i<k>t", ["i", "t"])
+    assert _hit("Hi[NUL]there", "Hi there") == ("Hi[NUL]there", ["Hi", "there"])
+    assert _hit("Hi<P>there", "i th") == ("i<P>th", ["i", "th"])
+
+def test_multi_line_message():
+    raw = "stg1_1_000[NUL]\nFirst [LF]\n<col 1>line</col>[LF]\nlast"
+    projection = TextProjection(raw)
+    assert projection.text == "stg1_1_000 \nFirst  \nline \nlast"
+    assert _hit(raw, "line \nla") == ("line</col>[LF]\nla", ["line", "la"])
+    assert _hit(raw, "First  \nline") == ("First [LF]\n<col 1>line", ["First ", "line"])
+
+    # The \n itself maps to the line break after the raw line
+    newline = projection.text.index("\n")
+    assert projection.to_raw(newline) == raw.index("\n")
+
+# A hit that ends on a separator covers just its first raw character (the separator isn't text, so nothing of it is rewritten)
+def test_match_ending_inside_separator():
+    assert _hit("Hi<k>there", "Hi ") == ("Hi<", ["Hi"])
+    assert _hit("Hi[LF]\nthere", "Hi ") == ("Hi[", ["Hi"])
+
+def test_empty_span():
+    projection = TextProjection("a<k>b")
+    assert projection.span_to_raw(2, 2) == (4, 4)
+    assert projection.span_to_raw_text(2, 2) == []